@@ -1,6 +1,6 @@
 # agents/agent1_bp_scouter.py - BP Case Scouter Agent
 
-import asyncio
+from core.websocket import send_msg
 from .utils import persist_job_metadata
 
 
@@ -22,7 +22,7 @@ async def run_bp_scouter(job_id: int, job: dict, ws, domain: str, division: str,
         list: BP cases found
     """
     if ws:
-        await ws.send_json({"status": "processing", "agent": "BP_Scouter", "message": "BP 사례 검색 중..."})
+        await send_msg(ws, {"status": "processing", "agent": "BP_Scouter", "message": "BP 사례 검색 중..."})
 
     # 제안서 내용 추출
     proposal_content = job.get("content", "")
@@ -31,10 +31,9 @@ async def run_bp_scouter(job_id: int, job: dict, ws, domain: str, division: str,
     rag_result = await rag_retrieve_bp_cases(domain, division, proposal_content)
     bp_cases = rag_result.get("cases", [])
 
-    await asyncio.sleep(2)
     if ws:
         # BP 검색 완료 메시지와 함께 결과 전송
-        await ws.send_json({
+        await send_msg(ws, {
             "status": "completed",
             "agent": "BP_Scouter",
             "message": f"BP 사례 {len(bp_cases)}건 검색 완료",
@@ -1,16 +1,35 @@
 # agents/agent2_objective_reviewer.py - Objective Reviewer Agent
 
 import asyncio
+
+from config.settings import UI_PACING_SEC
+from core.llm import run_llm_in_thread
+from core.websocket import send_msg
 from .utils import (
     persist_job_metadata,
     analyze_result_quality,
-    generate_feedback_suggestion,
-    wait_for_feedback
+    set_pending_hitl_result,
+    wait_for_feedback,
+    build_proposal_context,
+    stream_llm_to_ws,
 )
 
 
+# 제안서 본문은 system 프롬프트로 전달되므로 job과 무관한 고정 프롬프트
+OBJECTIVE_PROMPT = """당신은 기업의 AI 과제 제안서를 검토하는 전문가입니다.
+위 제안서의 목표 적합성을 검토하고 평가해주세요.
+
+다음 항목을 평가하고 짧게 요약해주세요:
+1. 목표의 명확성
+2. 조직 전략과의 정렬성
+3. 실현 가능성
+
+간결하게 2-3문장으로 평가 결과를 작성해주세요."""
+
+
 async def run_objective_reviewer(job_id: int, job: dict, ws, hitl_stages: list, hitl_retry_counts: dict,
-                                  bp_cases: list, call_ollama, get_job, update_job_status, reset_feedback_state):
+                                  bp_cases: list, call_ollama, get_job, update_job_status, reset_feedback_state,
+                                  astream_llm=None):
     """Objective Reviewer - Review proposal objectives and strategic alignment
 
     Args:
@@ -24,6 +43,7 @@ async def run_objective_reviewer(job_id: int, job: dict, ws, hitl_stages: list,
         get_job: Database get_job function
         update_job_status: Database update_job_status function
         reset_feedback_state: Database reset_feedback_state function
+        astream_llm: 스트리밍 LLM 함수 (지정 시 생성 중인 토큰을 WebSocket으로 전송)
 
     Returns:
         str: Objective review text
@@ -31,31 +51,27 @@ async def run_objective_reviewer(job_id: int, job: dict, ws, hitl_stages: list,
     MAX_HITL_RETRIES = 3
 
     if ws:
-        await ws.send_json({"status": "processing", "agent": "Objective_Reviewer", "message": "목표 적합성 검토 중..."})
+        await send_msg(ws, {"status": "processing", "agent": "Objective_Reviewer", "message": "목표 적합성 검토 중..."})
 
     proposal_text = job.get("content", "")
     enable_seq_thinking = job.get("enable_sequential_thinking", False)
+    proposal_context = build_proposal_context(proposal_text)
 
     if enable_seq_thinking:
         print(f"[Agent 2] Sequential Thinking 활성화됨")
 
-    objective_prompt = f"""당신은 기업의 AI 과제 제안서를 검토하는 전문가입니다.
-다음 제안서의 목표 적합성을 검토하고 평가해주세요:
-
-제안서 내용:
-{proposal_text}
-
-다음 항목을 평가하고 짧게 요약해주세요:
-1. 목표의 명확성
-2. 조직 전략과의 정렬성
-3. 실현 가능성
-
-간결하게 2-3문장으로 평가 결과를 작성해주세요."""
-
-    objective_review = await asyncio.to_thread(call_ollama, objective_prompt, enable_sequential_thinking=enable_seq_thinking)
+    if astream_llm and not enable_seq_thinking:
+        # 생성되는 토큰을 바로 전송하여 첫 응답까지의 대기 시간 단축
+        objective_review = await stream_llm_to_ws(astream_llm, OBJECTIVE_PROMPT, proposal_context, ws, "Objective_Reviewer")
+    else:
+        objective_review = await run_llm_in_thread(
+            call_ollama, OBJECTIVE_PROMPT,
+            enable_sequential_thinking=enable_seq_thinking,
+            system_prompt=proposal_context,
+        )
 
     if ws:
-        await ws.send_json({"status": "completed", "agent": "Objective_Reviewer", "message": "목표 검토 완료"})
+        await send_msg(ws, {"status": "completed", "agent": "Objective_Reviewer", "message": "목표 검토 완료"})
 
     persist_job_metadata(
         job_id,
@@ -70,34 +86,20 @@ async def run_objective_reviewer(job_id: int, job: dict, ws, hitl_stages: list,
         agent_num = 2
         skip_accepted_agent2 = False
         while True:
-            # LLM이 분석 결과 품질 평가
-            quality_check = await asyncio.to_thread(
-                analyze_result_quality,
-                "Objective Reviewer",
-                objective_review,
-                proposal_text,
-                call_ollama
-            )
+            quality_check = await run_llm_in_thread(analyze_result_quality, "Objective Reviewer", objective_review, proposal_text, call_ollama)
+            # 피드백 제안은 사용자가 요청할 때만 생성 (POST /api/v1/review/suggest/{job_id})
+            set_pending_hitl_result(job_id, "Objective Reviewer", objective_review, proposal_text, call_ollama)
 
             print(f"[DEBUG] Quality check for Agent 2: {quality_check}")
 
-            # 피드백 제안 생성
-            feedback_suggestion = await asyncio.to_thread(
-                generate_feedback_suggestion,
-                "Objective Reviewer",
-                objective_review,
-                proposal_text,
-                call_ollama
-            )
-
             if ws:
-                await ws.send_json({
+                await send_msg(ws, {
                     "status": "interrupt",
                     "job_id": job_id,
                     "message": f"검토 결과를 확인해주세요 (재시도 {hitl_retry_counts[agent_num]}/{MAX_HITL_RETRIES}) - 품질: {quality_check.get('reason', '')}",
                     "results": {
                         "objective_review": objective_review,
-                        "feedback_suggestion": feedback_suggestion,
+                        "suggestion_pending": True,
                         "quality_check": quality_check
                     }
                 })
@@ -144,7 +146,7 @@ async def run_objective_reviewer(job_id: int, job: dict, ws, hitl_stages: list,
                 print(f"[DEBUG] Agent 2 재시도 {hitl_retry_counts[agent_num]}/{MAX_HITL_RETRIES}")
 
                 if ws:
-                    await ws.send_json({
+                    await send_msg(ws, {
                         "status": "processing",
                         "agent": "Objective_Reviewer",
                         "message": f"품질 개선을 위해 재검토 중... ({hitl_retry_counts[agent_num]}/{MAX_HITL_RETRIES})"
@@ -155,9 +157,6 @@ async def run_objective_reviewer(job_id: int, job: dict, ws, hitl_stages: list,
                     retry_prompt = f"""당신은 기업의 AI 과제 제안서를 검토하는 전문가입니다.
 사용자가 중요한 피드백을 제공했습니다. 이 피드백을 **반드시 반영**하여 검토 결과를 다시 작성해주세요.
 
-제안서 내용:
-{proposal_text}
-
 이전 검토 결과:
 {objective_review}
 
@@ -178,9 +177,6 @@ async def run_objective_reviewer(job_id: int, job: dict, ws, hitl_stages: list,
                     retry_prompt = f"""당신은 기업의 AI 과제 제안서를 검토하는 전문가입니다.
 이전 검토 결과가 품질 기준을 충족하지 못했습니다. 더 상세하고 구체적으로 재검토해주세요.
 
-제안서 내용:
-{proposal_text}
-
 이전 검토 결과 (불충분):
 {objective_review}
 
@@ -196,10 +192,14 @@ async def run_objective_reviewer(job_id: int, job: dict, ws, hitl_stages: list,
 **반드시 5-7문장 이상으로 구체적인 근거와 함께 평가 결과를 작성해주세요.**
 각 항목마다 명확한 판단과 그 이유를 제시하세요."""
 
-                objective_review = await asyncio.to_thread(call_ollama, retry_prompt, enable_sequential_thinking=enable_seq_thinking)
+                objective_review = await run_llm_in_thread(
+                    call_ollama, retry_prompt,
+                    enable_sequential_thinking=enable_seq_thinking,
+                    system_prompt=proposal_context,
+                )
 
                 if ws:
-                    await ws.send_json({
+                    await send_msg(ws, {
                         "status": "completed",
                         "agent": "Objective_Reviewer",
                         "message": "재검토 완료"
@@ -212,7 +212,7 @@ async def run_objective_reviewer(job_id: int, job: dict, ws, hitl_stages: list,
                 if hitl_retry_counts[agent_num] >= MAX_HITL_RETRIES:
                     print(f"[DEBUG] Agent 2 최대 재시도 횟수 도달")
                     if ws:
-                        await ws.send_json({
+                        await send_msg(ws, {
                             "status": "processing",
                             "agent": "Objective_Reviewer",
                             "message": "최대 재시도 횟수 도달, 다음 단계로 진행합니다"
@@ -226,11 +226,11 @@ async def run_objective_reviewer(job_id: int, job: dict, ws, hitl_stages: list,
                 if skip_accepted_agent2
                 else "피드백 반영하여 분석 계속 진행..."
             )
-            await ws.send_json({
+            await send_msg(ws, {
                 "status": "processing",
                 "agent": "Data_Analyzer",
                 "message": next_message
             })
-        await asyncio.sleep(1)
+        await asyncio.sleep(UI_PACING_SEC)
 
     return objective_review
@@ -1,16 +1,35 @@
 # agents/agent3_data_analyzer.py - Data Analyzer Agent
 
 import asyncio
+
+from config.settings import UI_PACING_SEC
+from core.llm import run_llm_in_thread
+from core.websocket import send_msg
 from .utils import (
     persist_job_metadata,
     analyze_result_quality,
-    generate_feedback_suggestion,
-    wait_for_feedback
+    set_pending_hitl_result,
+    wait_for_feedback,
+    build_proposal_context,
+    stream_llm_to_ws,
 )
 
 
+# 제안서 본문은 system 프롬프트로 전달되므로 job과 무관한 고정 프롬프트
+DATA_PROMPT = """당신은 AI 프로젝트의 데이터 분석 전문가입니다.
+위 제안서에 대한 데이터 분석을 수행해주세요.
+
+다음 항목을 평가하고 짧게 요약해주세요:
+1. 데이터 확보 가능성
+2. 데이터 품질 예상
+3. 데이터 접근성
+
+간결하게 2-3문장으로 평가 결과를 작성해주세요."""
+
+
 async def run_data_analyzer(job_id: int, job: dict, ws, hitl_stages: list, hitl_retry_counts: dict,
-                             call_ollama, get_job, update_job_status, reset_feedback_state):
+                             call_ollama, get_job, update_job_status, reset_feedback_state,
+                             astream_llm=None):
     """Data Analyzer - Analyze data availability and quality
 
     Args:
@@ -23,6 +42,7 @@ async def run_data_analyzer(job_id: int, job: dict, ws, hitl_stages: list, hitl_
         get_job: Database get_job function
         update_job_status: Database update_job_status function
         reset_feedback_state: Database reset_feedback_state function
+        astream_llm: 스트리밍 LLM 함수 (지정 시 생성 중인 토큰을 WebSocket으로 전송)
 
     Returns:
         str: Data analysis text
@@ -30,31 +50,27 @@ async def run_data_analyzer(job_id: int, job: dict, ws, hitl_stages: list, hitl_
     MAX_HITL_RETRIES = 3
 
     if ws:
-        await ws.send_json({"status": "processing", "agent": "Data_Analyzer", "message": "데이터 분석 중..."})
+        await send_msg(ws, {"status": "processing", "agent": "Data_Analyzer", "message": "데이터 분석 중..."})
 
     proposal_text = job.get("content", "")
     enable_seq_thinking = job.get("enable_sequential_thinking", False)
+    proposal_context = build_proposal_context(proposal_text)
 
     if enable_seq_thinking:
         print(f"[Agent 3] Sequential Thinking 활성화됨")
 
-    data_prompt = f"""당신은 AI 프로젝트의 데이터 분석 전문가입니다.
-다음 제안서에 대한 데이터 분석을 수행해주세요:
-
-제안서 내용:
-{proposal_text}
-
-다음 항목을 평가하고 짧게 요약해주세요:
-1. 데이터 확보 가능성
-2. 데이터 품질 예상
-3. 데이터 접근성
-
-간결하게 2-3문장으로 평가 결과를 작성해주세요."""
-
-    data_analysis = await asyncio.to_thread(call_ollama, data_prompt, enable_sequential_thinking=enable_seq_thinking)
+    if astream_llm and not enable_seq_thinking:
+        # 생성되는 토큰을 바로 전송하여 첫 응답까지의 대기 시간 단축
+        data_analysis = await stream_llm_to_ws(astream_llm, DATA_PROMPT, proposal_context, ws, "Data_Analyzer")
+    else:
+        data_analysis = await run_llm_in_thread(
+            call_ollama, DATA_PROMPT,
+            enable_sequential_thinking=enable_seq_thinking,
+            system_prompt=proposal_context,
+        )
 
     if ws:
-        await ws.send_json({"status": "completed", "agent": "Data_Analyzer", "message": "데이터 분석 완료"})
+        await send_msg(ws, {"status": "completed", "agent": "Data_Analyzer", "message": "데이터 분석 완료"})
 
     persist_job_metadata(
         job_id,
@@ -69,33 +85,20 @@ async def run_data_analyzer(job_id: int, job: dict, ws, hitl_stages: list, hitl_
         agent_num = 3
         skip_accepted_agent3 = False
         while True:
-            # LLM이 분석 결과 품질 평가
-            quality_check = await asyncio.to_thread(
-                analyze_result_quality,
-                "Data Analyzer",
-                data_analysis,
-                proposal_text,
-                call_ollama
-            )
+            quality_check = await run_llm_in_thread(analyze_result_quality, "Data Analyzer", data_analysis, proposal_text, call_ollama)
+            # 피드백 제안은 사용자가 요청할 때만 생성 (POST /api/v1/review/suggest/{job_id})
+            set_pending_hitl_result(job_id, "Data Analyzer", data_analysis, proposal_text, call_ollama)
 
             print(f"[DEBUG] Quality check for Agent 3: {quality_check}")
 
-            feedback_suggestion = await asyncio.to_thread(
-                generate_feedback_suggestion,
-                "Data Analyzer",
-                data_analysis,
-                proposal_text,
-                call_ollama
-            )
-
             if ws:
-                await ws.send_json({
+                await send_msg(ws, {
                     "status": "interrupt",
                     "job_id": job_id,
                     "message": f"데이터 분석 결과 확인 중... (재시도 {hitl_retry_counts[agent_num]}/{MAX_HITL_RETRIES}) - {quality_check.get('reason', '')}",
                     "results": {
                         "data_analysis": data_analysis,
-                        "feedback_suggestion": feedback_suggestion,
+                        "suggestion_pending": True,
                         "quality_check": quality_check
                     }
                 })
@@ -141,7 +144,7 @@ async def run_data_analyzer(job_id: int, job: dict, ws, hitl_stages: list, hitl_
                 print(f"[DEBUG] Agent 3 재시도 {hitl_retry_counts[agent_num]}/{MAX_HITL_RETRIES}")
 
                 if ws:
-                    await ws.send_json({
+                    await send_msg(ws, {
                         "status": "processing",
                         "agent": "Data_Analyzer",
                         "message": f"품질 개선을 위해 재검토 중... ({hitl_retry_counts[agent_num]}/{MAX_HITL_RETRIES})"
@@ -152,9 +155,6 @@ async def run_data_analyzer(job_id: int, job: dict, ws, hitl_stages: list, hitl_
                     retry_prompt = f"""당신은 AI 프로젝트의 데이터 분석 전문가입니다.
 사용자가 중요한 피드백을 제공했습니다. 이 피드백을 **반드시 반영**하여 데이터 분석을 다시 수행해주세요.
 
-제안서 내용:
-{proposal_text}
-
 **사용자 피드백 (필수 반영):**
 {retry_decision.get('user_feedback')}
 
@@ -171,9 +171,6 @@ async def run_data_analyzer(job_id: int, job: dict, ws, hitl_stages: list, hitl_
                     retry_prompt = f"""당신은 AI 프로젝트의 데이터 분석 전문가입니다.
 이전 분석 결과가 품질 기준을 충족하지 못했습니다. 더 구체적으로 재분석해주세요.
 
-제안서 내용:
-{proposal_text}
-
 품질 검사 결과:
 - 문제점: {retry_decision.get('reason', '분석이 불충분함')}
 - 보완 필요 사항: {', '.join(retry_decision.get('additional_info_needed', ['더 상세한 분석', '구체적인 근거']))}
@@ -185,10 +182,14 @@ async def run_data_analyzer(job_id: int, job: dict, ws, hitl_stages: list, hitl_
 
 **3-5문장으로 구체적인 근거와 함께 평가 결과를 작성해주세요.**"""
 
-                data_analysis = await asyncio.to_thread(call_ollama, retry_prompt, enable_sequential_thinking=enable_seq_thinking)
+                data_analysis = await run_llm_in_thread(
+                    call_ollama, retry_prompt,
+                    enable_sequential_thinking=enable_seq_thinking,
+                    system_prompt=proposal_context,
+                )
 
                 if ws:
-                    await ws.send_json({
+                    await send_msg(ws, {
                         "status": "completed",
                         "agent": "Data_Analyzer",
                         "message": "재분석 완료"
@@ -199,7 +200,7 @@ async def run_data_analyzer(job_id: int, job: dict, ws, hitl_stages: list, hitl_
                 if hitl_retry_counts[agent_num] >= MAX_HITL_RETRIES:
                     print(f"[DEBUG] Agent 3 최대 재시도 횟수 도달")
                     if ws:
-                        await ws.send_json({
+                        await send_msg(ws, {
                             "status": "processing",
                             "agent": "Data_Analyzer",
                             "message": "최대 재시도 횟수 도달, 다음 단계로 진행합니다"
@@ -212,11 +213,11 @@ async def run_data_analyzer(job_id: int, job: dict, ws, hitl_stages: list, hitl_
                 if skip_accepted_agent3
                 else "피드백 반영하여 분석 계속 진행..."
             )
-            await ws.send_json({
+            await send_msg(ws, {
                 "status": "processing",
                 "agent": "Risk_Analyzer",
                 "message": next_message
             })
-        await asyncio.sleep(1)
+        await asyncio.sleep(UI_PACING_SEC)
 
     return data_analysis
@@ -1,16 +1,34 @@
 # agents/agent5_roi_estimator.py - ROI Estimator Agent
 
 import asyncio
+
+from config.settings import UI_PACING_SEC
+from core.llm import run_llm_in_thread
+from core.websocket import send_msg
 from .utils import (
     persist_job_metadata,
     analyze_result_quality,
-    generate_feedback_suggestion,
-    wait_for_feedback
+    set_pending_hitl_result,
+    wait_for_feedback,
+    build_proposal_context,
+    stream_llm_to_ws,
 )
 
 
+# 제안서 본문은 system 프롬프트로 전달되므로 job과 무관한 고정 프롬프트
+ROI_PROMPT = """당신은 AI 프로젝트의 ROI(투자 수익률) 분석 전문가입니다.
+위 제안서에 대한 ROI를 추정해주세요.
+
+다음 항목을 평가하고 짧게 요약해주세요:
+1. 예상 효과 (비용 절감, 생산성 향상 등)
+2. 투자 대비 효과 (ROI 퍼센티지, 손익분기점)
+
+간결하게 2-3문장으로 평가 결과를 작성해주세요."""
+
+
 async def run_roi_estimator(job_id: int, job: dict, ws, hitl_stages: list, hitl_retry_counts: dict,
-                             call_ollama, get_job, update_job_status, reset_feedback_state):
+                             call_ollama, get_job, update_job_status, reset_feedback_state,
+                             astream_llm=None):
     """ROI Estimator - Estimate return on investment and benefits
 
     Args:
@@ -23,6 +41,7 @@ async def run_roi_estimator(job_id: int, job: dict, ws, hitl_stages: list, hitl_
         get_job: Database get_job function
         update_job_status: Database update_job_status function
         reset_feedback_state: Database reset_feedback_state function
+        astream_llm: 스트리밍 LLM 함수 (지정 시 생성 중인 토큰을 WebSocket으로 전송)
 
     Returns:
         str: ROI estimation text
@@ -30,30 +49,27 @@ async def run_roi_estimator(job_id: int, job: dict, ws, hitl_stages: list, hitl_
     MAX_HITL_RETRIES = 3
 
     if ws:
-        await ws.send_json({"status": "processing", "agent": "ROI_Estimator", "message": "ROI 추정 중..."})
+        await send_msg(ws, {"status": "processing", "agent": "ROI_Estimator", "message": "ROI 추정 중..."})
 
     proposal_text = job.get("content", "")
     enable_seq_thinking = job.get("enable_sequential_thinking", False)
+    proposal_context = build_proposal_context(proposal_text)
 
     if enable_seq_thinking:
         print(f"[Agent 5] Sequential Thinking 활성화됨")
 
-    roi_prompt = f"""당신은 AI 프로젝트의 ROI(투자 수익률) 분석 전문가입니다.
-다음 제안서에 대한 ROI를 추정해주세요:
-
-제안서 내용:
-{proposal_text}
-
-다음 항목을 평가하고 짧게 요약해주세요:
-1. 예상 효과 (비용 절감, 생산성 향상 등)
-2. 투자 대비 효과 (ROI 퍼센티지, 손익분기점)
-
-간결하게 2-3문장으로 평가 결과를 작성해주세요."""
-
-    roi_estimation = await asyncio.to_thread(call_ollama, roi_prompt, enable_sequential_thinking=enable_seq_thinking)
+    if astream_llm and not enable_seq_thinking:
+        # 생성되는 토큰을 바로 전송하여 첫 응답까지의 대기 시간 단축
+        roi_estimation = await stream_llm_to_ws(astream_llm, ROI_PROMPT, proposal_context, ws, "ROI_Estimator")
+    else:
+        roi_estimation = await run_llm_in_thread(
+            call_ollama, ROI_PROMPT,
+            enable_sequential_thinking=enable_seq_thinking,
+            system_prompt=proposal_context,
+        )
 
     if ws:
-        await ws.send_json({"status": "completed", "agent": "ROI_Estimator", "message": "ROI 추정 완료"})
+        await send_msg(ws, {"status": "completed", "agent": "ROI_Estimator", "message": "ROI 추정 완료"})
 
     persist_job_metadata(
         job_id,
@@ -68,31 +84,20 @@ async def run_roi_estimator(job_id: int, job: dict, ws, hitl_stages: list, hitl_
         agent_num = 5
         skip_accepted_agent5 = False
         while True:
-            quality_check = await asyncio.to_thread(
-                analyze_result_quality,
-                "ROI Estimator",
-                roi_estimation,
-                proposal_text,
-                call_ollama
-            )
-            print(f"[DEBUG] Quality check for Agent 5: {quality_check}")
+            quality_check = await run_llm_in_thread(analyze_result_quality, "ROI Estimator", roi_estimation, proposal_text, call_ollama)
+            # 피드백 제안은 사용자가 요청할 때만 생성 (POST /api/v1/review/suggest/{job_id})
+            set_pending_hitl_result(job_id, "ROI Estimator", roi_estimation, proposal_text, call_ollama)
 
-            feedback_suggestion = await asyncio.to_thread(
-                generate_feedback_suggestion,
-                "ROI Estimator",
-                roi_estimation,
-                proposal_text,
-                call_ollama
-            )
+            print(f"[DEBUG] Quality check for Agent 5: {quality_check}")
 
             if ws:
-                await ws.send_json({
+                await send_msg(ws, {
                     "status": "interrupt",
                     "job_id": job_id,
                     "message": f"ROI 추정 결과 확인 중... (재시도 {hitl_retry_counts[agent_num]}/{MAX_HITL_RETRIES}) - {quality_check.get('reason', '')}",
                     "results": {
                         "roi_estimation": roi_estimation,
-                        "feedback_suggestion": feedback_suggestion,
+                        "suggestion_pending": True,
                         "quality_check": quality_check
                     }
                 })
@@ -136,7 +141,7 @@ async def run_roi_estimator(job_id: int, job: dict, ws, hitl_stages: list, hitl_
                 print(f"[DEBUG] Agent 5 재시도 {hitl_retry_counts[agent_num]}/{MAX_HITL_RETRIES}")
 
                 if ws:
-                    await ws.send_json({
+                    await send_msg(ws, {
                         "status": "processing",
                         "agent": "ROI_Estimator",
                         "message": f"품질 개선을 위해 재검토 중... ({hitl_retry_counts[agent_num]}/{MAX_HITL_RETRIES})"
@@ -147,9 +152,6 @@ async def run_roi_estimator(job_id: int, job: dict, ws, hitl_stages: list, hitl_
                     retry_prompt = f"""당신은 AI 프로젝트의 ROI(투자 수익률) 분석 전문가입니다.
 사용자가 중요한 피드백을 제공했습니다. 이 피드백을 **반드시 반영**하여 ROI 추정을 다시 수행해주세요.
 
-제안서 내용:
-{proposal_text}
-
 이전 분석 결과:
 {roi_estimation}
 
@@ -169,9 +171,6 @@ async def run_roi_estimator(job_id: int, job: dict, ws, hitl_stages: list, hitl_
                     retry_prompt = f"""당신은 AI 프로젝트의 ROI(투자 수익률) 분석 전문가입니다.
 이전 분석 결과가 품질 기준을 충족하지 못했습니다. 더 상세하고 구체적으로 ROI를 재추정해주세요.
 
-제안서 내용:
-{proposal_text}
-
 이전 분석 결과 (불충분):
 {roi_estimation}
 
@@ -185,10 +184,14 @@ async def run_roi_estimator(job_id: int, job: dict, ws, hitl_stages: list, hitl_
 
 **반드시 5-7문장 이상으로 수치와 계산 근거를 포함하여 작성해주세요.**"""
 
-                roi_estimation = await asyncio.to_thread(call_ollama, retry_prompt, enable_sequential_thinking=enable_seq_thinking)
+                roi_estimation = await run_llm_in_thread(
+                    call_ollama, retry_prompt,
+                    enable_sequential_thinking=enable_seq_thinking,
+                    system_prompt=proposal_context,
+                )
 
                 if ws:
-                    await ws.send_json({
+                    await send_msg(ws, {
                         "status": "completed",
                         "agent": "ROI_Estimator",
                         "message": "재추정 완료"
@@ -199,7 +202,7 @@ async def run_roi_estimator(job_id: int, job: dict, ws, hitl_stages: list, hitl_
                 if hitl_retry_counts[agent_num] >= MAX_HITL_RETRIES:
                     print(f"[DEBUG] Agent 5 최대 재시도 횟수 도달")
                     if ws:
-                        await ws.send_json({
+                        await send_msg(ws, {
                             "status": "processing",
                             "agent": "ROI_Estimator",
                             "message": "최대 재시도 횟수 도달, 다음 단계로 진행합니다"
@@ -212,11 +215,11 @@ async def run_roi_estimator(job_id: int, job: dict, ws, hitl_stages: list, hitl_
                 if skip_accepted_agent5
                 else "피드백 반영하여 최종 보고서 생성 중..."
             )
-            await ws.send_json({
+            await send_msg(ws, {
                 "status": "processing",
                 "agent": "Final_Generator",
                 "message": next_message
             })
-        await asyncio.sleep(1)
+        await asyncio.sleep(UI_PACING_SEC)
 
     return roi_estimation
@@ -1,19 +1,139 @@
 # agents/agent6_final_generator.py - Final Generator Agent
 
 import asyncio
+
+from config.settings import UI_PACING_SEC
+from core.llm import run_llm_in_thread
+from core.websocket import send_msg
 from .utils import (
     classify_final_decision,
     analyze_result_quality,
-    generate_feedback_suggestion,
-    wait_for_feedback
+    set_pending_hitl_result,
+    wait_for_feedback,
+    build_proposal_context,
+    stream_llm_to_ws,
 )
 
 
+# 최종 보고서 HTML 골격 (job마다 바뀌는 값만 format으로 채움)
+_REPORT_TEMPLATE = """
+    <div style="padding: 20px;">
+        <h2>📊 AI 과제 지원서 검토 보고서</h2>
+        <hr/>
+
+        <div class="accordion-item">
+            <div class="accordion-header" onclick="toggleAccordion('section1')">
+                <span>1. BP 사례 분석 ({bp_count}건)</span>
+                <span class="accordion-icon">▼</span>
+            </div>
+            <div id="section1" class="accordion-content">
+                <p><strong>유사 사례:</strong></p>
+                {bp_html}
+                <p style="margin-top: 15px;"><em>총 {bp_count}건의 유사 사례가 발견되었습니다.</em></p>
+            </div>
+        </div>
+
+        <div class="accordion-item">
+            <div class="accordion-header" onclick="toggleAccordion('section2')">
+                <span>2. 목표 적합성</span>
+                <span class="accordion-icon">▼</span>
+            </div>
+            <div id="section2" class="accordion-content">
+                <div class="markdown-content" data-markdown>{objective_review}</div>
+            </div>
+        </div>
+
+        <div class="accordion-item">
+            <div class="accordion-header" onclick="toggleAccordion('section3')">
+                <span>3. 데이터 분석</span>
+                <span class="accordion-icon">▼</span>
+            </div>
+            <div id="section3" class="accordion-content">
+                <div class="markdown-content" data-markdown>{data_analysis}</div>
+            </div>
+        </div>
+
+        <div class="accordion-item">
+            <div class="accordion-header" onclick="toggleAccordion('section4')">
+                <span>4. 리스크 분석</span>
+                <span class="accordion-icon">▼</span>
+            </div>
+            <div id="section4" class="accordion-content">
+                <div class="markdown-content" data-markdown>{risk_analysis}</div>
+            </div>
+        </div>
+
+        <div class="accordion-item">
+            <div class="accordion-header" onclick="toggleAccordion('section5')">
+                <span>5. ROI 추정</span>
+                <span class="accordion-icon">▼</span>
+            </div>
+            <div id="section5" class="accordion-content">
+                <div class="markdown-content" data-markdown>{roi_estimation}</div>
+            </div>
+        </div>
+
+        <div class="accordion-item">
+            <div class="accordion-header" onclick="toggleAccordion('section6')">
+                <span>6. 최종 의견</span>
+                <span class="accordion-icon">▼</span>
+            </div>
+            <div id="section6" class="accordion-content" style="display: block;">
+                <div class="markdown-content" data-markdown>{final_recommendation}</div>
+                <div style="margin-top: 15px; text-align: right;">
+                    <button onclick="window.location.href='/api/export/final-recommendation/{job_id}'"
+                            style="background-color: #007bff; color: white; border: none; padding: 10px 20px; border-radius: 5px; cursor: pointer; font-size: 14px;">
+                        📄 최종 의견 PDF 다운로드
+                    </button>
+                </div>
+            </div>
+        </div>
+    </div>
+    """
+
+_BP_CASE_CARD = """
+                <div style="background: #f8f9fa; padding: 12px; margin: 10px 0; border-left: 3px solid #007bff; border-radius: 4px;">
+                    <h4 style="margin: 0 0 8px 0; color: #007bff;">{idx}. {title_html}</h4>
+                    <p style="margin: 4px 0;"><strong>기술 유형:</strong> {tech_type}</p>
+                    <p style="margin: 4px 0;"><strong>도메인:</strong> {domain} | <strong>사업부:</strong> {division}</p>
+                    <p style="margin: 4px 0;"><strong>문제 (AS-IS):</strong> {problem}</p>
+                    <p style="margin: 4px 0;"><strong>솔루션 (TO-BE):</strong> {solution}</p>
+                    <p style="margin: 4px 0; background: #fff3cd; padding: 8px; border-radius: 3px;"><strong>💎 핵심 요약:</strong> {summary}</p>
+                    {tips_html}
+                    {link_html}
+                </div>
+                """
+
+
+def _render_bp_cases(bp_cases: list) -> str:
+    """BP 사례 카드 HTML (보고서 1번 섹션)"""
+    if not bp_cases:
+        return '<p>검색된 사례 없음</p>'
+
+    cards = []
+    for idx, c in enumerate(bp_cases, 1):
+        title = c.get("title", "제목 없음")
+        link = c.get("link")
+        cards.append(_BP_CASE_CARD.format(
+            idx=idx,
+            title_html=f'<a href="{link}" target="_blank" style="color: #007bff; text-decoration: none;">{title} 🔗</a>' if link else title,
+            tech_type=c.get("tech_type", "N/A"),
+            domain=c.get("business_domain", c.get("domain", "N/A")),
+            division=c.get("division", "N/A"),
+            problem=c.get("problem_as_was", "N/A"),
+            solution=c.get("solution_to_be", "N/A"),
+            summary=c.get("summary", "N/A"),
+            tips_html=f'<p style="margin: 4px 0; background: #d1ecf1; padding: 8px; border-radius: 3px;"><strong>💡 팁:</strong> {c.get("tips")}</p>' if c.get("tips") else '',
+            link_html=f'<p style="margin: 8px 0 0 0;"><a href="{link}" target="_blank" style="color: #007bff; text-decoration: none; font-size: 0.9em;">📄 원본 문서 보기 →</a></p>' if link else '',
+        ))
+    return ''.join(cards)
+
+
 async def run_final_generator(job_id: int, job: dict, ws, hitl_stages: list, hitl_retry_counts: dict,
                                objective_review: str, data_analysis: str, risk_analysis: str, roi_estimation: str,
                                bp_cases: list, call_ollama, call_llm, get_job, update_job_status, reset_feedback_state,
                                send_final_report: bool = True, ws_key: str = None, active_connections: dict = None,
-                               user_feedbacks: dict = None):
+                               user_feedbacks: dict = None, astream_llm=None):
     """Final Generator - Synthesize all analyses into final recommendation
 
     Args:
@@ -36,6 +156,7 @@ async def run_final_generator(job_id: int, job: dict, ws, hitl_stages: list, hit
         ws_key: WebSocket key for active connections
         active_connections: Active WebSocket connections dictionary
         user_feedbacks: Dictionary of user feedbacks from agents 2-5
+        astream_llm: 스트리밍 LLM 함수 (지정 시 생성 중인 토큰을 WebSocket으로 전송)
 
     Returns:
         None (updates job with final report and decision)
@@ -43,7 +164,7 @@ async def run_final_generator(job_id: int, job: dict, ws, hitl_stages: list, hit
     MAX_HITL_RETRIES = 3
 
     if ws:
-        await ws.send_json({"status": "processing", "agent": "Final_Generator", "message": "최종 보고서 생성 중..."})
+        await send_msg(ws, {"status": "processing", "agent": "Final_Generator", "message": "최종 보고서 생성 중..."})
 
     proposal_text = job.get("content", "")
     enable_seq_thinking = job.get("enable_sequential_thinking", False)
@@ -71,10 +192,7 @@ async def run_final_generator(job_id: int, job: dict, ws, hitl_stages: list, hit
 특히 예산, 인력, 기간, 기술 역량 등 구체적인 정보가 있다면 최종 의견에 명시적으로 포함해주세요."""
 
     final_prompt = f"""당신은 AI 프로젝트 검토 전문가입니다.
-다음 제안서와 분석 결과를 바탕으로 최종 의견을 작성해주세요:
-
-제안서 내용:
-{proposal_text}
+위 제안서와 다음 분석 결과를 바탕으로 최종 의견을 작성해주세요:
 
 목표 검토:
 {objective_review}
@@ -95,10 +213,20 @@ ROI 추정:
 
 간결하게 5-7문장으로 작성해주세요."""
 
-    final_recommendation = await asyncio.to_thread(call_ollama, final_prompt, enable_sequential_thinking=enable_seq_thinking)
+    proposal_context = build_proposal_context(proposal_text)
+
+    if astream_llm and not enable_seq_thinking:
+        # 생성되는 토큰을 바로 전송하여 첫 응답까지의 대기 시간 단축
+        final_recommendation = await stream_llm_to_ws(astream_llm, final_prompt, proposal_context, ws, "Final_Generator")
+    else:
+        final_recommendation = await run_llm_in_thread(
+            call_ollama, final_prompt,
+            enable_sequential_thinking=enable_seq_thinking,
+            system_prompt=proposal_context,
+        )
 
     if ws:
-        await ws.send_json({"status": "completed", "agent": "Final_Generator", "message": "최종 의견 생성 완료"})
+        await send_msg(ws, {"status": "completed", "agent": "Final_Generator", "message": "최종 의견 생성 완료"})
     update_job_status(job_id, "final_done")
 
     # HITL 인터럽트: Agent 6 이후 (설정에 따라)
@@ -106,31 +234,20 @@ ROI 추정:
         agent_num = 6
         skip_accepted_agent6 = False
         while True:
-            quality_check = await asyncio.to_thread(
-                analyze_result_quality,
-                "Final Generator",
-                final_recommendation,
-                proposal_text,
-                call_ollama
-            )
-            print(f"[DEBUG] Quality check for Agent 6: {quality_check}")
+            quality_check = await run_llm_in_thread(analyze_result_quality, "Final Generator", final_recommendation, proposal_text, call_ollama)
+            # 피드백 제안은 사용자가 요청할 때만 생성 (POST /api/v1/review/suggest/{job_id})
+            set_pending_hitl_result(job_id, "Final Generator", final_recommendation, proposal_text, call_ollama)
 
-            feedback_suggestion = await asyncio.to_thread(
-                generate_feedback_suggestion,
-                "Final Generator",
-                final_recommendation,
-                proposal_text,
-                call_ollama
-            )
+            print(f"[DEBUG] Quality check for Agent 6: {quality_check}")
 
             if ws:
-                await ws.send_json({
+                await send_msg(ws, {
                     "status": "interrupt",
                     "job_id": job_id,
                     "message": f"최종 의견 확인 중... (재시도 {hitl_retry_counts[agent_num]}/{MAX_HITL_RETRIES}) - {quality_check.get('reason', '')}",
                     "results": {
                         "final_recommendation": final_recommendation,
-                        "feedback_suggestion": feedback_suggestion,
+                        "suggestion_pending": True,
                         "quality_check": quality_check
                     }
                 })
@@ -174,7 +291,7 @@ ROI 추정:
                 print(f"[DEBUG] Agent 6 재시도 {hitl_retry_counts[agent_num]}/{MAX_HITL_RETRIES}")
 
                 if ws:
-                    await ws.send_json({
+                    await send_msg(ws, {
                         "status": "processing",
                         "agent": "Final_Generator",
                         "message": f"품질 개선을 위해 재검토 중... ({hitl_retry_counts[agent_num]}/{MAX_HITL_RETRIES})"
@@ -185,9 +302,6 @@ ROI 추정:
                     retry_prompt = f"""당신은 AI 프로젝트 검토 전문가입니다.
 사용자가 중요한 피드백을 제공했습니다. 이 피드백을 **반드시 반영**하여 최종 의견을 다시 작성해주세요.
 
-제안서 내용:
-{proposal_text}
-
 목표 검토:
 {objective_review}
 
@@ -220,9 +334,6 @@ ROI 추정:
                     retry_prompt = f"""당신은 AI 프로젝트 검토 전문가입니다.
 이전 최종 의견이 품질 기준을 충족하지 못했습니다. 더 상세하고 구체적으로 최종 의견을 재작성해주세요.
 
-제안서 내용:
-{proposal_text}
-
 목표 검토:
 {objective_review}
 
@@ -249,10 +360,14 @@ ROI 추정:
 
 **반드시 7-10문장 이상으로 명확한 판단과 상세한 근거를 포함하여 작성해주세요.**"""
 
-                final_recommendation = await asyncio.to_thread(call_ollama, retry_prompt, enable_sequential_thinking=enable_seq_thinking)
+                final_recommendation = await run_llm_in_thread(
+                    call_ollama, retry_prompt,
+                    enable_sequential_thinking=enable_seq_thinking,
+                    system_prompt=proposal_context,
+                )
 
                 if ws:
-                    await ws.send_json({
+                    await send_msg(ws, {
                         "status": "completed",
                         "agent": "Final_Generator",
                         "message": "재검토 완료"
@@ -263,7 +378,7 @@ ROI 추정:
                 if hitl_retry_counts[agent_num] >= MAX_HITL_RETRIES:
                     print(f"[DEBUG] Agent 6 최대 재시도 횟수 도달")
                     if ws:
-                        await ws.send_json({
+                        await send_msg(ws, {
                             "status": "processing",
                             "agent": "Final_Generator",
                             "message": "최대 재시도 횟수 도달, 최종 보고서를 생성합니다"
@@ -276,95 +391,20 @@ ROI 추정:
                 if skip_accepted_agent6
                 else "피드백 반영하여 최종 보고서 생성 중..."
             )
-            await ws.send_json({"status": "processing", "message": next_message})
-        await asyncio.sleep(1)
+            await send_msg(ws, {"status": "processing", "message": next_message})
+        await asyncio.sleep(UI_PACING_SEC)
 
     # 최종 완료
-    final_report = f"""
-    <div style="padding: 20px;">
-        <h2>📊 AI 과제 지원서 검토 보고서</h2>
-        <hr/>
-
-        <div class="accordion-item">
-            <div class="accordion-header" onclick="toggleAccordion('section1')">
-                <span>1. BP 사례 분석 ({len(bp_cases)}건)</span>
-                <span class="accordion-icon">▼</span>
-            </div>
-            <div id="section1" class="accordion-content">
-                <p><strong>유사 사례:</strong></p>
-                {''.join([f'''
-                <div style="background: #f8f9fa; padding: 12px; margin: 10px 0; border-left: 3px solid #007bff; border-radius: 4px;">
-                    <h4 style="margin: 0 0 8px 0; color: #007bff;">{idx+1}. {f'<a href="{c.get("link")}" target="_blank" style="color: #007bff; text-decoration: none;">{c.get("title", "제목 없음")} 🔗</a>' if c.get("link") else c.get("title", "제목 없음")}</h4>
-                    <p style="margin: 4px 0;"><strong>기술 유형:</strong> {c.get("tech_type", "N/A")}</p>
-                    <p style="margin: 4px 0;"><strong>도메인:</strong> {c.get("business_domain", c.get("domain", "N/A"))} | <strong>사업부:</strong> {c.get("division", "N/A")}</p>
-                    <p style="margin: 4px 0;"><strong>문제 (AS-IS):</strong> {c.get("problem_as_was", "N/A")}</p>
-                    <p style="margin: 4px 0;"><strong>솔루션 (TO-BE):</strong> {c.get("solution_to_be", "N/A")}</p>
-                    <p style="margin: 4px 0; background: #fff3cd; padding: 8px; border-radius: 3px;"><strong>💎 핵심 요약:</strong> {c.get("summary", "N/A")}</p>
-                    {f'<p style="margin: 4px 0; background: #d1ecf1; padding: 8px; border-radius: 3px;"><strong>💡 팁:</strong> {c.get("tips")}</p>' if c.get("tips") else ''}
-                    {f'<p style="margin: 8px 0 0 0;"><a href="{c.get("link")}" target="_blank" style="color: #007bff; text-decoration: none; font-size: 0.9em;">📄 원본 문서 보기 →</a></p>' if c.get("link") else ''}
-                </div>
-                ''' for idx, c in enumerate(bp_cases)]) if bp_cases else '<p>검색된 사례 없음</p>'}
-                <p style="margin-top: 15px;"><em>총 {len(bp_cases)}건의 유사 사례가 발견되었습니다.</em></p>
-            </div>
-        </div>
-
-        <div class="accordion-item">
-            <div class="accordion-header" onclick="toggleAccordion('section2')">
-                <span>2. 목표 적합성</span>
-                <span class="accordion-icon">▼</span>
-            </div>
-            <div id="section2" class="accordion-content">
-                <div class="markdown-content" data-markdown>{objective_review}</div>
-            </div>
-        </div>
-
-        <div class="accordion-item">
-            <div class="accordion-header" onclick="toggleAccordion('section3')">
-                <span>3. 데이터 분석</span>
-                <span class="accordion-icon">▼</span>
-            </div>
-            <div id="section3" class="accordion-content">
-                <div class="markdown-content" data-markdown>{data_analysis}</div>
-            </div>
-        </div>
-
-        <div class="accordion-item">
-            <div class="accordion-header" onclick="toggleAccordion('section4')">
-                <span>4. 리스크 분석</span>
-                <span class="accordion-icon">▼</span>
-            </div>
-            <div id="section4" class="accordion-content">
-                <div class="markdown-content" data-markdown>{risk_analysis}</div>
-            </div>
-        </div>
-
-        <div class="accordion-item">
-            <div class="accordion-header" onclick="toggleAccordion('section5')">
-                <span>5. ROI 추정</span>
-                <span class="accordion-icon">▼</span>
-            </div>
-            <div id="section5" class="accordion-content">
-                <div class="markdown-content" data-markdown>{roi_estimation}</div>
-            </div>
-        </div>
-
-        <div class="accordion-item">
-            <div class="accordion-header" onclick="toggleAccordion('section6')">
-                <span>6. 최종 의견</span>
-                <span class="accordion-icon">▼</span>
-            </div>
-            <div id="section6" class="accordion-content" style="display: block;">
-                <div class="markdown-content" data-markdown>{final_recommendation}</div>
-                <div style="margin-top: 15px; text-align: right;">
-                    <button onclick="window.location.href='/api/export/final-recommendation/{job_id}'"
-                            style="background-color: #007bff; color: white; border: none; padding: 10px 20px; border-radius: 5px; cursor: pointer; font-size: 14px;">
-                        📄 최종 의견 PDF 다운로드
-                    </button>
-                </div>
-            </div>
-        </div>
-    </div>
-    """
+    final_report = _REPORT_TEMPLATE.format(
+        bp_count=len(bp_cases),
+        bp_html=_render_bp_cases(bp_cases),
+        objective_review=objective_review,
+        data_analysis=data_analysis,
+        risk_analysis=risk_analysis,
+        roi_estimation=roi_estimation,
+        final_recommendation=final_recommendation,
+        job_id=job_id,
+    )
 
     decision_result = await classify_final_decision(final_report, final_recommendation, call_llm)
     decision_value = decision_result.get("decision", "보류")
@@ -391,7 +431,7 @@ ROI 추정:
         target_ws = ws or (active_connections.get(ws_key) if active_connections and ws_key else None)
         if target_ws:
             human_decision_value = latest_job.get("decision") or latest_job.get("human_decision")
-            await target_ws.send_json({
+            await send_msg(target_ws, {
                 "status": "completed",
                 "agent": "Final_Generator",
                 "message": "검토 완료",
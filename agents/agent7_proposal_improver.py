@@ -1,13 +1,15 @@
 # agents/agent7_proposal_improver.py - Proposal Improver Agent
 
-import asyncio
-from .utils import persist_job_metadata
+from core.llm import run_llm_in_thread
+from core.websocket import send_msg
+from .utils import persist_job_metadata, build_proposal_context, stream_llm_to_ws
 
 
 async def run_proposal_improver(job_id: int, job: dict, ws,
                                   objective_review: str, data_analysis: str, risk_analysis: str,
                                   roi_estimation: str, final_recommendation: str, bp_cases: list,
-                                  call_ollama, get_job, update_job_status, user_feedbacks: dict = None):
+                                  call_ollama, get_job, update_job_status, user_feedbacks: dict = None,
+                                  astream_llm=None, persist: bool = True):
     """Proposal Improver - Generate improved proposal based on all analyses
 
     Args:
@@ -23,6 +25,9 @@ async def run_proposal_improver(job_id: int, job: dict, ws,
         call_ollama: LLM call function
         get_job: Database get_job function
         update_job_status: Database update_job_status function
+        user_feedbacks: Agent별 사용자 피드백
+        astream_llm: 스트리밍 LLM 함수 (지정 시 생성 중인 토큰을 WebSocket으로 전송)
+        persist: 결과를 바로 DB에 저장할지 여부 (False면 호출자가 최종 저장 시 함께 기록)
 
     Returns:
         str: Improved proposal text
@@ -30,7 +35,7 @@ async def run_proposal_improver(job_id: int, job: dict, ws,
     # WebSocket이 이미 닫혔을 수 있으므로 try-except로 처리
     if ws:
         try:
-            await ws.send_json({
+            await send_msg(ws, {
                 "status": "processing",
                 "agent": "Proposal_Improver",
                 "message": "개선된 지원서 작성 중..."
@@ -69,10 +74,7 @@ async def run_proposal_improver(job_id: int, job: dict, ws,
 특히 예산, 인력, 기간, 기술 역량 등 구체적인 정보가 있다면 해당 섹션에 명시적으로 포함해주세요."""
 
     improvement_prompt = f"""당신은 AI 과제 지원서 작성 전문가입니다.
-다음 원본 지원서와 검토 결과를 바탕으로 개선된 지원서를 작성해주세요.
-
-**원본 지원서:**
-{proposal_text}
+위 제안서(원본 지원서)와 다음 검토 결과를 바탕으로 개선된 지원서를 작성해주세요.
 
 **검토 결과:**
 
@@ -139,15 +141,22 @@ async def run_proposal_improver(job_id: int, job: dict, ws,
 - 마크다운 형식으로 작성할 것
 - 전체 분량은 800-1200자 정도로 작성할 것"""
 
-    improved_proposal = await asyncio.to_thread(
-        call_ollama,
-        improvement_prompt,
-        enable_sequential_thinking=enable_seq_thinking
-    )
+    proposal_context = build_proposal_context(proposal_text)
+
+    if astream_llm and not enable_seq_thinking:
+        # 생성되는 토큰을 바로 전송하여 첫 응답까지의 대기 시간 단축
+        improved_proposal = await stream_llm_to_ws(astream_llm, improvement_prompt, proposal_context, ws, "Proposal_Improver")
+    else:
+        improved_proposal = await run_llm_in_thread(
+            call_ollama,
+            improvement_prompt,
+            enable_sequential_thinking=enable_seq_thinking,
+            system_prompt=proposal_context,
+        )
 
     if ws:
         try:
-            await ws.send_json({
+            await send_msg(ws, {
                 "status": "completed",
                 "agent": "Proposal_Improver",
                 "message": "개선된 지원서 작성 완료"
@@ -155,12 +164,13 @@ async def run_proposal_improver(job_id: int, job: dict, ws,
         except Exception as e:
             print(f"[Agent 7] WebSocket send failed (already closed): {e}")
 
-    persist_job_metadata(
-        job_id,
-        "proposal_improver_done",
-        get_job,
-        update_job_status,
-        agent_updates={"improved_proposal": improved_proposal},
-    )
+    if persist:
+        persist_job_metadata(
+            job_id,
+            "proposal_improver_done",
+            get_job,
+            update_job_status,
+            agent_updates={"improved_proposal": improved_proposal},
+        )
 
     return improved_proposal
@@ -1,33 +1,58 @@
 # agents/utils.py - Shared utility functions for all agents
 
-import json
 import re
 import asyncio
+import functools
 from typing import Optional
 
+import orjson
+
+from core.llm import run_llm_in_thread
+from core.websocket import send_msg
+
+
+# LLM 응답에서 JSON 추출용 정규식 (모듈 로드 시 한 번만 컴파일)
+# ```json / ``` 펜스 변형 모두 허용, 펜스가 없으면 한 단계 중첩까지의 객체를 찾음
+_JSON_FENCE_RE = re.compile(r"```(?i:json)?\s*(\{.*?\})\s*```", re.DOTALL)
+_JSON_OBJ_RE = re.compile(r"\{[^{}]*(?:\{[^{}]*\}[^{}]*)*\}", re.DOTALL)
+
 
 def _extract_json_dict(text: str) -> Optional[dict]:
     """Extract JSON dictionary from text response"""
     if not text:
         return None
     try:
-        parsed = json.loads(text)
+        parsed = orjson.loads(text)
         if isinstance(parsed, dict):
             return parsed
-    except json.JSONDecodeError:
+    except orjson.JSONDecodeError:
         pass
 
     match = re.search(r'\{.*\}', text, re.DOTALL)
     if match:
         try:
-            parsed = json.loads(match.group())
+            parsed = orjson.loads(match.group())
             if isinstance(parsed, dict):
                 return parsed
-        except json.JSONDecodeError:
+        except orjson.JSONDecodeError:
             return None
     return None
 
 
+@functools.lru_cache(maxsize=32)
+def build_proposal_context(proposal_text: str) -> str:
+    """에이전트 공통 system 프롬프트 (제안서 본문)
+
+    같은 job의 모든 에이전트 호출에서 바이트 단위로 동일하므로
+    LLM 서버의 prefix 캐시가 제안서 부분을 재사용할 수 있다.
+    (HITL 루프마다 다시 호출되므로 제안서별로 한 번만 생성)
+    """
+    return f"""다음은 검토 대상 AI 과제 제안서입니다.
+
+제안서 내용:
+{proposal_text}"""
+
+
 def _truncate_for_prompt(text: str, limit: int = 800) -> str:
     """Truncate text for prompt with limit"""
     if not text:
@@ -54,7 +79,7 @@ def _classify_decision_sync(final_report: str, final_recommendation: str, call_l
 응답 형식 예시:
 {{"decision": "승인", "reason": "핵심 근거"}}
 """
-    response = call_llm(prompt)
+    response = call_llm(prompt, task="classify")
     data = _extract_json_dict(response) or {}
     decision = data.get('decision')
     if decision not in ('승인', '보류'):
@@ -65,32 +90,12 @@ def _classify_decision_sync(final_report: str, final_recommendation: str, call_l
 
 async def classify_final_decision(final_report: str, final_recommendation: str, call_llm) -> dict:
     """Async wrapper for classify_final_decision"""
-    return await asyncio.to_thread(_classify_decision_sync, final_report, final_recommendation, call_llm)
+    return await run_llm_in_thread(_classify_decision_sync, final_report, final_recommendation, call_llm)
 
 
-def analyze_result_quality(agent_name: str, analysis_result: str, proposal_text: str, call_ollama) -> dict:
-    """Analyze agent result quality to determine if retry is needed
-
-    Returns:
-        {
-            "needs_retry": bool,
-            "reason": str,
-            "additional_info_needed": list
-        }
-    """
-    print(f"[DEBUG] Analyzing result quality for {agent_name}...")
-    print(f"[DEBUG] Analysis result length: {len(analysis_result)}")
-
-    quality_check_prompt = f"""당신은 AI 검토 프로세스의 품질 관리 orchestrator입니다.
-{agent_name}가 다음과 같은 분석 결과를 제출했습니다.
-
-제안서 내용:
-{proposal_text[:500]}...
-
-{agent_name}의 분석 결과:
-{analysis_result}
-
-위 분석 결과가 충분히 상세하고 구체적인지 평가해주세요.
+# 품질 평가 지시문 (모든 에이전트/재시도에서 동일한 앞부분)
+QUALITY_CHECK_SYSTEM_PROMPT = """당신은 AI 검토 프로세스의 품질 관리 orchestrator입니다.
+검토 에이전트가 제출한 분석 결과가 충분히 상세하고 구체적인지 평가해주세요.
 
 **재검토가 필요한 경우 (needs_retry = true):**
 - 분석 내용이 너무 짧거나 추상적인 경우 (2-3문장 미만)
@@ -106,33 +111,57 @@ def analyze_result_quality(agent_name: str, analysis_result: str, proposal_text:
 - 각 평가 항목이 구체적으로 설명된 경우
 
 반드시 다음 JSON 형식으로만 응답하세요 (설명 없이 JSON만):
-{{
+{
     "needs_retry": true,
     "reason": "분석 내용이 너무 간략하고 구체적인 근거가 부족함",
     "additional_info_needed": ["구체적인 데이터", "상세한 근거", "명확한 판단 기준"]
-}}
+}
 
 또는
 
-{{
+{
     "needs_retry": false,
     "reason": "분석이 충분히 상세하고 구체적임",
     "additional_info_needed": []
-}}"""
+}"""
+
+
+def analyze_result_quality(agent_name: str, analysis_result: str, proposal_text: str, call_ollama) -> dict:
+    """Analyze agent result quality to determine if retry is needed
+
+    Returns:
+        {
+            "needs_retry": bool,
+            "reason": str,
+            "additional_info_needed": list
+        }
+    """
+    print(f"[DEBUG] Analyzing result quality for {agent_name}...")
+    print(f"[DEBUG] Analysis result length: {len(analysis_result)}")
+
+    # 고정 지시문은 system 프롬프트, 에이전트별 입력은 뒤에 붙여 LLM 서버가 앞부분을 재사용하도록 함
+    quality_check_prompt = f"""평가 대상 에이전트: {agent_name}
+
+제안서 내용:
+{proposal_text[:500]}...
+
+{agent_name}의 분석 결과:
+{analysis_result}"""
 
     try:
-        result = call_ollama(quality_check_prompt)
+        result = call_ollama(quality_check_prompt, system_prompt=QUALITY_CHECK_SYSTEM_PROMPT, task="score")
         print(f"[DEBUG] Raw quality check response: {result}")
 
-        # JSON 파싱
-        json_str = result.strip()
-        if "```json" in json_str:
-            json_str = json_str.split("```json")[1].split("```")[0].strip()
-        elif "```" in json_str:
-            json_str = json_str.split("```")[1].split("```")[0].strip()
+        # JSON 파싱 (코드 펜스 안의 객체 우선, 없으면 본문에서 첫 JSON 객체)
+        match = _JSON_FENCE_RE.search(result)
+        if match:
+            json_str = match.group(1)
+        else:
+            match = _JSON_OBJ_RE.search(result)
+            json_str = match.group() if match else result.strip()
 
         print(f"[DEBUG] Extracted JSON string: {json_str}")
-        analysis = json.loads(json_str)
+        analysis = orjson.loads(json_str)
         print(f"[DEBUG] Parsed quality analysis: {analysis}")
 
         # needs_retry가 boolean이 아니면 변환
@@ -281,9 +310,6 @@ def generate_feedback_suggestion(agent_name: str, analysis_result: str, proposal
 
 {analysis_result}
 
-제안서 원문:
-{proposal_text[:1000]}...
-
 위 분석 결과를 바탕으로, 제안서 작성자가 **그대로 복사해서 피드백 입력란에 붙여넣고, 숫자나 단어만 약간 수정**하여 바로 제출할 수 있는 구체적인 피드백 예시를 작성해주세요.
 
 **중요**: 피드백 예시는 다음 요구사항을 모두 충족해야 합니다:
@@ -297,22 +323,78 @@ def generate_feedback_suggestion(agent_name: str, analysis_result: str, proposal
 위 가이드를 참고하여, 현재 {agent_name}의 분석 결과와 제안서에 맞는 구체적인 피드백 예시를 생성해주세요.
 반드시 []로 감싼 수정 가능한 값들을 포함하여 작성하세요."""
 
-    result = call_ollama(feedback_prompt)
+    # 제안서 원문은 에이전트 분석 호출과 같은 system 프롬프트로 전달 (prefix 캐시 재사용)
+    result = call_ollama(feedback_prompt, system_prompt=build_proposal_context(proposal_text))
     print(f"[DEBUG] Feedback suggestion generated (length: {len(result)} chars)")
     return result
 
 
+# job별 HITL 대기 중인 분석 결과 (사용자가 피드백 제안을 요청할 때만 LLM 호출)
+pending_hitl_results: dict[int, tuple] = {}
+
+
+def set_pending_hitl_result(job_id: int, agent_name: str, analysis_result: str, proposal_text: str, call_ollama):
+    """HITL 인터럽트 시점의 결과 등록 (get_feedback_suggestion에서 사용)"""
+    pending_hitl_results[job_id] = (agent_name, analysis_result, proposal_text, call_ollama)
+
+
+async def get_feedback_suggestion(job_id: int) -> Optional[str]:
+    """대기 중인 HITL 결과에 대한 피드백 제안 생성 (대기 중인 결과가 없으면 None)
+
+    같은 결과로 다시 요청하면 call_llm 응답 캐시가 재호출을 막아준다 (실패 응답은 캐시하지 않음).
+    """
+    pending = pending_hitl_results.get(job_id)
+    if pending is None:
+        return None
+    return await run_llm_in_thread(generate_feedback_suggestion, *pending)
+
+
+async def stream_llm_to_ws(astream_llm, prompt: str, system_prompt: str, ws, agent: str) -> str:
+    """astream_llm 응답을 토큰 단위로 WebSocket에 전송하고 전체 텍스트 반환
+
+    WebSocket이 닫혀도 스트리밍은 끝까지 받아 결과를 돌려준다.
+    """
+    chunks = []
+    async for chunk in astream_llm(prompt, system_prompt=system_prompt):
+        chunks.append(chunk)
+        if ws and not await send_msg(ws, {"type": "token", "agent": agent, "data": chunk}):
+            ws = None
+    return "".join(chunks)
+
+
+# job별 HITL 피드백 도착 이벤트 (process_review에서 생성, submit_feedback에서 set)
+feedback_events: dict[int, asyncio.Event] = {}
+
+
+def notify_feedback(job_id: int):
+    """피드백 도착을 대기 중인 wait_for_feedback에 즉시 알림"""
+    event = feedback_events.get(job_id)
+    if event:
+        event.set()
+
+
 async def wait_for_feedback(job_id: int, update_job_status, get_job, timeout_seconds: int = 300):
     """Wait for HITL feedback helper function"""
     print(f"Job {job_id}: Waiting for user feedback...")
+    event = feedback_events.setdefault(job_id, asyncio.Event())
+    # 이전 단계에서 타임아웃 후 늦게 도착한 알림은 무시
+    event.clear()
     update_job_status(job_id, "waiting_feedback")
 
-    for i in range(timeout_seconds):
-        job = get_job(job_id)
+    try:
+        await asyncio.wait_for(event.wait(), timeout=timeout_seconds)
+        event.clear()
+        print(f"Job {job_id}: Feedback received, continuing...")
+        return True
+    except asyncio.TimeoutError:
+        # 이벤트를 거치지 않고 상태만 바뀐 경우 대비 (마지막 1회 DB 확인)
+        job = get_job(job_id) or {}
         if job.get("status") == "feedback_received":
             print(f"Job {job_id}: Feedback received, continuing...")
             return True
-        await asyncio.sleep(1)
+    finally:
+        # 대기가 끝난 결과로 피드백 제안을 만들지 않도록 (재시도 중 /suggest는 다음 인터럽트까지 404)
+        pending_hitl_results.pop(job_id, None)
 
     print(f"Job {job_id}: Timeout waiting for feedback, continuing anyway...")
     return False
@@ -2,7 +2,7 @@
 from fastapi import APIRouter, Form
 from fastapi.responses import JSONResponse
 import asyncio
-import json
+import orjson
 import os
 import sys
 from typing import Callable, Dict
@@ -11,6 +11,7 @@ from fastapi import WebSocket
 # utils 모듈 import를 위한 경로 추가
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 from utils.internal_vlm import internal_vlm_client
+from utils.tasks import spawn_background
 
 router = APIRouter(prefix="/api/v1/confluence", tags=["confluence"])
 
@@ -156,7 +157,7 @@ async def submit_confluence_for_review(
 
         # HITL 단계 파싱
         try:
-            hitl_stages_list = json.loads(hitl_stages)
+            hitl_stages_list = orjson.loads(hitl_stages)
         except:
             hitl_stages_list = []
 
@@ -227,7 +228,7 @@ async def submit_confluence_for_review(
 
         # 첫 번째 페이지부터 순차적으로 처리 시작
         print(f"Starting sequential processing for {len(job_ids)} pages")
-        asyncio.create_task(_process_confluence_pages_sequentially_func(job_ids, page_list))
+        spawn_background(_process_confluence_pages_sequentially_func(job_ids, page_list))
 
         return {
             "status": "submitted",
@@ -92,8 +92,15 @@ async def dashboard_list(
     limit: int = 50,
     offset: int = 0,
     order: str = "desc",
+    cursor_created_at: Optional[str] = None,
+    cursor_id: Optional[int] = None,
+    summary: bool = False,
 ):
-    """Job 목록 조회 (필터링, 페이징, 검색 지원)"""
+    """Job 목록 조회 (필터링, 페이징, 검색 지원)
+
+    응답의 next_cursor 값을 cursor_created_at / cursor_id로 넘기면 키셋 방식으로 다음 페이지 조회
+    summary=true면 본문/메타데이터 없이 목록 표시용 필드만 반환
+    """
     limit = max(1, min(limit, 200))
     offset = max(0, offset)
 
@@ -106,6 +113,9 @@ async def dashboard_list(
         input_method=input_method,
         search=search,
         order=order,
+        cursor_created_at=cursor_created_at,
+        cursor_id=cursor_id,
+        summary=summary,
     )
 
     total = _count_jobs_func(status=status, decision=decision, llm_decision=llm_decision, input_method=input_method, search=search)
@@ -113,14 +123,21 @@ async def dashboard_list(
     formatted_jobs = []
     for job in jobs:
         job_copy = job.copy()
-        proposal_text = (job_copy.get("proposal_content") or "")
-        job_copy["proposal_preview"] = proposal_text[:200]
+        if not summary:
+            proposal_text = (job_copy.get("proposal_content") or "")
+            job_copy["proposal_preview"] = proposal_text[:200]
         formatted_jobs.append(job_copy)
 
+    next_cursor = None
+    if len(jobs) == limit:
+        last_job = jobs[-1]
+        next_cursor = {"cursor_created_at": last_job["created_at"], "cursor_id": last_job["id"]}
+
     return {
         "total": total,
         "limit": limit,
         "offset": offset,
+        "next_cursor": next_cursor,
         "jobs": formatted_jobs,
     }
 
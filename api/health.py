@@ -1,9 +1,21 @@
 # api/health.py - 헬스체크 및 정적 페이지 엔드포인트
 from fastapi import APIRouter
 from fastapi.responses import FileResponse
+from typing import Callable
 
 router = APIRouter()
 
+# 의존성 주입을 위한 전역 변수
+_get_llm_load_func: Callable = None
+_get_llm_cache_stats_func: Callable = None
+
+
+def init_health_router(get_llm_load_func: Callable, get_llm_cache_stats_func: Callable = None):
+    """라우터 초기화 - 필요한 함수들을 주입"""
+    global _get_llm_load_func, _get_llm_cache_stats_func
+    _get_llm_load_func = get_llm_load_func
+    _get_llm_cache_stats_func = get_llm_cache_stats_func
+
 
 @router.get("/")
 async def root():
@@ -13,8 +25,13 @@ async def root():
 
 @router.get("/health")
 async def health_check():
-    """헬스 체크 엔드포인트"""
-    return {"status": "healthy", "service": "AI Proposal Reviewer"}
+    """헬스 체크 엔드포인트 (LLM 요청 대기열 길이, 응답 캐시 적중률 포함)"""
+    result = {"status": "healthy", "service": "AI Proposal Reviewer"}
+    if _get_llm_load_func:
+        result["llm"] = _get_llm_load_func()
+    if _get_llm_cache_stats_func:
+        result["llm_cache"] = _get_llm_cache_stats_func()
+    return result
 
 
 @router.get("/dashboard")
@@ -1,7 +1,7 @@
 # api/review.py - 제안서 검토 관련 엔드포인트
 from fastapi import APIRouter, UploadFile, File, Form
 from fastapi.responses import JSONResponse
-import json
+import orjson
 import asyncio
 from typing import Callable, Dict
 from fastapi import WebSocket
@@ -12,6 +12,7 @@ import os
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 from utils.file_parser import extract_text_from_file, extract_text_and_images_from_file
 from utils.internal_vlm import internal_vlm_client
+from utils.tasks import spawn_background
 
 router = APIRouter(prefix="/api/v1/review", tags=["review"])
 
@@ -23,6 +24,8 @@ _create_job_func: Callable = None
 _update_job_feedback_func: Callable = None
 _update_job_status_func: Callable = None
 _get_job_func: Callable = None
+_notify_feedback_func: Callable = None
+_get_feedback_suggestion_func: Callable = None
 
 
 def init_review_router(
@@ -33,10 +36,13 @@ def init_review_router(
     update_job_feedback_func: Callable,
     update_job_status_func: Callable,
     get_job_func: Callable,
+    notify_feedback_func: Callable = None,
+    get_feedback_suggestion_func: Callable = None,
 ):
     """라우터 초기화 - 필요한 함수들을 주입"""
     global _active_connections, _process_review_func, _generate_job_title_func
     global _create_job_func, _update_job_feedback_func, _update_job_status_func, _get_job_func
+    global _notify_feedback_func, _get_feedback_suggestion_func
 
     _active_connections = active_connections
     _process_review_func = process_review_func
@@ -45,6 +51,8 @@ def init_review_router(
     _update_job_feedback_func = update_job_feedback_func
     _update_job_status_func = update_job_status_func
     _get_job_func = get_job_func
+    _notify_feedback_func = notify_feedback_func
+    _get_feedback_suggestion_func = get_feedback_suggestion_func
 
 
 @router.post("/submit")
@@ -64,7 +72,8 @@ async def submit_proposal(
 
     if file:
         # 파일 업로드 방식
-        contents = await file.read()
+        # 업로드 본문은 Starlette가 SpooledTemporaryFile(file.file)에 보관하므로
+        # 문서 파서에는 bytes로 복사하지 않고 파일 객체를 그대로 전달
         filename_lower = file.filename.lower()
 
         # 이미지 파일 확장자 체크
@@ -75,11 +84,13 @@ async def submit_proposal(
         if is_image_file and internal_vlm_client.is_enabled():
             print(f"[VLM] Direct image file upload detected: {file.filename}")
             try:
-                # Base64 인코딩
-                image_base64 = internal_vlm_client.encode_image_to_base64(contents)
+                # Base64 인코딩 (이미지는 전체 바이트가 필요)
+                contents = await file.read()
+                image_base64 = await asyncio.to_thread(internal_vlm_client.encode_image_to_base64, contents)
 
-                # VLM으로 이미지 분석
-                description = internal_vlm_client.analyze_image(
+                # VLM으로 이미지 분석 (동기 HTTP 호출이므로 스레드에서 실행)
+                description = await asyncio.to_thread(
+                    internal_vlm_client.analyze_image,
                     image_base64,
                     prompt="이 이미지는 제안서 관련 이미지입니다. 이미지에서 보이는 내용을 상세하게 설명하고, 제안서 검토에 도움이 될 만한 정보를 추출해주세요.",
                     max_tokens=1500
@@ -98,7 +109,8 @@ async def submit_proposal(
 
         # VLM이 활성화되어 있고 문서 파일인 경우 이미지도 추출하여 분석
         elif internal_vlm_client.is_enabled():
-            text_content, images = extract_text_and_images_from_file(contents, file.filename)
+            # 문서 파싱/디코딩은 CPU 작업이므로 이벤트 루프 밖에서 실행
+            text_content, images = await asyncio.to_thread(extract_text_and_images_from_file, file.file, file.filename)
             proposal_content = text_content
 
             # 추출된 이미지를 VLM으로 분석
@@ -107,10 +119,11 @@ async def submit_proposal(
                 for idx, image_bytes in enumerate(images, 1):
                     try:
                         # Base64 인코딩
-                        image_base64 = internal_vlm_client.encode_image_to_base64(image_bytes)
+                        image_base64 = await asyncio.to_thread(internal_vlm_client.encode_image_to_base64, image_bytes)
 
                         # VLM으로 이미지 분석
-                        description = internal_vlm_client.analyze_image(
+                        description = await asyncio.to_thread(
+                            internal_vlm_client.analyze_image,
                             image_base64,
                             prompt=f"이 이미지는 제안서의 {idx}번째 이미지입니다. 이미지에서 보이는 내용을 상세하게 설명하고, 제안서 검토에 도움이 될 만한 정보를 추출해주세요.",
                             max_tokens=1000
@@ -133,7 +146,7 @@ async def submit_proposal(
                 proposal_content = f"[이미지 파일 업로드됨: {file.filename}]\n\n이미지 분석을 위해 VLM을 활성화해주세요."
             else:
                 # 일반 문서 파일의 텍스트만 추출
-                proposal_content = extract_text_from_file(contents, file.filename)
+                proposal_content = await asyncio.to_thread(extract_text_from_file, file.file, file.filename)
 
     elif text:
         # 텍스트 직접 입력 방식
@@ -146,7 +159,7 @@ async def submit_proposal(
 
     # HITL 단계 파싱
     try:
-        hitl_stages_list = json.loads(hitl_stages)
+        hitl_stages_list = orjson.loads(hitl_stages)
     except:
         hitl_stages_list = []  # 기본값: HITL 비활성화
 
@@ -175,7 +188,7 @@ async def submit_proposal(
 
     # 백그라운드에서 검토 프로세스 시작
     print(f"Starting background task for job {job_id}")
-    asyncio.create_task(_process_review_func(job_id))
+    spawn_background(_process_review_func(job_id))
 
     return {"job_id": job_id, "status": "submitted"}
 
@@ -202,11 +215,28 @@ async def submit_feedback(job_id: int, feedback: dict):
     # DB 상태를 feedback_received로 업데이트
     _update_job_status_func(job_id, "feedback_received")
 
+    # 대기 중인 에이전트를 폴링 없이 즉시 깨움
+    if _notify_feedback_func:
+        _notify_feedback_func(job_id)
+
     print(f"[DEBUG] Feedback saved and status updated for job {job_id}")
 
     return {"status": "feedback_received", "job_id": job_id, "skip": skip_requested}
 
 
+@router.post("/suggest/{job_id}")
+async def suggest_feedback(job_id: int):
+    """HITL 피드백 제안 생성 (사용자가 요청한 경우에만 LLM 호출, 같은 결과는 캐시 재사용)"""
+    suggestion = await _get_feedback_suggestion_func(job_id) if _get_feedback_suggestion_func else None
+    if suggestion is None:
+        return JSONResponse(
+            status_code=404,
+            content={"error": "피드백을 기다리는 검토 결과가 없습니다"}
+        )
+
+    return {"job_id": job_id, "feedback_suggestion": suggestion}
+
+
 @router.get("/pdf/{job_id}")
 async def download_pdf(job_id: int):
     """PDF 다운로드"""
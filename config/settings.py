@@ -8,6 +8,26 @@ load_dotenv()
 HOST = os.getenv("HOST", "0.0.0.0")
 PORT = int(os.getenv("PORT", 8080))
 
+# 이벤트 루프 / HTTP 파서 구현 ("auto"면 uvloop/httptools가 설치되어 있을 때 사용, Windows는 asyncio)
+UVICORN_LOOP = os.getenv("UVICORN_LOOP", "auto")
+UVICORN_HTTP = os.getenv("UVICORN_HTTP", "auto")
+
+# WebSocket 프로토콜 레벨 ping 주기/응답 대기 시간 (초)
+WS_PING_INTERVAL = float(os.getenv("WS_PING_INTERVAL", 20))
+WS_PING_TIMEOUT = float(os.getenv("WS_PING_TIMEOUT", 20))
+
+# WebSocket permessage-deflate 압축 (최종 보고서 HTML처럼 반복이 많은 큰 프레임 전송량 감소)
+WS_PER_MESSAGE_DEFLATE = os.getenv("WS_PER_MESSAGE_DEFLATE", "true").lower() == "true"
+
+# Agent 2~5 동시 실행 여부 (Ollama 사용 시 서버에 OLLAMA_NUM_PARALLEL>=4 설정 권장)
+PARALLEL_AGENTS = os.getenv("PARALLEL_AGENTS", "true").lower() == "true"
+
+# HITL 단계 종료 후 UI 표시용 지연 (초, 0이면 지연 없음)
+UI_PACING_SEC = float(os.getenv("UI_PACING_SEC", 0))
+
+# 서버 시작 시 미완료 작업 자동 재개 여부
+RESUME_INCOMPLETE_JOBS = os.getenv("RESUME_INCOMPLETE_JOBS", "false").lower() == "true"
+
 # LLM 설정
 OPENAI_API_KEY = os.getenv("OPENAI_API_KEY", "")
 OLLAMA_BASE_URL = os.getenv("OLLAMA_BASE_URL", "http://localhost:11434")
@@ -1,8 +1,13 @@
 # confluence_api.py - Confluence Data Center API 연동
 import os
+import logging
+import orjson
 import requests
+from requests.adapters import HTTPAdapter
 from requests.auth import HTTPBasicAuth
-from bs4 import BeautifulSoup
+from urllib3.util.retry import Retry
+from lxml import etree, html as lxml_html
+from lxml.html.clean import Cleaner
 from dotenv import load_dotenv
 import urllib3
 from typing import List, Tuple
@@ -13,14 +18,53 @@ urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
 
 load_dotenv()
 
+# 재귀 탐색 디버그 로그 (운영 환경은 WARNING 레벨로 설정하여 비활성화)
+log = logging.getLogger(__name__)
+
 CONFLUENCE_BASE_URL = os.getenv("CONFLUENCE_BASE_URL", "")
 CONFLUENCE_USERNAME = os.getenv("CONFLUENCE_USERNAME", "")
 CONFLUENCE_API_TOKEN = os.getenv("CONFLUENCE_API_TOKEN", "")
 
+# CQL 검색 엔드포인트 (모듈 로드 시 한 번만 구성)
+_SEARCH_URL = f"{CONFLUENCE_BASE_URL}/rest/api/content/search"
+
+# 이미지 태그 XPath (모듈 로드 시 한 번만 컴파일)
+# HTML 파서는 Confluence 네임스페이스를 해석하지 않으므로 "ac:image" 태그명을 그대로 비교
+_IMG_XPATH = etree.XPath('//img | //*[name()="ac:image"]')
+_ATTACHMENT_XPATH = etree.XPath('.//*[name()="ri:attachment"]')
+
+# 텍스트 추출 전 LLM에 불필요한 요소 제거 (스크립트/스타일, 매크로 파라미터, 템플릿 안내문구, 주석)
+# ac:structured-macro 자체는 본문(ac:rich-text-body)을 포함할 수 있으므로 유지
+_CLEANER = Cleaner(
+    kill_tags=['script', 'style', 'ac:parameter', 'ac:placeholder'],
+    remove_unknown_tags=False,
+    safe_attrs_only=False,
+    page_structure=False,
+)
+
 def get_auth():
     """Confluence 인증 정보 반환"""
     return HTTPBasicAuth(CONFLUENCE_USERNAME, CONFLUENCE_API_TOKEN)
 
+# Confluence API 호출용 공유 세션 (하위 페이지 재귀 탐색/이미지 다운로드 시 커넥션 풀 재사용)
+_session = requests.Session()
+_session.mount("http://", HTTPAdapter(
+    pool_connections=8,
+    pool_maxsize=32,
+    max_retries=Retry(
+        total=3,
+        backoff_factor=0.3,
+        status_forcelist=[502, 503, 504],
+        raise_on_status=False,
+    ),
+))
+_session.mount("https://", _session.get_adapter("http://"))
+_session.auth = get_auth()
+
+def _json(response: requests.Response):
+    """응답 본문을 orjson으로 파싱 (대용량 body.storage 응답에서 stdlib json보다 빠름)"""
+    return orjson.loads(response.content)
+
 def get_page_images(page_id: str, html_content: str) -> List[bytes]:
     """페이지에서 이미지 추출"""
     images = []
@@ -28,27 +72,27 @@ def get_page_images(page_id: str, html_content: str) -> List[bytes]:
     if not internal_vlm_client.is_enabled():
         return images
 
+    # 이미지 태그가 하나도 없으면 HTML 파싱 생략 (텍스트 위주 페이지)
+    if not html_content or ('<img' not in html_content and '<ac:image' not in html_content):
+        return images
+
     try:
-        soup = BeautifulSoup(html_content, 'html.parser')
+        tree = lxml_html.fromstring(html_content)
 
         # 이미지 태그 찾기 (Confluence는 ac:image와 img 태그 사용)
-        img_tags = soup.find_all(['img', 'ac:image'])
-
-        for img in img_tags:
+        for img in _IMG_XPATH(tree):
             # 이미지 URL 추출
             image_url = None
 
             # <img src="..."> 형태
-            if img.name == 'img' and img.get('src'):
+            if img.tag == 'img':
                 image_url = img.get('src')
 
             # <ac:image><ri:attachment ri:filename="..."/></ac:image> 형태
-            elif img.name == 'ac:image':
-                attachment = img.find('ri:attachment')
-                if attachment and attachment.get('ri:filename'):
-                    filename = attachment.get('ri:filename')
-                    # Confluence attachment URL 구성
-                    image_url = f"{CONFLUENCE_BASE_URL}/rest/api/content/{page_id}/child/attachment"
+            else:
+                attachments = _ATTACHMENT_XPATH(img)
+                filename = attachments[0].get('ri:filename') if attachments else None
+                if filename:
                     # 실제 첨부 파일 다운로드 URL 가져오기
                     image_url = get_attachment_download_url(page_id, filename)
 
@@ -59,7 +103,7 @@ def get_page_images(page_id: str, html_content: str) -> List[bytes]:
 
                 # 이미지 다운로드
                 try:
-                    img_response = requests.get(image_url, auth=get_auth(), timeout=30, verify=False)
+                    img_response = _session.get(image_url, timeout=30, verify=False)
                     img_response.raise_for_status()
                     images.append(img_response.content)
                 except Exception as img_err:
@@ -78,10 +122,10 @@ def get_attachment_download_url(page_id: str, filename: str) -> str:
         url = f"{CONFLUENCE_BASE_URL}/rest/api/content/{page_id}/child/attachment"
         params = {"filename": filename}
 
-        response = requests.get(url, params=params, auth=get_auth(), timeout=30, verify=False)
+        response = _session.get(url, params=params, timeout=30, verify=False)
         response.raise_for_status()
 
-        data = response.json()
+        data = _json(response)
         results = data.get("results", [])
 
         if results:
@@ -96,6 +140,14 @@ def get_attachment_download_url(page_id: str, filename: str) -> str:
         return ""
 
 
+def extract_text_from_storage(html_content: str) -> str:
+    """Confluence storage HTML에서 본문 텍스트만 추출 (줄 단위, 앞뒤 공백 제거)"""
+    if not html_content or not html_content.strip():
+        return ""
+    tree = lxml_html.fromstring(html_content)
+    _CLEANER(tree)
+    return "\n".join(text.strip() for text in tree.itertext() if text.strip())
+
 def get_page_content(page_id: str) -> dict:
     """특정 페이지의 내용 가져오기"""
     try:
@@ -104,15 +156,14 @@ def get_page_content(page_id: str) -> dict:
             "expand": "body.storage,version,ancestors"
         }
 
-        response = requests.get(url, params=params, auth=get_auth(), timeout=30, verify=False)
+        response = _session.get(url, params=params, timeout=30, verify=False)
         response.raise_for_status()
 
-        data = response.json()
+        data = _json(response)
 
         # HTML에서 텍스트 추출
         html_content = data.get("body", {}).get("storage", {}).get("value", "")
-        soup = BeautifulSoup(html_content, 'html.parser')
-        text_content = soup.get_text(separator='\n', strip=True)
+        text_content = extract_text_from_storage(html_content)
 
         # 이미지 추출
         images = get_page_images(page_id, html_content)
@@ -139,10 +190,10 @@ def get_child_pages(page_id: str) -> list:
             "limit": 100  # 최대 100개
         }
 
-        response = requests.get(url, params=params, auth=get_auth(), timeout=30, verify=False)
+        response = _session.get(url, params=params, timeout=30, verify=False)
         response.raise_for_status()
 
-        data = response.json()
+        data = _json(response)
         results = data.get("results", [])
 
         child_pages = []
@@ -160,49 +211,52 @@ def get_child_pages(page_id: str) -> list:
 
 def get_pages_recursively(page_id: str, include_current: bool = True, max_depth: int = 3, current_depth: int = 0) -> list:
     """페이지와 하위 페이지를 재귀적으로 가져오기"""
-    print(f"[DEBUG] get_pages_recursively called: page_id={page_id}, current_depth={current_depth}, max_depth={max_depth}, include_current={include_current}")
+    log.debug("get_pages_recursively called: page_id=%s, current_depth=%d, max_depth=%d, include_current=%s",
+              page_id, current_depth, max_depth, include_current)
 
     pages = []
 
     # 현재 페이지 포함
     if include_current or current_depth > 0:
-        print(f"[DEBUG] Fetching current page: {page_id}")
+        log.debug("Fetching current page: %s", page_id)
         current_page = get_page_content(page_id)
         if current_page:
-            print(f"[DEBUG] Current page fetched: {current_page.get('title')}")
+            log.debug("Current page fetched: %s", current_page.get('title'))
             pages.append(current_page)
         else:
-            print(f"[DEBUG] Current page is None")
+            log.debug("Current page is None: %s", page_id)
 
     # 하위 페이지 가져오기 (max_depth 체크는 재귀 호출 전에)
     if current_depth < max_depth:
-        print(f"[DEBUG] Fetching child pages for: {page_id}")
+        log.debug("Fetching child pages for: %s", page_id)
         child_pages = get_child_pages(page_id)
-        print(f"[DEBUG] Found {len(child_pages)} child pages")
+        log.debug("Found %d child pages", len(child_pages))
 
         for child in child_pages:
             child_id = child.get("id")
             child_title = child.get("title")
-            print(f"[DEBUG] Processing child: {child_title} (ID: {child_id})")
+            log.debug("Processing child: %s (ID: %s)", child_title, child_id)
             # 재귀적으로 하위 페이지의 내용과 그 하위 페이지들 가져오기
             sub_pages = get_pages_recursively(child_id, include_current=True, max_depth=max_depth, current_depth=current_depth + 1)
-            print(f"[DEBUG] Got {len(sub_pages)} pages from child {child_title}")
+            log.debug("Got %d pages from child %s", len(sub_pages), child_title)
             pages.extend(sub_pages)
     else:
-        print(f"[DEBUG] Max depth reached, skipping child page fetch")
+        log.debug("Max depth reached, skipping child page fetch")
 
-    print(f"[DEBUG] Returning {len(pages)} total pages from page_id={page_id}")
+    log.debug("Returning %d total pages from page_id=%s", len(pages), page_id)
     return pages
 
+def _escape_cql(value: str) -> str:
+    """CQL 문자열 리터럴용 이스케이프 (역슬래시, 작은따옴표)"""
+    return value.replace('\\', '\\\\').replace("'", "\\'")
+
 def search_pages_by_query(query: str, space_key: str = None, limit: int = 10) -> list:
     """CQL을 사용하여 페이지 검색"""
     try:
-        url = f"{CONFLUENCE_BASE_URL}/rest/api/content/search"
-
-        # CQL 쿼리 구성
-        cql = f"type=page and text~'{query}'"
+        # CQL 쿼리 구성 (사용자 입력은 문자열 리터럴로 이스케이프)
+        cql = f"type=page and text~'{_escape_cql(query)}'"
         if space_key:
-            cql += f" and space='{space_key}'"
+            cql += f" and space='{_escape_cql(space_key)}'"
 
         params = {
             "cql": cql,
@@ -210,10 +264,10 @@ def search_pages_by_query(query: str, space_key: str = None, limit: int = 10) ->
             "expand": "version"
         }
 
-        response = requests.get(url, params=params, auth=get_auth(), timeout=30, verify=False)
+        response = _session.get(_SEARCH_URL, params=params, timeout=30, verify=False)
         response.raise_for_status()
 
-        data = response.json()
+        data = _json(response)
         results = data.get("results", [])
 
         pages = []
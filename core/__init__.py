@@ -1,18 +1,36 @@
 """Core functionality modules"""
-from .llm import init_llm, call_llm, call_ollama, LLM_PROVIDER, llm_client
-from .rag import retrieve_from_rag, rag_retrieve_bp_cases, get_dummy_bp_cases
-from .websocket import websocket_endpoint, get_active_connections, active_connections
+from .llm import init_llm, call_llm, acall_llm, acall_llm_many, acall_llm_as_completed, call_llm_many, stream_llm, astream_llm, LLMStreamFailure, call_ollama, run_llm_in_thread, warmup_llm, get_llm_load, get_llm_cache_stats, LLM_PROVIDER, llm_client
+from .rag import retrieve_from_rag, aretrieve_from_rag, aclose_rag_client, retrieve_ensemble, rag_retrieve_bp_cases, get_dummy_bp_cases
+from .websocket import websocket_endpoint, get_active_connections, active_connections, send_to_job, send_msg, broadcast, wait_for_connection
 
 __all__ = [
     "init_llm",
     "call_llm",
+    "acall_llm",
+    "acall_llm_many",
+    "acall_llm_as_completed",
+    "call_llm_many",
+    "stream_llm",
+    "astream_llm",
+    "LLMStreamFailure",
     "call_ollama",
+    "run_llm_in_thread",
+    "warmup_llm",
+    "get_llm_load",
+    "get_llm_cache_stats",
     "LLM_PROVIDER",
     "llm_client",
     "retrieve_from_rag",
+    "aretrieve_from_rag",
+    "aclose_rag_client",
+    "retrieve_ensemble",
     "rag_retrieve_bp_cases",
     "get_dummy_bp_cases",
     "websocket_endpoint",
     "get_active_connections",
     "active_connections",
+    "send_to_job",
+    "send_msg",
+    "broadcast",
+    "wait_for_connection",
 ]
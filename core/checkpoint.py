@@ -0,0 +1,182 @@
+"""LLM call checkpoints (JSONL)
+
+성공한 LLM 응답을 (job_id, step_id, 프롬프트) 키로 job별 파일에 기록해 두고,
+서버 재시작 후 같은 job을 다시 처리할 때 이미 받은 응답은 재호출 없이 재사용한다.
+작업이 끝나면 discard_checkpoint로 해당 job의 파일을 삭제한다.
+"""
+import asyncio
+import functools
+import hashlib
+import inspect
+import os
+import threading
+from pathlib import Path
+
+import orjson
+
+from config.settings import RESUME_INCOMPLETE_JOBS
+from core.llm import LLMStreamFailure
+
+
+# 체크포인트는 재개(RESUME_INCOMPLETE_JOBS)할 때만 읽히므로 기본값도 재개 설정을 따름
+LLM_CHECKPOINT_ENABLED = os.getenv("LLM_CHECKPOINT_ENABLED", str(RESUME_INCOMPLETE_JOBS)).lower() == "true"
+LLM_CHECKPOINT_DIR = Path(os.getenv("LLM_CHECKPOINT_DIR", "data/llm_checkpoints"))
+
+# call_llm이 실패 시 반환하는 문자열 접두어 (체크포인트에 저장하지 않음)
+_FAILURE_PREFIX = "AI 응답 생성 실패"
+
+
+class LLMCheckpoint:
+    """JSONL 파일 기반 체크포인트 저장소 (최초 조회 시 전체 인덱스를 메모리에 로드)"""
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        self._index: dict[str, str] | None = None
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def make_key(job_id, step_id: str, prompt: str, options: dict | None = None) -> str:
+        """job/단계/프롬프트와 호출 옵션(system_prompt, task, tool 플래그 등) 기반 키"""
+        raw = orjson.dumps([job_id, step_id, prompt, options or {}], option=orjson.OPT_SORT_KEYS)
+        return hashlib.blake2b(raw, digest_size=16).hexdigest()
+
+    def _load(self) -> dict[str, str]:
+        index = {}
+        if self.path.exists():
+            with self.path.open("rb") as f:
+                for line in f:
+                    try:
+                        record = orjson.loads(line)
+                    except orjson.JSONDecodeError:
+                        # 비정상 종료로 마지막 줄이 잘린 경우 무시
+                        continue
+                    index[record["key"]] = record["response"]
+        return index
+
+    def get(self, key: str) -> str | None:
+        with self._lock:
+            if self._index is None:
+                self._index = self._load()
+            return self._index.get(key)
+
+    def put(self, key: str, response: str, job_id=None) -> None:
+        """응답 기록 (append 후 fsync로 디스크 반영 보장)"""
+        line = orjson.dumps({"key": key, "job_id": job_id, "response": response}) + b"\n"
+        with self._lock:
+            if self._index is None:
+                self._index = self._load()
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            with self.path.open("ab") as f:
+                f.write(line)
+                f.flush()
+                os.fsync(f.fileno())
+            self._index[key] = response
+
+    def __len__(self) -> int:
+        with self._lock:
+            if self._index is None:
+                self._index = self._load()
+            return len(self._index)
+
+    def delete(self) -> None:
+        """체크포인트 파일과 메모리 인덱스 삭제"""
+        with self._lock:
+            self.path.unlink(missing_ok=True)
+            self._index = {}
+
+
+# job_id -> 해당 job의 체크포인트 저장소
+_job_checkpoints: dict[str, LLMCheckpoint] = {}
+_job_checkpoints_lock = threading.Lock()
+
+
+def get_job_checkpoint(job_id) -> LLMCheckpoint:
+    """job 전용 체크포인트 저장소 (LLM_CHECKPOINT_DIR/{job_id}.jsonl)"""
+    with _job_checkpoints_lock:
+        store = _job_checkpoints.get(str(job_id))
+        if store is None:
+            store = _job_checkpoints[str(job_id)] = LLMCheckpoint(LLM_CHECKPOINT_DIR / f"{job_id}.jsonl")
+        return store
+
+
+def discard_checkpoint(job_id) -> None:
+    """끝난 job의 체크포인트 삭제 (더 이상 재개할 일이 없으므로)"""
+    with _job_checkpoints_lock:
+        store = _job_checkpoints.pop(str(job_id), None)
+    (store or LLMCheckpoint(LLM_CHECKPOINT_DIR / f"{job_id}.jsonl")).delete()
+
+
+def _call_options(signature: inspect.Signature, prompt: str, args: tuple, kwargs: dict) -> dict:
+    """프롬프트를 제외한 호출 인자 (기본값 포함, 위치/키워드 전달 방식과 무관하게 같은 값)"""
+    bound = signature.bind(prompt, *args, **kwargs)
+    bound.apply_defaults()
+    options = dict(bound.arguments)
+    options.pop(next(iter(signature.parameters)))
+    return options
+
+
+def checkpointed(call, job_id, step_id: str = "", checkpoint: LLMCheckpoint | None = None):
+    """call_llm / call_ollama를 job 단위 체크포인트로 감싼 함수 반환 (시그니처 동일)
+
+    Args:
+        call: 원본 LLM 호출 함수
+        job_id: 작업 ID
+        step_id: 같은 job 안에서 단계를 구분할 ID (프롬프트가 같아도 다른 단계면 따로 저장)
+        checkpoint: 체크포인트 저장소 (기본값: job 전용 파일)
+    """
+    if not LLM_CHECKPOINT_ENABLED:
+        return call
+
+    store = checkpoint or get_job_checkpoint(job_id)
+    signature = inspect.signature(call)
+
+    @functools.wraps(call)
+    def wrapper(prompt: str, *args, **kwargs):
+        key = store.make_key(job_id, step_id, prompt, _call_options(signature, prompt, args, kwargs))
+        saved = store.get(key)
+        if saved is not None:
+            print(f"[Checkpoint] job {job_id}: 저장된 LLM 응답 재사용")
+            return saved
+
+        response = call(prompt, *args, **kwargs)
+        if response and not response.startswith(_FAILURE_PREFIX):
+            store.put(key, response, job_id=job_id)
+        return response
+
+    return wrapper
+
+
+def checkpointed_stream(astream, job_id, step_id: str = "", checkpoint: LLMCheckpoint | None = None):
+    """astream_llm을 job 단위 체크포인트로 감싼 async generator 함수 반환
+
+    저장된 응답이 있으면 한 번에 yield하고, 없으면 스트리밍하면서 모은 전체 응답을 저장한다.
+    """
+    if not LLM_CHECKPOINT_ENABLED:
+        return astream
+
+    store = checkpoint or get_job_checkpoint(job_id)
+    signature = inspect.signature(astream)
+
+    @functools.wraps(astream)
+    async def wrapper(prompt: str, *args, **kwargs):
+        key = store.make_key(job_id, step_id, prompt, _call_options(signature, prompt, args, kwargs))
+        # 첫 조회 시 파일 전체를 읽으므로 이벤트 루프 밖에서 실행
+        saved = await asyncio.to_thread(store.get, key)
+        if saved is not None:
+            print(f"[Checkpoint] job {job_id}: 저장된 LLM 응답 재사용 (stream)")
+            yield saved
+            return
+
+        chunks = []
+        failed = False
+        async for chunk in astream(prompt, *args, **kwargs):
+            # 부분 응답 + 실패 메시지는 저장하지 않음 (재개 시 다시 호출)
+            failed = failed or isinstance(chunk, LLMStreamFailure)
+            chunks.append(chunk)
+            yield chunk
+
+        response = "".join(chunks)
+        if response and not failed and not response.startswith(_FAILURE_PREFIX):
+            await asyncio.to_thread(store.put, key, response, job_id)
+
+    return wrapper
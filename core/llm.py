@@ -1,24 +1,324 @@
 """LLM initialization and calling functions"""
 import os
+import re
+import sqlite3
 import uuid
+import asyncio
+import concurrent.futures
+import contextlib
+import functools
+import hashlib
+import threading
+import time
+import traceback
+import weakref
+from collections import OrderedDict
+from typing import Any, AsyncIterator, Iterator
+
+import httpx
 import ollama
+import orjson
+
+from database.db import get_cached_llm_response, put_cached_llm_response
 
 
 # LLM 설정 및 초기화
 LLM_PROVIDER = os.getenv("LLM_PROVIDER", "ollama")
 llm_client = None
 
+# Sequential thinking tool definition (모듈 로드 시 한 번만 생성)
+SEQUENTIAL_THINKING_TOOL = {
+    "type": "function",
+    "function": {
+        "name": "sequentialthinking",
+        "description": """A detailed tool for dynamic and reflective problem-solving through thoughts.
+This tool helps analyze problems through a flexible thinking process that can adapt and evolve.
+Each thought can build on, question, or revise previous insights as understanding deepens.""",
+        "parameters": {
+            "type": "object",
+            "properties": {
+                "thought": {
+                    "type": "string",
+                    "description": "Your current thinking step"
+                },
+                "nextThoughtNeeded": {
+                    "type": "boolean",
+                    "description": "Whether another thought step is needed"
+                },
+                "thoughtNumber": {
+                    "type": "integer",
+                    "description": "Current thought number",
+                    "minimum": 1
+                },
+                "totalThoughts": {
+                    "type": "integer",
+                    "description": "Estimated total thoughts needed",
+                    "minimum": 1
+                },
+                "isRevision": {
+                    "type": "boolean",
+                    "description": "Whether this revises previous thinking"
+                },
+                "revisesThought": {
+                    "type": "integer",
+                    "description": "Which thought is being reconsidered"
+                },
+                "branchFromThought": {
+                    "type": "integer",
+                    "description": "Branching point thought number"
+                },
+                "branchId": {
+                    "type": "string",
+                    "description": "Branch identifier"
+                },
+                "needsMoreThoughts": {
+                    "type": "boolean",
+                    "description": "If more thoughts are needed"
+                }
+            },
+            "required": ["thought", "nextThoughtNeeded", "thoughtNumber", "totalThoughts"]
+        }
+    }
+}
+
+# Sequential thinking tool 호출에 대한 고정 응답
+_THOUGHT_RECORDED = orjson.dumps({"status": "thought_recorded"}).decode()
+
+# (enable_sequential_thinking, use_context7) -> bind_tools 결과 캐시
+_tool_bound_clients: dict[tuple[bool, bool], Any] = {}
+
+# CP949로 항상 인코딩 가능한 문자 범위 밖의 문자 탐지용 (ASCII, 한글 음절/자모, 전각 ASCII, 자주 쓰는 문장부호)
+# 여기에 걸리지 않으면 인코딩 검사 없이 그대로 통과
+_NON_CP949_RE = re.compile(r'[^\x00-\x7F\uAC00-\uD7A3\u3131-\u318E\u3000-\u3003\uFF01-\uFF5E\u2018\u2019\u201C\u201D\u2025\u2026]')
+
+
+# BMP 밖의 문자 (CP949에 없음, 공백 문자도 없으므로 항상 ? 로 대체)
+_ASTRAL_RE = re.compile(r'[\U00010000-\U0010FFFF]')
+
+
+@functools.lru_cache(maxsize=1)
+def _cp949_translate_table() -> str:
+    """BMP 코드포인트별 치환 문자열 (CP949 불가 문자는 공백/?, 최초 사용 시 1회 생성)
+
+    str.translate에 길이 0x10000 문자열을 넘기면 dict 조회 없이 인덱스로 바로 치환된다.
+    """
+    chars = []
+    for cp in range(0x10000):
+        char = chr(cp)
+        try:
+            char.encode('cp949')
+            chars.append(char)
+        except UnicodeEncodeError:
+            chars.append(' ' if char.isspace() else '?')
+    return ''.join(chars)
+
+
+# 프롬프트-응답 캐시 (동일 프롬프트 재호출 시 LLM 왕복 생략, 프로세스 내 LRU + TTL)
+LLM_CACHE_ENABLED = os.getenv("LLM_CACHE_ENABLED", "true").lower() == "true"
+LLM_CACHE_TTL = int(os.getenv("LLM_CACHE_TTL", "3600"))
+LLM_CACHE_MAXSIZE = int(os.getenv("LLM_CACHE_MAXSIZE", "4096"))
+# 재시작 후에도 유지되는 2차 캐시 (database.db의 llm_cache 테이블)
+LLM_CACHE_PERSIST = os.getenv("LLM_CACHE_PERSIST", "false").lower() == "true"
+_response_cache: OrderedDict[str, tuple[float, str]] = OrderedDict()
+_response_cache_lock = threading.Lock()
+# 캐시 적중/미스 횟수 (헬스체크 노출용, _response_cache_lock으로 보호)
+# inflight_shared: 미스였지만 진행 중인 동일 요청의 결과를 공유받은 횟수
+_cache_stats = {"hits": 0, "persistent_hits": 0, "misses": 0, "inflight_shared": 0}
+_WHITESPACE_RE = re.compile(r"\s+")
+
+# 다중 프롬프트 동시 호출 시 최대 동시 요청 수
+LLM_BATCH_CONCURRENCY = int(os.getenv("LLM_BATCH_CONCURRENCY", "32"))
+
+# 클라이언트 측 요청 속도 제한 (초당 요청 수, 0이면 제한 없음)
+LLM_RPS = float(os.getenv("LLM_RPS", "0"))
+LLM_BURST = int(os.getenv("LLM_BURST", "1"))
+
+# 동시에 진행 중인 LLM 요청 수 상한 (초과 요청은 대기)
+# 미설정 시 Ollama 서버의 병렬 처리 수(OLLAMA_NUM_PARALLEL)에 맞춤
+LLM_MAX_CONCURRENCY = int(os.getenv("LLM_MAX_CONCURRENCY") or os.getenv("OLLAMA_NUM_PARALLEL") or "16")
+_llm_thread_semaphore = threading.BoundedSemaphore(LLM_MAX_CONCURRENCY)
+# asyncio.Semaphore는 이벤트 루프에 묶이므로 루프별로 생성
+_llm_async_semaphores: weakref.WeakKeyDictionary = weakref.WeakKeyDictionary()
+
+# 기본 모델 이름 (호출마다 환경 변수를 조회하지 않도록 import 시 1회 로드)
+OLLAMA_MODEL = os.getenv("OLLAMA_MODEL", "gemma2:2b")
+INTERNAL_MODEL = os.getenv("INTERNAL_MODEL")
+
+# 분류/채점처럼 짧은 판단 작업은 경량 모델로 라우팅 (미설정 시 기본 모델 사용)
+LIGHT_TASKS = frozenset({"classify", "score"})
+OLLAMA_LIGHT_MODEL = os.getenv("OLLAMA_LIGHT_MODEL", "")
+INTERNAL_LIGHT_MODEL = os.getenv("INTERNAL_LIGHT_MODEL", "")
+
+# 시스템 프롬프트에 cache_control(ephemeral) 표시 (지원하는 Internal 엔드포인트에서만 사용)
+LLM_PROMPT_CACHE_CONTROL = os.getenv("LLM_PROMPT_CACHE_CONTROL", "false").lower() == "true"
+
+# 서버 시작 시 Ollama 모델을 미리 로드 (첫 요청이 모델 로딩 시간을 기다리지 않도록)
+LLM_WARMUP = os.getenv("LLM_WARMUP", "true").lower() == "true"
+
+# 연결 타임아웃 (응답 생성은 오래 걸릴 수 있으므로 읽기 타임아웃은 길게 유지)
+LLM_CONNECT_TIMEOUT = 3.05
+_LLM_HTTP_TIMEOUT = httpx.Timeout(600.0, connect=LLM_CONNECT_TIMEOUT)
+
+
+class _TokenBucket:
+    """동기/비동기 호출이 공유하는 토큰 버킷 (provider 429 전에 미리 속도 조절)
+
+    reserve()는 토큰을 선점하고 기다려야 할 시간(초)을 반환한다.
+    대기는 호출자가 time.sleep / asyncio.sleep으로 직접 수행한다.
+    """
+
+    def __init__(self, rate: float, burst: int):
+        self.rate = rate
+        self.burst = max(burst, 1)
+        self._tokens = float(self.burst)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def reserve(self) -> float:
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            self._tokens -= 1
+            return 0.0 if self._tokens >= 0 else -self._tokens / self.rate
+
+
+_rate_limiter = _TokenBucket(LLM_RPS, LLM_BURST) if LLM_RPS > 0 else None
+
+
+def _wait_for_rate_limit():
+    """동기 호출 전 속도 제한 대기"""
+    if _rate_limiter is not None:
+        delay = _rate_limiter.reserve()
+        if delay:
+            time.sleep(delay)
+
+
+def _get_async_semaphore() -> asyncio.Semaphore:
+    """현재 이벤트 루프의 동시 요청 제한 세마포어"""
+    loop = asyncio.get_running_loop()
+    semaphore = _llm_async_semaphores.get(loop)
+    if semaphore is None:
+        semaphore = asyncio.Semaphore(LLM_MAX_CONCURRENCY)
+        _llm_async_semaphores[loop] = semaphore
+    return semaphore
+
+
+class _LLMLoad:
+    """슬롯 대기 중/진행 중인 LLM 요청 수 (헬스체크 노출용)"""
+
+    def __init__(self):
+        self.waiting = 0
+        self.in_flight = 0
+        self._lock = threading.Lock()
+
+    def add(self, waiting: int = 0, in_flight: int = 0):
+        with self._lock:
+            self.waiting += waiting
+            self.in_flight += in_flight
+
+
+_llm_load = _LLMLoad()
+
+
+@contextlib.contextmanager
+def _llm_slot():
+    """동기 호출용 동시 요청 슬롯 (대기/진행 수 집계 포함)"""
+    _llm_load.add(waiting=1)
+    try:
+        _llm_thread_semaphore.acquire()
+    finally:
+        _llm_load.add(waiting=-1)
+    _llm_load.add(in_flight=1)
+    try:
+        yield
+    finally:
+        _llm_load.add(in_flight=-1)
+        _llm_thread_semaphore.release()
+
+
+@contextlib.asynccontextmanager
+async def _allm_slot():
+    """비동기 호출용 동시 요청 슬롯 (대기/진행 수 집계 포함)"""
+    semaphore = _get_async_semaphore()
+    _llm_load.add(waiting=1)
+    try:
+        await semaphore.acquire()
+    finally:
+        _llm_load.add(waiting=-1)
+    _llm_load.add(in_flight=1)
+    try:
+        yield
+    finally:
+        _llm_load.add(in_flight=-1)
+        semaphore.release()
+
+
+async def run_llm_in_thread(func, *args, **kwargs):
+    """LLM을 호출하는 동기 함수를 워커 스레드에서 실행
+
+    스레드로 보내기 전에 이벤트 루프의 동시 요청 세마포어(_allm_slot과 공유)를 먼저 얻어,
+    슬롯을 기다리는 호출이 기본 스레드 풀 워커를 점유하지 않도록 한다.
+    """
+    semaphore = _get_async_semaphore()
+    _llm_load.add(waiting=1)
+    try:
+        await semaphore.acquire()
+    finally:
+        _llm_load.add(waiting=-1)
+    try:
+        return await asyncio.to_thread(func, *args, **kwargs)
+    finally:
+        semaphore.release()
+
+
+def get_llm_load() -> dict:
+    """LLM 요청 부하 현황 (동시 요청 상한, 진행 중, 슬롯 대기 중)"""
+    return {
+        "max_concurrency": LLM_MAX_CONCURRENCY,
+        "in_flight": _llm_load.in_flight,
+        "waiting": _llm_load.waiting,
+    }
+
+
+async def _await_rate_limit():
+    """비동기 호출 전 속도 제한 대기 (이벤트 루프 블로킹 없음)"""
+    if _rate_limiter is not None:
+        delay = _rate_limiter.reserve()
+        if delay:
+            await asyncio.sleep(delay)
+
+
+# Ollama 서버 주소 (ollama 라이브러리 기본값인 OLLAMA_HOST 우선, 없으면 .env의 OLLAMA_BASE_URL)
+OLLAMA_HOST = os.getenv("OLLAMA_HOST") or os.getenv("OLLAMA_BASE_URL") or None
+
+# 동기 호출용 공유 ollama.Client (keep-alive 커넥션 풀 재사용, 최초 호출 시 생성)
+_ollama_client: ollama.Client | None = None
+_ollama_client_lock = threading.Lock()
+
+# 이벤트 루프별 ollama.AsyncClient (httpx 연결은 생성된 루프에 묶임)
+_async_ollama_clients: weakref.WeakKeyDictionary = weakref.WeakKeyDictionary()
+
+# Internal LLM 일반 호출(tool 없음)용 직접 HTTP 경로 (LangChain 메시지 변환/pydantic 검증 생략)
+_internal_chat_url: str | None = None
+_internal_headers: dict = {}
+_internal_http: httpx.Client | None = None
+_internal_async_http: weakref.WeakKeyDictionary = weakref.WeakKeyDictionary()
+
 
 def init_llm():
     """환경 변수에 따라 LLM 클라이언트 초기화"""
-    global llm_client
+    global llm_client, _internal_chat_url, _internal_headers, _internal_http
+
+    # 클라이언트가 바뀌면 기존 tool 바인딩은 무효
+    _tool_bound_clients.clear()
 
     if LLM_PROVIDER == "internal":
         # Internal LLM 설정 (lazy import to avoid pydantic version issues)
         from langchain_openai import ChatOpenAI
 
         base_url = os.getenv("INTERNAL_BASE_URL")
-        model = os.getenv("INTERNAL_MODEL")
+        model = INTERNAL_MODEL
         credential_key = os.getenv("INTERNAL_CREDENTIAL_KEY")
         system_name = os.getenv("INTERNAL_SYSTEM_NAME")
         user_id = os.getenv("INTERNAL_USER_ID")
@@ -31,182 +331,678 @@ def init_llm():
                 "Send-System-Name": system_name,
                 "User-ID": user_id,
                 "User-Type": "AD",
-                "Prompt-Msg-Id": str(uuid.uuid4()),
-                "Completion-Msg-Id": str(uuid.uuid4()),
             },
         )
+
+        # Tool 없는 일반 호출은 LangChain을 거치지 않고 같은 엔드포인트로 직접 전송
+        _internal_chat_url = f"{(base_url or '').rstrip('/')}/chat/completions"
+        _internal_headers = {
+            "Content-Type": "application/json",
+            "x-dep-ticket": credential_key or "",
+            "Send-System-Name": system_name or "",
+            "User-ID": user_id or "",
+            "User-Type": "AD",
+        }
+        api_key = os.getenv("OPENAI_API_KEY")
+        if api_key:
+            _internal_headers["Authorization"] = f"Bearer {api_key}"
+        if _internal_http is not None:
+            _internal_http.close()
+        _internal_http = httpx.Client(timeout=_LLM_HTTP_TIMEOUT)
+        _internal_async_http.clear()
         print(f"Internal LLM initialized: {model}")
     else:
         # Ollama 설정
         llm_client = "ollama"  # Ollama는 직접 함수로 호출
-        print(f"Ollama LLM initialized: {os.getenv('OLLAMA_MODEL', 'gemma2:2b')}")
+        print(f"Ollama LLM initialized: {OLLAMA_MODEL}")
+
+
+def _request_headers() -> dict:
+    """요청마다 새로운 메시지 ID 헤더 생성 (클라이언트 생성 시점에 고정하지 않음)"""
+    return {
+        "Prompt-Msg-Id": str(uuid.uuid4()),
+        "Completion-Msg-Id": str(uuid.uuid4()),
+    }
+
+
+def _chat_messages(prompt: str, system_prompt: str | None = None) -> list[dict]:
+    """chat 메시지 목록 구성
+
+    system_prompt는 호출마다 바이트 단위로 동일하게 앞에 두어
+    서버의 prefix 캐시(KV 캐시 재사용)가 적용되도록 한다.
+    """
+    if not system_prompt:
+        return [{"role": "user", "content": prompt}]
+    return [{"role": "system", "content": system_prompt}, {"role": "user", "content": prompt}]
+
+
+def _internal_chat_payload(prompt: str, system_prompt: str | None = None, model: str | None = None) -> dict:
+    """OpenAI 호환 /chat/completions 요청 본문"""
+    messages = _chat_messages(prompt, system_prompt)
+    if system_prompt and LLM_PROMPT_CACHE_CONTROL:
+        messages[0] = {
+            "role": "system",
+            "content": [{"type": "text", "text": system_prompt, "cache_control": {"type": "ephemeral"}}],
+        }
+    return {
+        "model": model or INTERNAL_MODEL,
+        "messages": messages,
+    }
+
+
+def _internal_chat_content(data: dict) -> str:
+    """/chat/completions 응답에서 본문 추출 (CP949 정리 포함)"""
+    content = data["choices"][0]["message"].get("content")
+    return clean_unicode_for_cp949(content) if content else content
+
+
+def _internal_raw_chat(prompt: str, system_prompt: str | None = None, model: str | None = None) -> str:
+    """Internal LLM 일반 호출 (tool 없음, httpx 직접 호출)"""
+    response = _internal_http.post(
+        _internal_chat_url,
+        json=_internal_chat_payload(prompt, system_prompt, model),
+        headers={**_internal_headers, **_request_headers()},
+    )
+    response.raise_for_status()
+    return _internal_chat_content(orjson.loads(response.content))
+
+
+async def _ainternal_raw_chat(prompt: str, system_prompt: str | None = None, model: str | None = None) -> str:
+    """_internal_raw_chat의 비동기 버전 (이벤트 루프별 httpx.AsyncClient 사용)"""
+    loop = asyncio.get_running_loop()
+    client = _internal_async_http.get(loop)
+    if client is None:
+        client = httpx.AsyncClient(timeout=_LLM_HTTP_TIMEOUT)
+        _internal_async_http[loop] = client
+    response = await client.post(
+        _internal_chat_url,
+        json=_internal_chat_payload(prompt, system_prompt, model),
+        headers={**_internal_headers, **_request_headers()},
+    )
+    response.raise_for_status()
+    return _internal_chat_content(orjson.loads(response.content))
+
+
+def _get_tool_bound_client(enable_sequential_thinking: bool, use_context7: bool):
+    """플래그 조합에 맞는 tool 바인딩 클라이언트 반환 (캐시 재사용)"""
+    key = (enable_sequential_thinking, use_context7)
+    bound = _tool_bound_clients.get(key)
+    if bound is None:
+        tools = []
+        if enable_sequential_thinking:
+            tools.append(SEQUENTIAL_THINKING_TOOL)
+        bound = llm_client.bind_tools(tools)
+        _tool_bound_clients[key] = bound
+    return bound
+
+
+def _resolve_model(task: str = "generate") -> str:
+    """작업 종류에 맞는 모델 이름 (classify/score는 경량 모델이 설정된 경우 경량 모델)"""
+    if LLM_PROVIDER == "internal":
+        default, light = INTERNAL_MODEL or "", INTERNAL_LIGHT_MODEL
+    else:
+        default, light = OLLAMA_MODEL, OLLAMA_LIGHT_MODEL
+    if task in LIGHT_TASKS and light:
+        return light
+    return default
+
+
+def _cache_key(prompt: str, enable_sequential_thinking: bool, use_context7: bool,
+               system_prompt: str | None = None, task: str = "generate") -> str:
+    """프로바이더/모델/옵션/프롬프트 기반 캐시 키 (공백 차이는 무시)"""
+    model = _resolve_model(task)
+    prompt = _WHITESPACE_RE.sub(" ", prompt).strip()
+    system_prompt = _WHITESPACE_RE.sub(" ", system_prompt).strip() if system_prompt else ""
+    raw = f"{LLM_PROVIDER}\0{model}\0{int(enable_sequential_thinking)}{int(use_context7)}\0{system_prompt}\0{prompt}"
+    return hashlib.blake2b(raw.encode("utf-8"), digest_size=16).hexdigest()
+
+
+def _cache_get(key: str) -> str | None:
+    """캐시된 응답 반환 (없거나 만료 시 None)"""
+    if not LLM_CACHE_ENABLED:
+        return None
+    content = _cache_get_memory(key)
+    if content is None:
+        content = _cache_get_persistent(key)
+    return content
+
+
+async def _acache_get(key: str) -> str | None:
+    """_cache_get의 비동기 버전 (메모리 캐시만 루프에서 조회하고 SQLite 조회는 스레드에서 실행)"""
+    if not LLM_CACHE_ENABLED:
+        return None
+    content = _cache_get_memory(key)
+    if content is None:
+        if LLM_CACHE_PERSIST:
+            content = await asyncio.to_thread(_cache_get_persistent, key)
+        else:
+            content = _cache_get_persistent(key)
+    return content
+
+
+def _cache_get_memory(key: str) -> str | None:
+    with _response_cache_lock:
+        entry = _response_cache.get(key)
+        if entry is not None:
+            expires_at, content = entry
+            if expires_at >= time.monotonic():
+                _response_cache.move_to_end(key)
+                _cache_stats["hits"] += 1
+                return content
+            del _response_cache[key]
+    return None
+
+
+def _cache_get_persistent(key: str) -> str | None:
+    """메모리 캐시 미스 시 영속 캐시 조회 (적중하면 메모리 캐시에도 저장)"""
+    content = None
+    if LLM_CACHE_PERSIST:
+        try:
+            content = get_cached_llm_response(key, LLM_CACHE_TTL)
+        except sqlite3.Error as e:
+            print(f"LLM 영속 캐시 조회 실패: {e}")
+
+    with _response_cache_lock:
+        _cache_stats["persistent_hits" if content is not None else "misses"] += 1
+    if content is not None:
+        _cache_store_memory(key, content)
+    return content
+
+
+def get_llm_cache_stats() -> dict:
+    """LLM 응답 캐시 현황 (적중/미스 횟수, 메모리 캐시 항목 수)"""
+    with _response_cache_lock:
+        return {
+            "enabled": LLM_CACHE_ENABLED,
+            "persist": LLM_CACHE_PERSIST,
+            "size": len(_response_cache),
+            **_cache_stats,
+        }
+
+
+def _cache_put(key: str, content: str) -> None:
+    """응답 저장 (빈 응답은 저장하지 않음)"""
+    if not LLM_CACHE_ENABLED or not content:
+        return
+    _cache_store_memory(key, content)
+    if LLM_CACHE_PERSIST:
+        _cache_put_persistent(key, content)
+
+
+async def _acache_put(key: str, content: str) -> None:
+    """_cache_put의 비동기 버전 (SQLite 쓰기는 공유 쓰기 락을 잡으므로 스레드에서 실행)"""
+    if not LLM_CACHE_ENABLED or not content:
+        return
+    _cache_store_memory(key, content)
+    if LLM_CACHE_PERSIST:
+        await asyncio.to_thread(_cache_put_persistent, key, content)
+
+
+def _cache_put_persistent(key: str, content: str) -> None:
+    try:
+        put_cached_llm_response(key, content, LLM_CACHE_TTL)
+    except sqlite3.Error as e:
+        print(f"LLM 영속 캐시 저장 실패: {e}")
+
+
+def _cache_store_memory(key: str, content: str) -> None:
+    with _response_cache_lock:
+        _response_cache[key] = (time.monotonic() + LLM_CACHE_TTL, content)
+        _response_cache.move_to_end(key)
+        while len(_response_cache) > LLM_CACHE_MAXSIZE:
+            _response_cache.popitem(last=False)
 
 
 def clean_unicode_for_cp949(text: str) -> str:
     """CP949 인코딩에서 문제가 되는 유니코드 문자를 안전하게 제거"""
-    if not text:
+    if not text or text.isascii() or not _NON_CP949_RE.search(text):
         return text
 
-    # CP949로 인코딩 가능한 문자만 유지
     try:
-        # 먼저 CP949로 인코딩 시도
         text.encode('cp949')
         return text
     except UnicodeEncodeError:
-        # 인코딩 실패 시 문자별로 처리
-        cleaned = []
-        for char in text:
-            try:
-                char.encode('cp949')
-                cleaned.append(char)
-            except UnicodeEncodeError:
-                # CP949로 인코딩할 수 없는 문자는 공백 또는 ? 로 대체
-                if char.isspace():
-                    cleaned.append(' ')
-                else:
-                    cleaned.append('?')
-        return ''.join(cleaned)
+        # CP949로 인코딩할 수 없는 문자는 공백 또는 ? 로 대체
+        cleaned = text.translate(_cp949_translate_table())
+        return _ASTRAL_RE.sub('?', cleaned)
+
+
+# 진행 중인 LLM 호출 (동시에 들어온 동일 요청은 job이 달라도 한 번만 호출하고 결과 공유)
+_inflight_calls: dict[str, concurrent.futures.Future] = {}
+_inflight_lock = threading.Lock()
+
+# 이벤트 루프별 진행 중인 비동기 호출 (acall_llm/astream_llm이 같은 키 공간을 공유)
+_async_inflight_calls: weakref.WeakKeyDictionary = weakref.WeakKeyDictionary()
+
+
+def _get_async_inflight() -> dict[str, asyncio.Future]:
+    """현재 이벤트 루프의 진행 중인 비동기 호출 (cache_key -> Future)"""
+    loop = asyncio.get_running_loop()
+    inflight = _async_inflight_calls.get(loop)
+    if inflight is None:
+        inflight = _async_inflight_calls[loop] = {}
+    return inflight
+
+
+async def _join_async_inflight(cache_key: str) -> tuple[str | None, asyncio.Future | None]:
+    """진행 중인 같은 요청의 결과를 기다리거나, 없으면 이 호출을 진행 중으로 등록
+
+    Returns:
+        (공유받은 결과, None) 또는 직접 호출해야 하면 (None, 등록한 Future)
+    """
+    inflight = _get_async_inflight()
+    while True:
+        pending = inflight.get(cache_key)
+        if pending is None:
+            owner = asyncio.get_running_loop().create_future()
+            inflight[cache_key] = owner
+            return None, owner
+        try:
+            # 대기자가 취소돼도 진행 중인 호출(Future)은 취소하지 않음
+            content = await asyncio.shield(pending)
+        except asyncio.CancelledError:
+            if pending.cancelled():
+                # 진행 중이던 호출이 중단됨 - 먼저 깨어난 대기자가 이어받았을 수 있으므로 다시 조회
+                continue
+            raise
+        with _response_cache_lock:
+            _cache_stats["inflight_shared"] += 1
+        return content, None
+
+
+def _finish_async_inflight(cache_key: str, owner: asyncio.Future, content: str | None) -> None:
+    """진행 중인 호출 등록 해제 (content가 None이면 중단된 것으로 보고 대기자 중 하나가 이어받아 호출)"""
+    inflight = _get_async_inflight()
+    if inflight.get(cache_key) is owner:
+        del inflight[cache_key]
+    if content is None:
+        owner.cancel()
+    else:
+        owner.set_result(content)
 
 
-def call_llm(prompt: str, enable_sequential_thinking: bool = False, use_context7: bool = False) -> str:
+def call_llm(prompt: str, enable_sequential_thinking: bool = False, use_context7: bool = False,
+             system_prompt: str | None = None, task: str = "generate") -> str:
     """통합 LLM 호출 함수
 
     Args:
         prompt: LLM에 전달할 프롬프트
         enable_sequential_thinking: Sequential Thinking MCP 활성화 여부
         use_context7: Context7 tool 활성화 여부
+        system_prompt: 호출 간 공유되는 고정 앞부분 (system 메시지로 전송, prefix 캐시 대상)
+        task: 작업 종류 ("generate", "classify", "score") - classify/score는 경량 모델 사용
 
     Returns:
         LLM 응답 문자열
     """
+    cache_key = _cache_key(prompt, enable_sequential_thinking, use_context7, system_prompt, task)
+    cached = _cache_get(cache_key)
+    if cached is not None:
+        return cached
+
+    if not LLM_CACHE_ENABLED:
+        return _call_llm_uncached(cache_key, prompt, enable_sequential_thinking, use_context7, system_prompt, task)
+
+    # 다른 job이 같은 요청을 이미 처리 중이면 그 결과를 기다려 공유
+    with _inflight_lock:
+        pending = _inflight_calls.get(cache_key)
+        if pending is None:
+            owner = _inflight_calls[cache_key] = concurrent.futures.Future()
+    if pending is not None:
+        with _response_cache_lock:
+            _cache_stats["inflight_shared"] += 1
+        return pending.result()
+
     try:
-        if LLM_PROVIDER == "internal":
-            # Internal LLM 사용 (tool calling 지원)
-            if enable_sequential_thinking or use_context7:
-                # Tool calling 활성화
-                import json
-                from langchain_core.messages import HumanMessage, AIMessage, ToolMessage
-
-                # Sequential thinking tool definition
-                sequential_thinking_tool = {
-                    "type": "function",
-                    "function": {
-                        "name": "sequentialthinking",
-                        "description": """A detailed tool for dynamic and reflective problem-solving through thoughts.
-This tool helps analyze problems through a flexible thinking process that can adapt and evolve.
-Each thought can build on, question, or revise previous insights as understanding deepens.""",
-                        "parameters": {
-                            "type": "object",
-                            "properties": {
-                                "thought": {
-                                    "type": "string",
-                                    "description": "Your current thinking step"
-                                },
-                                "nextThoughtNeeded": {
-                                    "type": "boolean",
-                                    "description": "Whether another thought step is needed"
-                                },
-                                "thoughtNumber": {
-                                    "type": "integer",
-                                    "description": "Current thought number",
-                                    "minimum": 1
-                                },
-                                "totalThoughts": {
-                                    "type": "integer",
-                                    "description": "Estimated total thoughts needed",
-                                    "minimum": 1
-                                },
-                                "isRevision": {
-                                    "type": "boolean",
-                                    "description": "Whether this revises previous thinking"
-                                },
-                                "revisesThought": {
-                                    "type": "integer",
-                                    "description": "Which thought is being reconsidered"
-                                },
-                                "branchFromThought": {
-                                    "type": "integer",
-                                    "description": "Branching point thought number"
-                                },
-                                "branchId": {
-                                    "type": "string",
-                                    "description": "Branch identifier"
-                                },
-                                "needsMoreThoughts": {
-                                    "type": "boolean",
-                                    "description": "If more thoughts are needed"
-                                }
-                            },
-                            "required": ["thought", "nextThoughtNeeded", "thoughtNumber", "totalThoughts"]
-                        }
-                    }
-                }
+        content = _call_llm_uncached(cache_key, prompt, enable_sequential_thinking, use_context7, system_prompt, task)
+        owner.set_result(content)
+        return content
+    except BaseException as e:
+        owner.set_exception(e)
+        raise
+    finally:
+        with _inflight_lock:
+            _inflight_calls.pop(cache_key, None)
 
-                tools = []
-                if enable_sequential_thinking:
-                    tools.append(sequential_thinking_tool)
-
-                # Tool binding
-                llm_with_tools = llm_client.bind_tools(tools)
-                print(f"[LLM] Tool calling enabled: sequential_thinking={enable_sequential_thinking}, context7={use_context7}")
-
-                # Handle sequential thinking loop
-                messages = [HumanMessage(content=prompt)]
-                thoughts = []
-
-                while True:
-                    response = llm_with_tools.invoke(messages)
-
-                    # Tool calls 처리
-                    if hasattr(response, 'tool_calls') and response.tool_calls:
-                        print(f"[LLM] Tool calls detected: {len(response.tool_calls)}")
-
-                        for tool_call in response.tool_calls:
-                            if tool_call['name'] == 'sequentialthinking':
-                                args = tool_call['args']
-                                thoughts.append(args)
-
-                                print(f"💭 Thought {args['thoughtNumber']}/{args['totalThoughts']}: {args['thought'][:100]}...")
-
-                                # Add tool response to messages
-                                messages.append(AIMessage(content="", tool_calls=[tool_call]))
-                                messages.append(ToolMessage(
-                                    tool_call_id=tool_call['id'],
-                                    content=json.dumps({"status": "thought_recorded"})
-                                ))
-
-                                # Check if more thoughts are needed
-                                if not args.get('nextThoughtNeeded', False):
-                                    print(f"✅ Thinking complete! Total thoughts: {len(thoughts)}")
-                                    # Get final answer
-                                    final_response = llm_client.invoke(messages + [HumanMessage(content="Please provide your final answer based on the thoughts above.")])
-                                    return clean_unicode_for_cp949(final_response.content) if final_response.content else ""
-                    else:
-                        # No tool call, return response
-                        content = response.content
-                        return clean_unicode_for_cp949(content) if content else content
-            else:
-                # Tool 없이 일반 호출
-                response = llm_client.invoke(prompt)
-                # Clean response content to avoid encoding issues
-                content = response.content
-                return clean_unicode_for_cp949(content) if content else content
+
+def _call_llm_uncached(cache_key: str, prompt: str, enable_sequential_thinking: bool, use_context7: bool,
+                       system_prompt: str | None, task: str) -> str:
+    """캐시 미스 시 실제 호출 후 캐시에 저장 (실패 시 실패 메시지 반환)"""
+    try:
+        with _llm_slot():
+            _wait_for_rate_limit()
+            content = _invoke_llm(prompt, enable_sequential_thinking, use_context7, system_prompt, task)
+    except Exception as e:
+        print(f"LLM API 호출 실패: {e}")
+        traceback.print_exc()
+        return f"AI 응답 생성 실패: {e}"
+
+    _cache_put(cache_key, content)
+    return content
+
+
+def _invoke_llm(prompt: str, enable_sequential_thinking: bool, use_context7: bool,
+                system_prompt: str | None = None, task: str = "generate") -> str:
+    """LLM 실제 호출 (캐시/예외 처리는 call_llm에서 담당)"""
+    if LLM_PROVIDER == "internal":
+        # Internal LLM 사용 (tool calling 지원)
+        if enable_sequential_thinking or use_context7:
+            # Tool calling 활성화
+            from langchain_core.messages import HumanMessage, AIMessage, SystemMessage, ToolMessage
+
+            # Tool binding (플래그 조합별로 한 번만 바인딩)
+            llm_with_tools = _get_tool_bound_client(enable_sequential_thinking, use_context7)
+            print(f"[LLM] Tool calling enabled: sequential_thinking={enable_sequential_thinking}, context7={use_context7}")
+
+            # Handle sequential thinking loop
+            messages = [HumanMessage(content=prompt)]
+            if system_prompt:
+                messages.insert(0, SystemMessage(content=system_prompt))
+            thoughts = []
+
+            while True:
+                response = llm_with_tools.invoke(messages, extra_headers=_request_headers())
+
+                # Tool calls 처리
+                if hasattr(response, 'tool_calls') and response.tool_calls:
+                    print(f"[LLM] Tool calls detected: {len(response.tool_calls)}")
+
+                    for tool_call in response.tool_calls:
+                        if tool_call['name'] == 'sequentialthinking':
+                            args = tool_call['args']
+                            thoughts.append(args)
+
+                            print(f"💭 Thought {args['thoughtNumber']}/{args['totalThoughts']}: {args['thought'][:100]}...")
+
+                            # Add tool response to messages
+                            messages.append(AIMessage(content="", tool_calls=[tool_call]))
+                            messages.append(ToolMessage(
+                                tool_call_id=tool_call['id'],
+                                content=_THOUGHT_RECORDED
+                            ))
+
+                            # Check if more thoughts are needed
+                            if not args.get('nextThoughtNeeded', False):
+                                print(f"✅ Thinking complete! Total thoughts: {len(thoughts)}")
+                                # Get final answer
+                                final_response = llm_client.invoke(
+                                    messages + [HumanMessage(content="Please provide your final answer based on the thoughts above.")],
+                                    extra_headers=_request_headers(),
+                                )
+                                return clean_unicode_for_cp949(final_response.content) if final_response.content else ""
+                else:
+                    # No tool call, return response
+                    content = response.content
+                    return clean_unicode_for_cp949(content) if content else content
         else:
-            # Ollama 사용 (tool calling 미지원, 일반 호출)
-            model = os.getenv("OLLAMA_MODEL", "gemma2:2b")
-            response = ollama.chat(
-                model=model,
-                messages=[{"role": "user", "content": prompt}]
-            )
-            print(f"LLM response: {response['message']['content']}")
-            return response['message']['content']
+            # Tool 없이 일반 호출
+            return _internal_raw_chat(prompt, system_prompt, _resolve_model(task))
+    else:
+        # Ollama 사용 (tool calling 미지원, 일반 호출)
+        model = _resolve_model(task)
+        response = _get_ollama_client().chat(
+            model=model,
+            messages=_chat_messages(prompt, system_prompt)
+        )
+        print(f"LLM response: {response['message']['content']}")
+        return response['message']['content']
+
+
+class LLMStreamFailure(str):
+    """스트리밍 도중 실패했음을 나타내는 마지막 청크 (일반 문자열처럼 표시/전송 가능)
+
+    앞서 받은 부분 응답 뒤에 붙어 오므로, 이어 붙인 전체 응답의 접두어로는 실패를 알 수 없다.
+    """
+
+
+def stream_llm(prompt: str, system_prompt: str | None = None) -> Iterator[str]:
+    """LLM 응답을 토큰(청크) 단위로 스트리밍
+
+    전체 응답을 기다리지 않고 도착하는 청크를 바로 넘겨주므로,
+    소비자(WebSocket 전송 등)가 첫 토큰부터 처리를 시작할 수 있다.
+    Tool calling(Sequential Thinking)은 지원하지 않는다.
+
+    Args:
+        prompt: LLM에 전달할 프롬프트
+        system_prompt: 호출 간 공유되는 고정 앞부분 (system 메시지로 전송)
+
+    Yields:
+        응답 텍스트 청크 (같은 입력의 응답이 캐시에 있으면 전체 응답 한 번,
+        도중에 실패하면 마지막 청크로 LLMStreamFailure)
+    """
+    # call_llm과 같은 캐시 키를 사용하므로 스트리밍/일반 호출이 결과를 공유
+    cache_key = _cache_key(prompt, False, False, system_prompt)
+    cached = _cache_get(cache_key)
+    if cached is not None:
+        yield cached
+        return
+
+    chunks = []
+    try:
+        with _llm_slot():
+            _wait_for_rate_limit()
+            if LLM_PROVIDER == "internal":
+                for chunk in llm_client.stream(_chat_messages(prompt, system_prompt), extra_headers=_request_headers()):
+                    if chunk.content:
+                        content = clean_unicode_for_cp949(chunk.content)
+                        chunks.append(content)
+                        yield content
+            else:
+                for chunk in _get_ollama_client().chat(
+                    model=OLLAMA_MODEL,
+                    messages=_chat_messages(prompt, system_prompt),
+                    stream=True,
+                ):
+                    content = chunk['message']['content']
+                    if content:
+                        chunks.append(content)
+                        yield content
+    except Exception as e:
+        print(f"LLM 스트리밍 호출 실패: {e}")
+        yield LLMStreamFailure(f"AI 응답 생성 실패: {e}")
+        return
+
+    if chunks:
+        _cache_put(cache_key, "".join(chunks))
+
+
+async def astream_llm(prompt: str, system_prompt: str | None = None) -> AsyncIterator[str]:
+    """stream_llm의 비동기 버전 (이벤트 루프를 블로킹하지 않고 청크 단위로 전달)
+
+    Tool calling(Sequential Thinking)은 지원하지 않는다.
+
+    Args:
+        prompt: LLM에 전달할 프롬프트
+        system_prompt: 호출 간 공유되는 고정 앞부분 (system 메시지로 전송)
+
+    Yields:
+        응답 텍스트 청크 (CP949 정리 적용, 캐시 적중 시 전체 응답 한 번)
+    """
+    cache_key = _cache_key(prompt, False, False, system_prompt)
+    cached = await _acache_get(cache_key)
+    if cached is not None:
+        yield cached
+        return
+
+    owner = None
+    if LLM_CACHE_ENABLED:
+        # 다른 job이 같은 요청을 이미 처리 중이면 완료된 전체 응답을 한 번에 전달
+        shared, owner = await _join_async_inflight(cache_key)
+        if owner is None:
+            yield shared
+            return
+
+    chunks = []
+    completed = False
+    try:
+        try:
+            async with _allm_slot():
+                await _await_rate_limit()
+                if LLM_PROVIDER == "internal":
+                    async for chunk in llm_client.astream(_chat_messages(prompt, system_prompt), extra_headers=_request_headers()):
+                        if chunk.content:
+                            content = clean_unicode_for_cp949(chunk.content)
+                            chunks.append(content)
+                            yield content
+                else:
+                    async for chunk in await _get_async_ollama_client().chat(
+                        model=OLLAMA_MODEL,
+                        messages=_chat_messages(prompt, system_prompt),
+                        stream=True,
+                    ):
+                        content = chunk['message']['content']
+                        if content:
+                            content = clean_unicode_for_cp949(content)
+                            chunks.append(content)
+                            yield content
+        except Exception as e:
+            print(f"LLM 스트리밍 호출 실패: {e}")
+            yield LLMStreamFailure(f"AI 응답 생성 실패: {e}")
+            return
+
+        completed = True
+        if chunks:
+            await _acache_put(cache_key, "".join(chunks))
+    finally:
+        # 실패하거나 소비자가 중간에 그만두면 대기자 중 하나가 이어받아 호출
+        if owner is not None:
+            _finish_async_inflight(cache_key, owner, "".join(chunks) if completed else None)
+
+
+def _get_ollama_client() -> ollama.Client:
+    """동기 호출용 공유 ollama.Client 반환"""
+    global _ollama_client
+    if _ollama_client is None:
+        with _ollama_client_lock:
+            if _ollama_client is None:
+                _ollama_client = ollama.Client(host=OLLAMA_HOST, timeout=_LLM_HTTP_TIMEOUT)
+    return _ollama_client
+
+
+def warmup_llm():
+    """Ollama 모델 사전 로드 및 공유 클라이언트 연결 수립 (실패해도 서버 동작에는 영향 없음)
+
+    빈 프롬프트로 generate를 호출하면 응답 생성 없이 모델만 메모리에 올라간다.
+    """
+    if not LLM_WARMUP or LLM_PROVIDER == "internal":
+        return
+    client = _get_ollama_client()
+    for model in dict.fromkeys(filter(None, (OLLAMA_MODEL, OLLAMA_LIGHT_MODEL))):
+        try:
+            client.generate(model=model, prompt="")
+            print(f"Ollama model warmed up: {model}")
+        except Exception as e:
+            print(f"Ollama warmup failed ({model}): {e}")
+
+
+def _get_async_ollama_client() -> ollama.AsyncClient:
+    """현재 이벤트 루프에서 사용할 ollama.AsyncClient 반환"""
+    loop = asyncio.get_running_loop()
+    client = _async_ollama_clients.get(loop)
+    if client is None:
+        client = ollama.AsyncClient(host=OLLAMA_HOST, timeout=_LLM_HTTP_TIMEOUT)
+        _async_ollama_clients[loop] = client
+    return client
+
+
+async def acall_llm(prompt: str, enable_sequential_thinking: bool = False, use_context7: bool = False,
+                    system_prompt: str | None = None, task: str = "generate") -> str:
+    """비동기 통합 LLM 호출 함수 (이벤트 루프를 블로킹하지 않음)
+
+    Args:
+        prompt: LLM에 전달할 프롬프트
+        enable_sequential_thinking: Sequential Thinking MCP 활성화 여부
+        use_context7: Context7 tool 활성화 여부
+        system_prompt: 호출 간 공유되는 고정 앞부분 (system 메시지로 전송)
+        task: 작업 종류 ("generate", "classify", "score")
+
+    Returns:
+        LLM 응답 문자열
+    """
+    if LLM_PROVIDER == "internal" and (enable_sequential_thinking or use_context7):
+        # Tool calling 루프는 동기 구현을 스레드에서 실행
+        return await run_llm_in_thread(call_llm, prompt, enable_sequential_thinking, use_context7, system_prompt, task)
+
+    cache_key = _cache_key(prompt, enable_sequential_thinking, use_context7, system_prompt, task)
+    cached = await _acache_get(cache_key)
+    if cached is not None:
+        return cached
+
+    if not LLM_CACHE_ENABLED:
+        return await _acall_llm_uncached(cache_key, prompt, system_prompt, task)
+
+    # 다른 job이 같은 요청을 이미 처리 중이면 그 결과를 기다려 공유 (call_llm의 비동기 버전)
+    shared, owner = await _join_async_inflight(cache_key)
+    if owner is None:
+        return shared
+
+    content = None
+    try:
+        content = await _acall_llm_uncached(cache_key, prompt, system_prompt, task)
+        return content
+    finally:
+        _finish_async_inflight(cache_key, owner, content)
+
+
+async def _acall_llm_uncached(cache_key: str, prompt: str, system_prompt: str | None, task: str) -> str:
+    """캐시 미스 시 실제 비동기 호출 후 캐시에 저장 (실패 시 실패 메시지 반환)"""
+    try:
+        async with _allm_slot():
+            await _await_rate_limit()
+            if LLM_PROVIDER == "internal":
+                content = await _ainternal_raw_chat(prompt, system_prompt, _resolve_model(task))
+            else:
+                model = _resolve_model(task)
+                response = await _get_async_ollama_client().chat(
+                    model=model,
+                    messages=_chat_messages(prompt, system_prompt)
+                )
+                content = response['message']['content']
     except Exception as e:
         print(f"LLM API 호출 실패: {e}")
-        import traceback
         traceback.print_exc()
         return f"AI 응답 생성 실패: {e}"
 
+    await _acache_put(cache_key, content)
+    return content
+
+
+async def _acall_llm_bounded(semaphore: asyncio.Semaphore, prompt: str,
+                             enable_sequential_thinking: bool, use_context7: bool) -> str:
+    """세마포어로 동시 호출 수를 제한하여 acall_llm 실행"""
+    async with semaphore:
+        return await acall_llm(prompt, enable_sequential_thinking=enable_sequential_thinking, use_context7=use_context7)
+
+
+async def acall_llm_many(prompts: list[str], enable_sequential_thinking: bool = False, use_context7: bool = False,
+                         max_concurrency: int = LLM_BATCH_CONCURRENCY) -> list[str]:
+    """여러 프롬프트를 동시에 호출 (응답 순서는 입력 순서와 동일, 최대 max_concurrency개 동시 실행)"""
+    semaphore = asyncio.Semaphore(max_concurrency)
+    return list(await asyncio.gather(*[
+        _acall_llm_bounded(semaphore, prompt, enable_sequential_thinking, use_context7)
+        for prompt in prompts
+    ]))
+
+
+async def acall_llm_as_completed(prompts: list[str], enable_sequential_thinking: bool = False, use_context7: bool = False,
+                                 max_concurrency: int = LLM_BATCH_CONCURRENCY) -> AsyncIterator[tuple[int, str]]:
+    """여러 프롬프트를 동시에 호출하고 먼저 끝난 응답부터 (입력 인덱스, 응답) 형태로 반환"""
+    semaphore = asyncio.Semaphore(max_concurrency)
+
+    async def _indexed(index: int, prompt: str) -> tuple[int, str]:
+        return index, await _acall_llm_bounded(semaphore, prompt, enable_sequential_thinking, use_context7)
+
+    for future in asyncio.as_completed([_indexed(idx, prompt) for idx, prompt in enumerate(prompts)]):
+        yield await future
+
+
+def call_llm_many(prompts: list[str], enable_sequential_thinking: bool = False, use_context7: bool = False) -> list[str]:
+    """동기 코드용 acall_llm_many 래퍼 (실행 중인 이벤트 루프 밖에서만 사용)"""
+    return asyncio.run(acall_llm_many(prompts, enable_sequential_thinking=enable_sequential_thinking, use_context7=use_context7))
+
 
-def call_ollama(prompt: str, model: str = "gemma3:1b", enable_sequential_thinking: bool = False, use_context7: bool = False) -> str:
+def call_ollama(prompt: str, model: str = "gemma3:1b", enable_sequential_thinking: bool = False, use_context7: bool = False,
+                system_prompt: str | None = None, task: str = "generate") -> str:
     """Ollama를 통한 LLM 호출 (하위 호환성을 위해 유지, 내부적으로 call_llm 사용)"""
-    return call_llm(prompt, enable_sequential_thinking=enable_sequential_thinking, use_context7=use_context7)
+    return call_llm(prompt, enable_sequential_thinking=enable_sequential_thinking, use_context7=use_context7,
+                    system_prompt=system_prompt, task=task)
@@ -1,7 +1,87 @@
 """RAG (Retrieval Augmented Generation) functions"""
 import os
 import asyncio
+import functools
+import weakref
+
+import httpx
+import msgspec
+import orjson
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+
+# RAG API 호출용 공유 세션 (호출마다 TCP/TLS 연결을 새로 맺지 않도록 커넥션 풀 재사용)
+_rag_session = requests.Session()
+_rag_session.mount("http://", HTTPAdapter(
+    pool_connections=16,
+    pool_maxsize=64,
+    max_retries=Retry(
+        total=3,
+        backoff_factor=0.3,
+        backoff_jitter=0.3,
+        status_forcelist=[502, 503, 504],
+        allowed_methods=frozenset({"POST"}),  # 검색 요청은 멱등
+        raise_on_status=False,
+    ),
+))
+_rag_session.mount("https://", _rag_session.get_adapter("http://"))
+_rag_session.headers.update({"Connection": "keep-alive"})
+
+# (연결, 응답) 타임아웃: 죽은 엔드포인트는 연결 단계에서 빠르게 실패
+RAG_CONNECT_TIMEOUT = 3.05
+RAG_READ_TIMEOUT = 25
+
+# 비동기 검색용 클라이언트 (이벤트 루프별로 생성)
+_rag_async_clients: weakref.WeakKeyDictionary = weakref.WeakKeyDictionary()
+
+
+@functools.lru_cache(maxsize=1)
+def _rag_config() -> dict:
+    """환경 변수 기반 RAG 설정 (최초 호출 시 1회 로드)"""
+    base_url = os.getenv("RAG_BASE_URL", "http://localhost:8000")
+    return {
+        # 검색 방법별 URL
+        "urls": {method: f"{base_url}/retrieve-{method}" for method in ("rrf", "bm25", "knn", "cc")},
+        "headers": {
+            "Content-Type": "application/json",
+            "x-dep-ticket": os.getenv("RAG_CREDENTIAL_KEY", ""),
+            "api-key": os.getenv("RAG_API_KEY", ""),
+        },
+        "index_name": os.getenv("RAG_INDEX_NAME", ""),
+        "permission_groups": os.getenv("RAG_PERMISSION_GROUPS", "user").split(","),
+    }
+
+
+def _build_rag_request(query_text: str, num_result_doc: int, retrieval_method: str) -> tuple[str, dict, dict]:
+    """RAG API 요청 URL, 헤더, 본문 구성"""
+    config = _rag_config()
+    urls = config["urls"]
+    retrieval_url = urls.get(retrieval_method, urls["rrf"])
+
+    # 요청 데이터 설정
+    fields = {
+        "index_name": config["index_name"],
+        "permission_groups": config["permission_groups"],
+        "query_text": query_text,
+        "num_result_doc": num_result_doc,
+        "fields_exclude": ["v_merge_title_content"]
+    }
+
+    return retrieval_url, config["headers"], fields
+
+
+def _parse_rag_response(response) -> list:
+    """RAG API 응답에서 hits 추출 (requests/httpx 응답 공용)"""
+    if response.status_code == 200:
+        result = orjson.loads(response.content)
+        hits = result.get('hits', {}).get('hits', [])
+        print(f"RAG 검색 완료: {len(hits)}건 검색됨")
+        return hits
+    else:
+        print(f"RAG API 호출 실패: {response.status_code} - {response.text}")
+        return []
 
 
 def retrieve_from_rag(query_text: str, num_result_doc: int = 5, retrieval_method: str = "rrf") -> list:
@@ -16,49 +96,145 @@ def retrieve_from_rag(query_text: str, num_result_doc: int = 5, retrieval_method
         검색 결과 리스트
     """
     try:
-        # 환경 변수에서 RAG 설정 로드
-        base_url = os.getenv("RAG_BASE_URL", "http://localhost:8000")
-        credential_key = os.getenv("RAG_CREDENTIAL_KEY", "")
-        rag_api_key = os.getenv("RAG_API_KEY", "")
-        index_name = os.getenv("RAG_INDEX_NAME", "")
-        permission_groups = os.getenv("RAG_PERMISSION_GROUPS", "user").split(",")
-
-        # 검색 URL 설정
-        retrieval_urls = {
-            "rrf": f"{base_url}/retrieve-rrf",
-            "bm25": f"{base_url}/retrieve-bm25",
-            "knn": f"{base_url}/retrieve-knn",
-            "cc": f"{base_url}/retrieve-cc"
-        }
-
-        retrieval_url = retrieval_urls.get(retrieval_method, retrieval_urls["rrf"])
-
-        # 헤더 설정
-        headers = {
-            "Content-Type": "application/json",
-            "x-dep-ticket": credential_key,
-            "api-key": rag_api_key
-        }
-
-        # 요청 데이터 설정
-        fields = {
-            "index_name": index_name,
-            "permission_groups": permission_groups,
-            "query_text": query_text,
-            "num_result_doc": num_result_doc,
-            "fields_exclude": ["v_merge_title_content"]
-        }
+        retrieval_url, headers, fields = _build_rag_request(query_text, num_result_doc, retrieval_method)
 
         # RAG API 호출
-        response = requests.post(retrieval_url, headers=headers, json=fields, timeout=30)
+        response = _rag_session.post(retrieval_url, headers=headers, json=fields, timeout=(RAG_CONNECT_TIMEOUT, RAG_READ_TIMEOUT))
+        return _parse_rag_response(response)
+
+    except Exception as e:
+        print(f"RAG 검색 실패: {e}")
+        return []
+
+
+def _get_rag_async_client() -> httpx.AsyncClient:
+    """현재 이벤트 루프용 httpx.AsyncClient (루프별로 1개 생성 후 재사용)"""
+    loop = asyncio.get_running_loop()
+    client = _rag_async_clients.get(loop)
+    if client is None:
+        client = httpx.AsyncClient(
+            timeout=httpx.Timeout(RAG_READ_TIMEOUT, connect=RAG_CONNECT_TIMEOUT),
+            limits=httpx.Limits(max_connections=64, max_keepalive_connections=16),
+            transport=httpx.AsyncHTTPTransport(retries=3),
+        )
+        _rag_async_clients[loop] = client
+    return client
+
+
+async def aclose_rag_client():
+    """현재 이벤트 루프의 RAG 클라이언트 종료 (서버 종료 시 keep-alive 연결 정리)"""
+    client = _rag_async_clients.pop(asyncio.get_running_loop(), None)
+    if client is not None:
+        await client.aclose()
+
+
+async def _apost_rag(query_text: str, num_result_doc: int, retrieval_method: str) -> httpx.Response:
+    """RAG API 비동기 호출 (응답 파싱은 호출자가 담당)"""
+    retrieval_url, headers, fields = _build_rag_request(query_text, num_result_doc, retrieval_method)
+    return await _get_rag_async_client().post(retrieval_url, headers=headers, json=fields)
+
+
+async def aretrieve_from_rag(query_text: str, num_result_doc: int = 5, retrieval_method: str = "rrf") -> list:
+    """retrieve_from_rag의 비동기 버전 (스레드 없이 이벤트 루프에서 직접 호출)"""
+    try:
+        response = await _apost_rag(query_text, num_result_doc, retrieval_method)
+        return _parse_rag_response(response)
+
+    except Exception as e:
+        print(f"RAG 검색 실패: {e}")
+        return []
+
+
+# Reciprocal Rank Fusion 상수 (일반적으로 60 사용)
+RRF_K = 60
+
+
+async def retrieve_ensemble(
+    query_text: str,
+    methods: list[str] | None = None,
+    num_result_doc: int = 5,
+) -> list:
+    """여러 검색 방법을 동시에 호출하고 RRF로 결과 병합
+
+    Args:
+        query_text: 검색 쿼리
+        methods: 검색 방법 목록 (기본값: ["rrf", "bm25"])
+        num_result_doc: 반환할 문서 수
+
+    Returns:
+        RRF 점수 순으로 정렬된 검색 결과 리스트 (_id 기준 중복 제거)
+    """
+    methods = methods or ["rrf", "bm25"]
+    results = await asyncio.gather(
+        *[aretrieve_from_rag(query_text, num_result_doc=num_result_doc, retrieval_method=m)
+          for m in methods]
+    )
+
+    scores: dict = {}
+    hits_by_id: dict = {}
+    for hits in results:
+        for rank, hit in enumerate(hits, start=1):
+            doc_id = hit.get("_id") or id(hit)
+            scores[doc_id] = scores.get(doc_id, 0.0) + 1.0 / (RRF_K + rank)
+            hits_by_id.setdefault(doc_id, hit)
+
+    ranked = sorted(scores, key=scores.get, reverse=True)
+    return [hits_by_id[doc_id] for doc_id in ranked[:num_result_doc]]
+
+
+# BP 사례 검색 응답 스키마 (msgspec이 C 레벨에서 한 번에 파싱, 스키마에 없는 필드는 건너뜀)
+class _BpSource(msgspec.Struct):
+    title: str | None = "제목 없음"
+    tech_type: str | None = "AI/ML"
+    business_domain: str | None = None
+    domain: str | None = None
+    division: str | None = None
+    problem_as_was: str | None = None
+    solution_to_be: str | None = ""
+    summary: str | None = None
+    tips: str | None = ""
+    link: str | None = ""
+    content: str | None = ""
+
 
-        if response.status_code == 200:
-            result = response.json()
-            print(f"RAG 검색 완료: {len(result.get('hits', {}).get('hits', []))}건 검색됨")
-            return result.get('hits', {}).get('hits', [])
-        else:
+class _BpHit(msgspec.Struct):
+    source: _BpSource = msgspec.field(default_factory=_BpSource, name="_source")
+
+
+class _BpHitList(msgspec.Struct):
+    # hit는 하나씩 따로 디코딩 (한 hit의 필드 타입이 달라도 나머지 hit는 사용)
+    hits: list[msgspec.Raw] = []
+
+
+class _BpResponse(msgspec.Struct):
+    hits: _BpHitList = msgspec.field(default_factory=_BpHitList)
+
+
+_bp_response_decoder = msgspec.json.Decoder(_BpResponse)
+_bp_hit_decoder = msgspec.json.Decoder(_BpHit)
+
+
+def _decode_bp_sources(content: bytes) -> list[_BpSource]:
+    """RAG 응답 본문을 _BpSource 목록으로 디코딩 (스키마와 맞지 않는 hit만 건너뜀)"""
+    sources = []
+    for raw_hit in _bp_response_decoder.decode(content).hits.hits:
+        try:
+            sources.append(_bp_hit_decoder.decode(raw_hit).source)
+        except msgspec.ValidationError as e:
+            print(f"RAG 검색 결과 건너뜀 (스키마 불일치): {e}")
+    return sources
+
+
+async def _aretrieve_bp_sources(query_text: str, num_result_doc: int = 5) -> list[_BpSource]:
+    """BP 사례용 RAG 검색 (응답을 _BpSource 목록으로 바로 디코딩)"""
+    try:
+        response = await _apost_rag(query_text, num_result_doc, "rrf")
+        if response.status_code != 200:
             print(f"RAG API 호출 실패: {response.status_code} - {response.text}")
             return []
+        sources = _decode_bp_sources(response.content)
+        print(f"RAG 검색 완료: {len(sources)}건 검색됨")
+        return sources
 
     except Exception as e:
         print(f"RAG 검색 실패: {e}")
@@ -86,20 +262,20 @@ async def rag_retrieve_bp_cases(domain: str, division: str, proposal_content: st
         query = f"{domain} {division} BP 사례"
 
     try:
-        hits = await asyncio.to_thread(retrieve_from_rag, query, num_result_doc=5)
+        sources = await _aretrieve_bp_sources(query, num_result_doc=5)
         cases = []
-        for hit in hits:
-            source = hit.get("_source", {})
+        for source in sources:
+            content = source.content or ""
             cases.append({
-                "title": source.get("title", "제목 없음"),
-                "tech_type": source.get("tech_type", "AI/ML"),
-                "business_domain": source.get("business_domain") or source.get("domain", domain),
-                "division": source.get("division", division),
-                "problem_as_was": source.get("problem_as_was", source.get("content", "")[:100]),
-                "solution_to_be": source.get("solution_to_be", ""),
-                "summary": source.get("summary", source.get("content", "")[:200]),
-                "tips": source.get("tips", ""),
-                "link": source.get("link", "")  # Confluence URL
+                "title": source.title,
+                "tech_type": source.tech_type,
+                "business_domain": source.business_domain or source.domain or domain,
+                "division": source.division or division,
+                "problem_as_was": source.problem_as_was if source.problem_as_was is not None else content[:100],
+                "solution_to_be": source.solution_to_be,
+                "summary": source.summary if source.summary is not None else content[:200],
+                "tips": source.tips,
+                "link": source.link  # Confluence URL
             })
 
         # RAG 검색 결과가 없으면 더미 데이터 반환
@@ -113,40 +289,55 @@ async def rag_retrieve_bp_cases(domain: str, division: str, proposal_content: st
         return {"cases": get_dummy_bp_cases(domain, division)}
 
 
+# 더미 BP 사례 템플릿 ({domain}, {division} 치환)
+_DUMMY_BP_CASE_TEMPLATES = [
+    {
+        "title": "{domain} 분야 AI 기반 자동화 시스템 구축",
+        "tech_type": "AI/ML - 자연어처리",
+        "business_domain": "{domain}",
+        "division": "{division}",
+        "problem_as_was": "{domain} 업무에서 수작업 처리로 인한 시간 소요 및 오류 발생 (하루 평균 4시간 소요)",
+        "solution_to_be": "AI 기반 자동 분류 및 처리 시스템 도입으로 처리 시간 80% 단축 및 정확도 95% 달성",
+        "summary": "{domain} 분야에 AI 자동화를 도입하여 업무 효율성을 크게 향상시킨 사례. 6개월 내 ROI 200% 달성",
+        "tips": "초기 데이터 품질 확보가 중요. 파일럿 프로젝트로 시작하여 점진적 확대 권장",
+        "link": ""  # 더미 데이터는 링크 없음
+    },
+    {
+        "title": "{division} {domain} 데이터 분석 플랫폼 구축",
+        "tech_type": "AI/ML - 예측 분석",
+        "business_domain": "{domain}",
+        "division": "{division}",
+        "problem_as_was": "분산된 데이터로 인한 의사결정 지연 및 인사이트 부족",
+        "solution_to_be": "통합 데이터 분석 플랫폼 구축으로 실시간 인사이트 제공 및 예측 정확도 향상",
+        "summary": "{division} 사업부의 {domain} 데이터를 통합 분석하여 의사결정 속도 3배 향상",
+        "tips": "데이터 거버넌스 체계를 먼저 수립한 후 플랫폼 구축 시작",
+        "link": ""
+    },
+    {
+        "title": "{domain} 최적화를 위한 머신러닝 모델 적용",
+        "tech_type": "AI/ML - 최적화",
+        "business_domain": "{domain}",
+        "division": "{division}",
+        "problem_as_was": "경험 기반 의사결정으로 인한 최적화 한계 및 리소스 낭비",
+        "solution_to_be": "ML 기반 최적화 모델로 리소스 활용률 30% 개선 및 비용 절감",
+        "summary": "{domain} 업무 최적화를 위한 ML 모델 개발 및 적용 성공 사례",
+        "tips": "도메인 전문가와 데이터 사이언티스트의 긴밀한 협업이 성공의 핵심",
+        "link": ""
+    }
+]
+
+
+@functools.lru_cache(maxsize=256)
+def _build_dummy_bp_cases(domain: str, division: str) -> tuple:
+    """(domain, division)별 더미 사례를 한 번만 생성"""
+    values = {"domain": domain, "division": division}
+    return tuple(
+        {key: value.format_map(values) for key, value in template.items()}
+        for template in _DUMMY_BP_CASE_TEMPLATES
+    )
+
+
 def get_dummy_bp_cases(domain: str, division: str) -> list:
     """RAG 연결 전 테스트용 더미 BP 사례"""
-    return [
-        {
-            "title": f"{domain} 분야 AI 기반 자동화 시스템 구축",
-            "tech_type": "AI/ML - 자연어처리",
-            "business_domain": domain,
-            "division": division,
-            "problem_as_was": f"{domain} 업무에서 수작업 처리로 인한 시간 소요 및 오류 발생 (하루 평균 4시간 소요)",
-            "solution_to_be": "AI 기반 자동 분류 및 처리 시스템 도입으로 처리 시간 80% 단축 및 정확도 95% 달성",
-            "summary": f"{domain} 분야에 AI 자동화를 도입하여 업무 효율성을 크게 향상시킨 사례. 6개월 내 ROI 200% 달성",
-            "tips": "초기 데이터 품질 확보가 중요. 파일럿 프로젝트로 시작하여 점진적 확대 권장",
-            "link": ""  # 더미 데이터는 링크 없음
-        },
-        {
-            "title": f"{division} {domain} 데이터 분석 플랫폼 구축",
-            "tech_type": "AI/ML - 예측 분석",
-            "business_domain": domain,
-            "division": division,
-            "problem_as_was": "분산된 데이터로 인한 의사결정 지연 및 인사이트 부족",
-            "solution_to_be": "통합 데이터 분석 플랫폼 구축으로 실시간 인사이트 제공 및 예측 정확도 향상",
-            "summary": f"{division} 사업부의 {domain} 데이터를 통합 분석하여 의사결정 속도 3배 향상",
-            "tips": "데이터 거버넌스 체계를 먼저 수립한 후 플랫폼 구축 시작",
-            "link": ""
-        },
-        {
-            "title": f"{domain} 최적화를 위한 머신러닝 모델 적용",
-            "tech_type": "AI/ML - 최적화",
-            "business_domain": domain,
-            "division": division,
-            "problem_as_was": "경험 기반 의사결정으로 인한 최적화 한계 및 리소스 낭비",
-            "solution_to_be": "ML 기반 최적화 모델로 리소스 활용률 30% 개선 및 비용 절감",
-            "summary": f"{domain} 업무 최적화를 위한 ML 모델 개발 및 적용 성공 사례",
-            "tips": "도메인 전문가와 데이터 사이언티스트의 긴밀한 협업이 성공의 핵심",
-            "link": ""
-        }
-    ]
+    # 호출자가 수정해도 캐시가 오염되지 않도록 사본 반환
+    return [dict(case) for case in _build_dummy_bp_cases(domain, division)]
@@ -1,10 +1,122 @@
 """WebSocket connection management"""
+import asyncio
+import contextlib
+
+import orjson
 from fastapi import WebSocket, WebSocketDisconnect
+from starlette.websockets import WebSocketState
+
 
+# json.dumps와 동일하게 int 등 문자열이 아닌 dict 키 허용
+_ORJSON_OPTIONS = orjson.OPT_NON_STR_KEYS
 
 # Global WebSocket connections registry
 active_connections: dict[str, WebSocket] = {}
 
+# 연결 대기 중인 작업의 Future (websocket_endpoint가 accept 직후 resolve)
+_connection_waiters: dict[str, list[asyncio.Future]] = {}
+
+
+def is_connected(websocket: WebSocket) -> bool:
+    """클라이언트/서버 양쪽 모두 연결 상태인지 확인"""
+    return (websocket.client_state == WebSocketState.CONNECTED
+            and websocket.application_state == WebSocketState.CONNECTED)
+
+
+# 한 프레임으로 묶어 보낼 최대 메시지 수
+_SEND_BATCH_MAX = 64
+
+
+class SendQueue:
+    """WebSocket별 송신 큐
+
+    send()는 큐에 넣기만 하고 바로 반환하며, 백그라운드 태스크가 순서대로 전송한다.
+    전송 중에 여러 메시지가 쌓이면 {"batch": [...]} 프레임 하나로 묶고,
+    같은 에이전트의 연속된 스트리밍 토큰은 한 메시지로 합친다.
+    """
+
+    def __init__(self, websocket: WebSocket):
+        self.websocket = websocket
+        self._queue: asyncio.Queue = asyncio.Queue()
+        self._task = asyncio.create_task(self._run())
+
+    def send(self, message: dict) -> bool:
+        if self._task.done() or not is_connected(self.websocket):
+            return False
+        self._queue.put_nowait(message)
+        return True
+
+    def _collect(self, first: dict) -> list[dict]:
+        batch = [first]
+        while len(batch) < _SEND_BATCH_MAX and not self._queue.empty():
+            message = self._queue.get_nowait()
+            last = batch[-1]
+            if (message.get("type") == "token" and last.get("type") == "token"
+                    and message.get("agent") == last.get("agent")):
+                batch[-1] = {**last, "data": last["data"] + message["data"]}
+            else:
+                batch.append(message)
+        return batch
+
+    async def _run(self):
+        while True:
+            batch = self._collect(await self._queue.get())
+            message = batch[0] if len(batch) == 1 else {"batch": batch}
+            try:
+                await self.websocket.send_text(orjson.dumps(message, option=_ORJSON_OPTIONS).decode())
+            except (WebSocketDisconnect, RuntimeError, OSError) as e:
+                print(f"WebSocket send failed (already closed): {e}")
+                return
+
+    def close(self):
+        self._task.cancel()
+
+
+# 등록된 연결의 송신 큐 (WebSocket은 hash 불가이므로 id로 구분)
+_send_queues: dict[int, SendQueue] = {}
+
+
+async def send_msg(websocket: WebSocket, message: dict) -> bool:
+    """메시지 전송 (orjson으로 직렬화한 JSON 텍스트 프레임, send_json 대체)
+
+    등록된 연결이면 송신 큐에 넣고 전송 완료를 기다리지 않는다.
+    이미 닫힌 연결이면 전송하지 않고 False 반환 (연결 종료가 검토 작업을 중단시키지 않도록).
+    """
+    send_queue = _send_queues.get(id(websocket))
+    if send_queue is not None:
+        return send_queue.send(message)
+
+    if not is_connected(websocket):
+        return False
+    try:
+        await websocket.send_text(orjson.dumps(message, option=_ORJSON_OPTIONS).decode())
+        return True
+    except (WebSocketDisconnect, RuntimeError, OSError) as e:
+        print(f"WebSocket send failed (already closed): {e}")
+        return False
+
+
+def _unregister(job_id: str, websocket: WebSocket):
+    """연결 해제 (같은 job_id로 새 연결이 등록된 경우 그대로 유지)"""
+    if active_connections.get(job_id) is websocket:
+        active_connections.pop(job_id, None)
+
+
+@contextlib.contextmanager
+def register_connection(job_id: str, websocket: WebSocket):
+    """연결 등록 후 블록을 벗어나면 (정상/예외 종료 모두) 등록 해제"""
+    active_connections[job_id] = websocket
+    send_queue = _send_queues[id(websocket)] = SendQueue(websocket)
+    for future in _connection_waiters.pop(job_id, []):
+        if not future.done():
+            future.set_result(websocket)
+    try:
+        yield websocket
+    finally:
+        _unregister(job_id, websocket)
+        _send_queues.pop(id(websocket), None)
+        send_queue.close()
+
 
 async def websocket_endpoint(websocket: WebSocket, job_id: str):
     """WebSocket endpoint for real-time progress updates
@@ -14,21 +126,68 @@ async def websocket_endpoint(websocket: WebSocket, job_id: str):
         job_id: Job ID for tracking
     """
     await websocket.accept()
-    active_connections[job_id] = websocket
 
+    with register_connection(job_id, websocket):
+        try:
+            # 서버 -> 클라이언트 단방향 푸시 (연결 유지는 프로토콜 레벨 ping이 담당)
+            # 수신 루프는 연결 종료 감지용이며 클라이언트 메시지에는 응답하지 않음
+            while True:
+                await websocket.receive_text()
+        except WebSocketDisconnect:
+            print(f"WebSocket 연결 종료: {job_id}")
+        except Exception as e:
+            print(f"WebSocket 에러: {e}")
+
+
+async def wait_for_connection(job_id: str, timeout: float = 3.0) -> WebSocket | None:
+    """job의 WebSocket 연결 대기 (폴링 없이 연결 즉시 반환, 타임아웃 시 None)"""
+    websocket = active_connections.get(job_id)
+    if websocket is not None:
+        return websocket
+
+    future = asyncio.get_running_loop().create_future()
+    _connection_waiters.setdefault(job_id, []).append(future)
     try:
-        while True:
-            # Receive messages from client (keep-alive)
-            data = await websocket.receive_text()
-            # Echo back (keep connection alive)
-            await websocket.send_json({"type": "pong"})
-    except WebSocketDisconnect:
-        print(f"WebSocket 연결 종료: {job_id}")
-        del active_connections[job_id]
-    except Exception as e:
-        print(f"WebSocket 에러: {e}")
-        if job_id in active_connections:
-            del active_connections[job_id]
+        return await asyncio.wait_for(future, timeout)
+    except asyncio.TimeoutError:
+        return None
+    finally:
+        waiters = _connection_waiters.get(job_id)
+        if waiters and future in waiters:
+            waiters.remove(future)
+            if not waiters:
+                _connection_waiters.pop(job_id, None)
+
+
+async def send_to_job(job_id: str, message: dict) -> bool:
+    """특정 job의 WebSocket으로 메시지 전송
+
+    조회와 전송 사이에 연결이 끊겨도 KeyError 없이 False 반환.
+    """
+    websocket = active_connections.get(job_id)
+    if websocket is None:
+        return False
+    if await send_msg(websocket, message):
+        return True
+    _unregister(job_id, websocket)
+    return False
+
+
+async def broadcast(message: dict) -> int:
+    """모든 연결에 메시지를 전송하고, 전송 실패한 연결은 한 번에 정리
+
+    Returns:
+        전송에 성공한 연결 수
+    """
+    snapshot = tuple(active_connections.items())
+    # 등록된 연결은 송신 큐에 넣기만 하므로 순서가 보장되고 느린 연결을 기다리지 않음
+    sent = 0
+    for job_id, websocket in snapshot:
+        if await send_msg(websocket, message):
+            sent += 1
+        else:
+            _unregister(job_id, websocket)
+    return sent
 
 
 def get_active_connections():
@@ -1,91 +1,365 @@
 # database/db.py - SQLite 연동 (MVP 간단 구현)
+import asyncio
+import queue
 import sqlite3
-import json
+import threading
+import time
 from datetime import datetime
 from pathlib import Path
 
+import orjson
+
 DB_PATH = Path("data/review.db")
 
-def init_database():
-    """데이터베이스 초기화"""
-    DB_PATH.parent.mkdir(exist_ok=True)
-    conn = sqlite3.connect(DB_PATH)
-    cursor = conn.cursor()
-
-    # 테이블 생성
-    cursor.execute("""
-        CREATE TABLE IF NOT EXISTS review_jobs (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            status TEXT NOT NULL,
-            user_id TEXT,
-            proposal_content TEXT,
-            domain TEXT,
-            division TEXT,
-            created_at DATETIME DEFAULT CURRENT_TIMESTAMP,
-            updated_at DATETIME DEFAULT CURRENT_TIMESTAMP,
-            metadata TEXT
-        )
-    """)
+# 프로세스 전체에서 공유하는 단일 커넥션 (매 호출마다 열고 닫는 비용 제거)
+_conn: sqlite3.Connection | None = None
+_conn_lock = threading.Lock()
+# 쓰기(커밋)는 한 번에 하나씩 직렬화
+_write_lock = threading.RLock()
+
+_PRAGMAS = (
+    "PRAGMA journal_mode=WAL",
+    "PRAGMA synchronous=NORMAL",
+    "PRAGMA temp_store=MEMORY",
+    "PRAGMA cache_size=-64000",
+    "PRAGMA mmap_size=268435456",
+)
+
+
+# 커넥션별 prepared statement 캐시 크기 (동적 WHERE/SET 조합까지 재파싱 없이 재사용)
+_CACHED_STATEMENTS = 512
+
+# 스키마 버전 (테이블/컬럼/인덱스 변경 시 1 증가)
+SCHEMA_VERSION = 6
+
+# review_jobs에 마이그레이션으로 추가된 컬럼 (추가 순서 유지)
+_REVIEW_JOB_COLUMNS = {
+    "decision": "TEXT DEFAULT 'pending'",
+    "llm_decision": "TEXT DEFAULT 'pending'",
+    "title": "TEXT",
+    "confluence_page_id": "TEXT",
+    "confluence_page_url": "TEXT",
+    "enable_sequential_thinking": "INTEGER DEFAULT 0",
+    "input_method": "TEXT DEFAULT 'text'",
+}
+
+
+# review_jobs 조회 인덱스 (created_at은 'YYYY-MM-DD HH:MM:SS' 형식이라 문자열 정렬 = 시간 정렬)
+_REVIEW_JOB_INDEXES = (
+    "CREATE INDEX IF NOT EXISTS idx_jobs_created ON review_jobs(created_at DESC)",
+    "CREATE INDEX IF NOT EXISTS idx_jobs_status_created ON review_jobs(status, created_at DESC)",
+    "CREATE INDEX IF NOT EXISTS idx_jobs_decision ON review_jobs(decision, created_at DESC)",
+    "CREATE INDEX IF NOT EXISTS idx_jobs_llm_decision ON review_jobs(llm_decision, created_at DESC)",
+)
+
+
+# 제목/본문 부분 문자열 검색용 FTS5 trigram 인덱스 (review_jobs를 외부 콘텐츠로 사용)
+_REVIEW_JOB_FTS = (
+    """
+    CREATE VIRTUAL TABLE IF NOT EXISTS review_jobs_fts USING fts5(
+        title, proposal_content, content='review_jobs', content_rowid='id', tokenize='trigram'
+    )
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS review_jobs_fts_ai AFTER INSERT ON review_jobs BEGIN
+        INSERT INTO review_jobs_fts(rowid, title, proposal_content)
+        VALUES (new.id, new.title, new.proposal_content);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS review_jobs_fts_ad AFTER DELETE ON review_jobs BEGIN
+        INSERT INTO review_jobs_fts(review_jobs_fts, rowid, title, proposal_content)
+        VALUES ('delete', old.id, old.title, old.proposal_content);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS review_jobs_fts_au AFTER UPDATE OF title, proposal_content ON review_jobs BEGIN
+        INSERT INTO review_jobs_fts(review_jobs_fts, rowid, title, proposal_content)
+        VALUES ('delete', old.id, old.title, old.proposal_content);
+        INSERT INTO review_jobs_fts(rowid, title, proposal_content)
+        VALUES (new.id, new.title, new.proposal_content);
+    END
+    """,
+)
+
+# count_jobs용 (status, decision, llm_decision, input_method)별 작업 수
+# NULL은 ''로 저장 (필터 값은 항상 비어 있지 않은 문자열이므로 매칭되지 않음)
+_JOB_COUNTS_SCHEMA = (
+    """
+    CREATE TABLE IF NOT EXISTS job_counts (
+        status TEXT NOT NULL,
+        decision TEXT NOT NULL,
+        llm_decision TEXT NOT NULL,
+        input_method TEXT NOT NULL,
+        n INTEGER NOT NULL DEFAULT 0,
+        PRIMARY KEY (status, decision, llm_decision, input_method)
+    ) WITHOUT ROWID
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS job_counts_ai AFTER INSERT ON review_jobs BEGIN
+        INSERT INTO job_counts (status, decision, llm_decision, input_method, n)
+        VALUES (IFNULL(new.status, ''), IFNULL(new.decision, ''), IFNULL(new.llm_decision, ''), IFNULL(new.input_method, ''), 1)
+        ON CONFLICT (status, decision, llm_decision, input_method) DO UPDATE SET n = n + 1;
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS job_counts_ad AFTER DELETE ON review_jobs BEGIN
+        UPDATE job_counts SET n = n - 1
+        WHERE status = IFNULL(old.status, '') AND decision = IFNULL(old.decision, '')
+          AND llm_decision = IFNULL(old.llm_decision, '') AND input_method = IFNULL(old.input_method, '');
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS job_counts_au AFTER UPDATE OF status, decision, llm_decision, input_method ON review_jobs BEGIN
+        UPDATE job_counts SET n = n - 1
+        WHERE status = IFNULL(old.status, '') AND decision = IFNULL(old.decision, '')
+          AND llm_decision = IFNULL(old.llm_decision, '') AND input_method = IFNULL(old.input_method, '');
+        INSERT INTO job_counts (status, decision, llm_decision, input_method, n)
+        VALUES (IFNULL(new.status, ''), IFNULL(new.decision, ''), IFNULL(new.llm_decision, ''), IFNULL(new.input_method, ''), 1)
+        ON CONFLICT (status, decision, llm_decision, input_method) DO UPDATE SET n = n + 1;
+    END
+    """,
+)
+
+# update_job_feedback이 기록하는 피드백 이력의 agent_id
+_HITL_FEEDBACK_AGENT = "hitl"
+
+# trigram 토크나이저는 3글자 미만 검색어를 인덱스로 찾지 못함
+_FTS_MIN_QUERY_LENGTH = 3
+
+# FTS 테이블 사용 가능 여부 (SQLite 빌드에 FTS5/trigram이 없으면 LIKE 검색 유지)
+_fts_enabled: bool | None = None
+
+
+def _dump_json(value) -> str:
+    """JSON 컬럼 직렬화 (orjson, 비문자열 키는 문자열로 변환)"""
+    return orjson.dumps(value, option=orjson.OPT_NON_STR_KEYS).decode("utf-8")
+
+
+def _load_json(raw) -> dict:
+    """JSON 컬럼 역직렬화 (NULL/빈 문자열은 빈 dict)
+
+    호출 측에서 결과 dict를 수정하므로 파싱 결과를 캐시해 공유하지 않는다.
+    """
+    return orjson.loads(raw) if raw else {}
+
+
+def _get_conn() -> sqlite3.Connection:
+    """공유 커넥션 반환 (최초 호출 시 생성 및 PRAGMA 적용)"""
+    global _conn
+    if _conn is None:
+        with _conn_lock:
+            if _conn is None:
+                DB_PATH.parent.mkdir(exist_ok=True)
+                conn = sqlite3.connect(DB_PATH, check_same_thread=False, cached_statements=_CACHED_STATEMENTS)
+                # 컬럼 이름으로 접근 (인덱스 접근도 그대로 가능)
+                conn.row_factory = sqlite3.Row
+                for pragma in _PRAGMAS:
+                    conn.execute(pragma)
+                _conn = conn
+    return _conn
+
+
+def _fts_available() -> bool:
+    global _fts_enabled
+    if _fts_enabled is None:
+        row = _get_conn().execute(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'review_jobs_fts'"
+        ).fetchone()
+        _fts_enabled = row is not None
+    return _fts_enabled
+
+
+def _search_condition(search: str) -> tuple[str, list]:
+    """검색어 조건 (가능하면 FTS5 trigram 인덱스, 아니면 LIKE 스캔)"""
+    if len(search) >= _FTS_MIN_QUERY_LENGTH and _fts_available():
+        # 검색어 전체를 하나의 구문(phrase)으로 매칭 = 부분 문자열 검색
+        phrase = '"' + search.replace('"', '""') + '"'
+        return "AND id IN (SELECT rowid FROM review_jobs_fts WHERE review_jobs_fts MATCH ?)", [phrase]
+
+    like = f"%{search}%"
+    return "AND (proposal_content LIKE ? OR COALESCE(title, '') LIKE ?)", [like, like]
+
+
+def _job_filter_conditions(status, decision, llm_decision, input_method, search) -> tuple[list[str], list]:
+    """list_jobs / count_jobs 공통 WHERE 조건
+
+    값이 주어진 필터만 조건으로 추가하므로 비활성 필터는 SQL에 아예 포함되지 않는다.
+    인덱스가 있는 동등 비교를 먼저, 비용이 큰 검색 조건을 마지막에 둔다.
+    """
+    conditions: list[str] = []
+    params: list = []
 
-    # 필요한 컬럼 추가 (스키마 마이그레이션)
-    cursor.execute("PRAGMA table_info(review_jobs)")
-    existing_columns = {row[1] for row in cursor.fetchall()}
+    if status:
+        conditions.append("AND status = ?")
+        params.append(status)
 
-    if "decision" not in existing_columns:
-        cursor.execute("ALTER TABLE review_jobs ADD COLUMN decision TEXT DEFAULT 'pending'")
+    if decision:
+        conditions.append("AND decision = ?")
+        params.append(decision)
 
-    if "llm_decision" not in existing_columns:
-        cursor.execute("ALTER TABLE review_jobs ADD COLUMN llm_decision TEXT DEFAULT 'pending'")
-        cursor.execute("UPDATE review_jobs SET llm_decision = COALESCE(decision, 'pending')")
+    if llm_decision:
+        conditions.append("AND llm_decision = ?")
+        params.append(llm_decision)
 
-    if "title" not in existing_columns:
-        cursor.execute("ALTER TABLE review_jobs ADD COLUMN title TEXT")
+    if input_method:
+        conditions.append("AND input_method = ?")
+        params.append(input_method)
 
-    if "confluence_page_id" not in existing_columns:
-        cursor.execute("ALTER TABLE review_jobs ADD COLUMN confluence_page_id TEXT")
+    if search:
+        condition, search_params = _search_condition(search)
+        conditions.append(condition)
+        params.extend(search_params)
 
-    if "confluence_page_url" not in existing_columns:
-        cursor.execute("ALTER TABLE review_jobs ADD COLUMN confluence_page_url TEXT")
+    return conditions, params
 
-    if "enable_sequential_thinking" not in existing_columns:
-        cursor.execute("ALTER TABLE review_jobs ADD COLUMN enable_sequential_thinking INTEGER DEFAULT 0")
 
-    if "input_method" not in existing_columns:
-        cursor.execute("ALTER TABLE review_jobs ADD COLUMN input_method TEXT DEFAULT 'text'")
+def init_database():
+    """데이터베이스 초기화 (공유 커넥션 생성 및 PRAGMA 적용 포함)"""
+    with _write_lock:
+        conn = _get_conn()
+        cursor = conn.cursor()
+
+        # 이미 최신 스키마면 버전 확인 한 번으로 종료
+        if cursor.execute("PRAGMA user_version").fetchone()[0] >= SCHEMA_VERSION:
+            print("Database initialized successfully")
+            return
+
+        # 스키마 생성/마이그레이션을 하나의 트랜잭션으로 묶어 디스크 동기화는 커밋 시 한 번만 수행
+        # (sqlite3 모듈은 DDL 앞에 암묵적 BEGIN을 넣지 않으므로 명시적으로 시작)
+        # 여러 워커 프로세스가 동시에 시작해도 마이그레이션은 한 번만 실행되도록 쓰기 잠금을 먼저 획득
+        conn.execute("BEGIN IMMEDIATE")
+        if cursor.execute("PRAGMA user_version").fetchone()[0] >= SCHEMA_VERSION:
+            conn.rollback()
+            print("Database initialized successfully")
+            return
+        with conn:
+            # 테이블 생성
+            cursor.execute("""
+                CREATE TABLE IF NOT EXISTS review_jobs (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    status TEXT NOT NULL,
+                    user_id TEXT,
+                    proposal_content TEXT,
+                    domain TEXT,
+                    division TEXT,
+                    created_at DATETIME DEFAULT CURRENT_TIMESTAMP,
+                    updated_at DATETIME DEFAULT CURRENT_TIMESTAMP,
+                    metadata TEXT
+                )
+            """)
+
+            # 필요한 컬럼 추가 (스키마 마이그레이션: table_info 1회 조회 후 누락 컬럼만 추가)
+            cursor.execute("PRAGMA table_info(review_jobs)")
+            existing_columns = {row[1] for row in cursor.fetchall()}
+            missing = _REVIEW_JOB_COLUMNS.keys() - existing_columns
+
+            for column, definition in _REVIEW_JOB_COLUMNS.items():
+                if column in missing:
+                    cursor.execute(f"ALTER TABLE review_jobs ADD COLUMN {column} {definition}")
+
+            # llm_decision 컬럼이 이번에 새로 추가된 경우에만 기존 결정값으로 채움
+            # (기본값 'pending'과 같은 행은 건드리지 않음)
+            if "llm_decision" in missing:
+                cursor.execute("""
+                    UPDATE review_jobs SET llm_decision = decision
+                    WHERE llm_decision = 'pending' AND decision IS NOT NULL AND decision != 'pending'
+                """)
+
+            # list_jobs / count_jobs 필터 + 최신순 정렬 경로용 인덱스
+            for statement in _REVIEW_JOB_INDEXES:
+                cursor.execute(statement)
+
+            try:
+                cursor.execute("SAVEPOINT review_jobs_fts")
+                for statement in _REVIEW_JOB_FTS:
+                    cursor.execute(statement)
+                # 기존 행 색인
+                cursor.execute("INSERT INTO review_jobs_fts(review_jobs_fts) VALUES ('rebuild')")
+                cursor.execute("RELEASE review_jobs_fts")
+            except sqlite3.OperationalError as e:
+                cursor.execute("ROLLBACK TO review_jobs_fts")
+                cursor.execute("RELEASE review_jobs_fts")
+                print(f"FTS5 trigram search unavailable, falling back to LIKE: {e}")
 
-    cursor.execute("""
-        CREATE TABLE IF NOT EXISTS hitl_feedback (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            job_id INTEGER,
-            agent_id TEXT NOT NULL,
-            feedback_data TEXT,
-            timestamp DATETIME DEFAULT CURRENT_TIMESTAMP,
-            FOREIGN KEY (job_id) REFERENCES review_jobs(id)
-        )
-    """)
-
-    cursor.execute("""
-        CREATE TABLE IF NOT EXISTS enterprise_bp_cases (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            title TEXT NOT NULL,
-            tech_type TEXT,
-            business_domain TEXT,
-            division TEXT,
-            organization TEXT,
-            problem_as_was TEXT,
-            solution_to_be TEXT,
-            summary TEXT,
-            tips TEXT,
-            reference_docs TEXT,
-            created_at DATETIME DEFAULT CURRENT_TIMESTAMP,
-            updated_at DATETIME DEFAULT CURRENT_TIMESTAMP
-        )
-    """)
+            cursor.execute("""
+                CREATE TABLE IF NOT EXISTS hitl_feedback (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    job_id INTEGER,
+                    agent_id TEXT NOT NULL,
+                    feedback_data TEXT,
+                    timestamp DATETIME DEFAULT CURRENT_TIMESTAMP,
+                    FOREIGN KEY (job_id) REFERENCES review_jobs(id)
+                )
+            """)
+
+            cursor.execute("""
+                CREATE TABLE IF NOT EXISTS enterprise_bp_cases (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    title TEXT NOT NULL,
+                    tech_type TEXT,
+                    business_domain TEXT,
+                    division TEXT,
+                    organization TEXT,
+                    problem_as_was TEXT,
+                    solution_to_be TEXT,
+                    summary TEXT,
+                    tips TEXT,
+                    reference_docs TEXT,
+                    created_at DATETIME DEFAULT CURRENT_TIMESTAMP,
+                    updated_at DATETIME DEFAULT CURRENT_TIMESTAMP
+                )
+            """)
+
+            cursor.execute("CREATE INDEX IF NOT EXISTS idx_feedback_job ON hitl_feedback(job_id, agent_id)")
+
+            # metadata.feedback_history → hitl_feedback 테이블로 이전
+            cursor.execute("""
+                INSERT INTO hitl_feedback (job_id, agent_id, feedback_data, timestamp)
+                SELECT r.id, ?, entry.value, COALESCE(json_extract(entry.value, '$.timestamp'), r.updated_at)
+                FROM review_jobs AS r,
+                     json_each(CASE WHEN json_valid(r.metadata) THEN r.metadata ELSE '{}' END, '$.feedback_history') AS entry
+                ORDER BY r.id, entry.key
+            """, (_HITL_FEEDBACK_AGENT,))
+            cursor.execute("""
+                UPDATE review_jobs
+                SET metadata = json_remove(metadata, '$.feedback_history')
+                WHERE json_valid(metadata) AND json_type(metadata, '$.feedback_history') IS NOT NULL
+            """)
+
+            # 필터 조합별 작업 수 요약 테이블 (트리거로 유지, 생성 시 현재 데이터로 재계산)
+            for statement in _JOB_COUNTS_SCHEMA:
+                cursor.execute(statement)
+            cursor.execute("DELETE FROM job_counts")
+            cursor.execute("""
+                INSERT INTO job_counts (status, decision, llm_decision, input_method, n)
+                SELECT IFNULL(status, ''), IFNULL(decision, ''), IFNULL(llm_decision, ''), IFNULL(input_method, ''), COUNT(*)
+                FROM review_jobs
+                GROUP BY 1, 2, 3, 4
+            """)
 
-    conn.commit()
-    conn.close()
+            # LLM 응답 영속 캐시 (core.llm의 프로세스 내 캐시 뒤 2차 캐시)
+            cursor.execute("""
+                CREATE TABLE IF NOT EXISTS llm_cache (
+                    key TEXT PRIMARY KEY,
+                    response TEXT NOT NULL,
+                    created_at INTEGER NOT NULL
+                ) WITHOUT ROWID
+            """)
+            cursor.execute("CREATE INDEX IF NOT EXISTS idx_llm_cache_created ON llm_cache(created_at)")
+
+            cursor.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
     print("Database initialized successfully")
 
+_INSERT_JOB_SQL = """
+    INSERT INTO review_jobs (status, decision, llm_decision, title, proposal_content, domain, division, metadata, confluence_page_id, confluence_page_url, enable_sequential_thinking, input_method)
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+"""
+
+# INSERT ... RETURNING은 SQLite 3.35 이상에서 지원
+_INSERT_RETURNING_SUPPORTED = sqlite3.sqlite_version_info >= (3, 35, 0)
+
+
 def create_job(
     proposal_content: str,
     domain: str,
@@ -103,103 +377,156 @@ def create_job(
     input_method: str = "text",
 ):
     """새 검토 작업 생성"""
-    conn = sqlite3.connect(DB_PATH)
-    cursor = conn.cursor()
-
     metadata_payload = metadata.copy() if metadata else {}
     if hitl_stages is not None:
         metadata_payload["hitl_stages"] = hitl_stages
 
-    cursor.execute(
-        """
-        INSERT INTO review_jobs (status, decision, llm_decision, title, proposal_content, domain, division, metadata, confluence_page_id, confluence_page_url, enable_sequential_thinking, input_method)
-        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-        """,
-        (
-            status,
-            human_decision,
-            llm_decision,
-            title,
-            proposal_content,
-            domain,
-            division,
-            json.dumps(metadata_payload),
-            confluence_page_id,
-            confluence_page_url,
-            1 if enable_sequential_thinking else 0,
-            input_method,
-        ),
-    )
-
-    job_id = cursor.lastrowid
-    conn.commit()
-    conn.close()
-    return job_id
-
-def _row_to_job_dict(row):
-    (
-        job_id,
+    params = (
         status,
-        decision,
+        human_decision,
         llm_decision,
         title,
         proposal_content,
         domain,
         division,
-        metadata_json,
-        created_at,
-        updated_at,
+        _dump_json(metadata_payload),
         confluence_page_id,
         confluence_page_url,
-        enable_sequential_thinking,
+        1 if enable_sequential_thinking else 0,
         input_method,
-    ) = row
+    )
+
+    with _write_lock, _get_conn() as conn:
+        if _INSERT_RETURNING_SUPPORTED:
+            job_id = conn.execute(_INSERT_JOB_SQL + " RETURNING id", params).fetchone()[0]
+        else:
+            job_id = conn.execute(_INSERT_JOB_SQL, params).lastrowid
+    return job_id
 
-    metadata = json.loads(metadata_json) if metadata_json else {}
 
+# 작업 조회 시 선택하는 컬럼 (get_job / list_jobs 공통)
+_JOB_COLUMNS = (
+    "id, status, decision, llm_decision, title, proposal_content, domain, division, metadata, "
+    "created_at, updated_at, confluence_page_id, confluence_page_url, enable_sequential_thinking, input_method"
+)
+
+
+# 목록 화면용 요약 컬럼 (본문/메타데이터 제외)
+_JOB_SUMMARY_COLUMNS = (
+    "id, status, decision, llm_decision, title, domain, division, "
+    "created_at, updated_at, confluence_page_id, confluence_page_url, input_method"
+)
+
+
+def _row_to_job_summary(row: sqlite3.Row):
+    decision = row["decision"] or "pending"
     return {
-        "id": job_id,
-        "status": status,
-        "decision": decision or "pending",
-        "human_decision": decision or "pending",
-        "llm_decision": llm_decision or "pending",
-        "title": title or "",
+        "id": row["id"],
+        "status": row["status"],
+        "decision": decision,
+        "human_decision": decision,
+        "llm_decision": row["llm_decision"] or "pending",
+        "title": row["title"] or "",
+        "domain": row["domain"],
+        "division": row["division"],
+        "created_at": row["created_at"],
+        "updated_at": row["updated_at"],
+        "confluence_page_id": row["confluence_page_id"],
+        "confluence_page_url": row["confluence_page_url"],
+        "input_method": row["input_method"] or "text",
+    }
+
+
+def _row_to_job_dict(row: sqlite3.Row):
+    metadata = _load_json(row["metadata"])
+    decision = row["decision"] or "pending"
+    proposal_content = row["proposal_content"]
+
+    return {
+        "id": row["id"],
+        "status": row["status"],
+        "decision": decision,
+        "human_decision": decision,
+        "llm_decision": row["llm_decision"] or "pending",
+        "title": row["title"] or "",
         "content": proposal_content,
         "proposal_content": proposal_content,
-        "domain": domain,
-        "division": division,
+        "domain": row["domain"],
+        "division": row["division"],
         "metadata": metadata,
         "hitl_stages": metadata.get("hitl_stages", []),
         "feedback": metadata.get("feedback", ""),
         "feedback_skip": metadata.get("feedback_skip", False),
-        "feedback_history": metadata.get("feedback_history", []),
+        "feedback_history": [],  # hitl_feedback 테이블에서 채움 (_attach_feedback_history)
         "report": metadata.get("report"),
-        "created_at": created_at,
-        "updated_at": updated_at,
-        "confluence_page_id": confluence_page_id,
-        "confluence_page_url": confluence_page_url,
-        "enable_sequential_thinking": bool(enable_sequential_thinking),
-        "input_method": input_method or "text",
+        "created_at": row["created_at"],
+        "updated_at": row["updated_at"],
+        "confluence_page_id": row["confluence_page_id"],
+        "confluence_page_url": row["confluence_page_url"],
+        "enable_sequential_thinking": bool(row["enable_sequential_thinking"]),
+        "input_method": row["input_method"] or "text",
     }
 
 
+def _attach_feedback_history(jobs):
+    """작업 dict들의 feedback_history를 hitl_feedback 테이블에서 한 번에 조회해 채움"""
+    by_id = {job["id"]: job for job in jobs}
+    if not by_id:
+        return
+
+    ids = list(by_id)
+    cursor = _get_conn().cursor()
+    for start in range(0, len(ids), _GET_JOBS_CHUNK_SIZE):
+        chunk = ids[start:start + _GET_JOBS_CHUNK_SIZE]
+        placeholders = ", ".join("?" * len(chunk))
+        cursor.execute(
+            f"""
+            SELECT job_id, feedback_data FROM hitl_feedback
+            WHERE agent_id = ? AND job_id IN ({placeholders})
+            ORDER BY id
+            """,
+            [_HITL_FEEDBACK_AGENT, *chunk],
+        )
+        for row in cursor.fetchall():
+            by_id[row["job_id"]]["feedback_history"].append(_load_json(row["feedback_data"]))
+
+
+# get_jobs에서 한 번의 IN 쿼리에 바인딩할 최대 ID 수 (SQLite 변수 개수 제한 대비)
+_GET_JOBS_CHUNK_SIZE = 500
+
+
 def get_job(job_id: int):
-    """작업 단건 조회"""
-    conn = sqlite3.connect(DB_PATH)
-    cursor = conn.cursor()
-
-    cursor.execute(
-        """
-        SELECT id, status, decision, llm_decision, title, proposal_content, domain, division, metadata, created_at, updated_at, confluence_page_id, confluence_page_url, enable_sequential_thinking, input_method
-        FROM review_jobs WHERE id = ?
-        """,
-        (job_id,),
-    )
+    """작업 단건 조회 (get_jobs의 단건 버전)"""
+    return get_jobs([job_id]).get(job_id)
+
+
+async def aget_job(job_id: int):
+    """get_job의 비동기 버전 (쓰기 잠금 대기/디스크 I/O가 이벤트 루프를 막지 않도록 워커 스레드에서 조회)"""
+    return await asyncio.to_thread(get_job, job_id)
+
+
+def get_jobs(job_ids) -> dict[int, dict]:
+    """여러 작업을 IN 쿼리로 한 번에 조회
+
+    Returns:
+        {job_id: job dict} (존재하지 않는 ID는 제외)
+    """
+    ids = list(dict.fromkeys(job_ids))
+    if not ids:
+        return {}
+
+    cursor = _get_conn().cursor()
+    jobs: dict[int, dict] = {}
 
-    row = cursor.fetchone()
-    conn.close()
+    for start in range(0, len(ids), _GET_JOBS_CHUNK_SIZE):
+        chunk = ids[start:start + _GET_JOBS_CHUNK_SIZE]
+        placeholders = ", ".join("?" * len(chunk))
+        cursor.execute(f"SELECT {_JOB_COLUMNS} FROM review_jobs WHERE id IN ({placeholders})", chunk)
+        for row in cursor.fetchall():
+            jobs[row["id"]] = _row_to_job_dict(row)
 
-    return _row_to_job_dict(row) if row else None
+    _attach_feedback_history(jobs.values())
+    return jobs
 
 
 def list_jobs(
@@ -212,49 +539,48 @@ def list_jobs(
     input_method: str | None = None,
     search: str | None = None,
     order: str = "desc",
+    cursor_created_at: str | None = None,
+    cursor_id: int | None = None,
+    summary: bool = False,
 ):
-    """작업 목록 조회"""
-    conn = sqlite3.connect(DB_PATH)
-    cursor = conn.cursor()
+    """작업 목록 조회
+
+    cursor_created_at / cursor_id에 이전 페이지 마지막 작업의 (created_at, id)를 넘기면
+    OFFSET 대신 키셋(seek) 방식으로 다음 페이지를 조회한다 (offset은 무시).
+    summary=True면 본문/메타데이터/피드백 이력 없이 목록 표시용 필드만 반환한다.
+    """
+    cursor = _get_conn().cursor()
 
     query = [
-        "SELECT id, status, decision, llm_decision, title, proposal_content, domain, division, metadata, created_at, updated_at, confluence_page_id, confluence_page_url, enable_sequential_thinking, input_method",
+        f"SELECT {_JOB_SUMMARY_COLUMNS if summary else _JOB_COLUMNS}",
         "FROM review_jobs",
         "WHERE 1 = 1",
     ]
-    params: list = []
-
-    if status:
-        query.append("AND status = ?")
-        params.append(status)
-
-    if decision:
-        query.append("AND decision = ?")
-        params.append(decision)
+    conditions, params = _job_filter_conditions(status, decision, llm_decision, input_method, search)
+    query.extend(conditions)
 
-    if llm_decision:
-        query.append("AND llm_decision = ?")
-        params.append(llm_decision)
-
-    if input_method:
-        query.append("AND input_method = ?")
-        params.append(input_method)
+    order_clause = "DESC" if order.lower() != "asc" else "ASC"
 
-    if search:
-        query.append("AND (proposal_content LIKE ? OR COALESCE(title, '') LIKE ?)")
-        like = f"%{search}%"
-        params.extend([like, like])
+    if cursor_created_at is not None and cursor_id is not None:
+        comparison = "<" if order_clause == "DESC" else ">"
+        query.append(f"AND (created_at, id) {comparison} (?, ?)")
+        params.extend([cursor_created_at, cursor_id])
+        offset = 0
 
-    order_clause = "DESC" if order.lower() != "asc" else "ASC"
-    query.append(f"ORDER BY datetime(created_at) {order_clause}")
+    # datetime() 래핑 없이 정렬해야 created_at 인덱스를 사용 (id는 같은 시각 내 순서 고정용)
+    query.append(f"ORDER BY created_at {order_clause}, id {order_clause}")
     query.append("LIMIT ? OFFSET ?")
     params.extend([limit, offset])
 
     cursor.execute("\n".join(query), params)
     rows = cursor.fetchall()
-    conn.close()
 
-    return [_row_to_job_dict(row) for row in rows]
+    if summary:
+        return [_row_to_job_summary(row) for row in rows]
+
+    jobs = [_row_to_job_dict(row) for row in rows]
+    _attach_feedback_history(jobs)
+    return jobs
 
 
 def count_jobs(
@@ -265,37 +591,18 @@ def count_jobs(
     input_method: str | None = None,
     search: str | None = None,
 ):
-    """필터에 따른 총 개수"""
-    conn = sqlite3.connect(DB_PATH)
-    cursor = conn.cursor()
-
-    query = ["SELECT COUNT(*) FROM review_jobs WHERE 1 = 1"]
-    params: list = []
-
-    if status:
-        query.append("AND status = ?")
-        params.append(status)
-
-    if decision:
-        query.append("AND decision = ?")
-        params.append(decision)
-
-    if llm_decision:
-        query.append("AND llm_decision = ?")
-        params.append(llm_decision)
-
-    if input_method:
-        query.append("AND input_method = ?")
-        params.append(input_method)
+    """필터에 따른 총 개수 (검색어가 없으면 job_counts 요약 테이블에서 합산)"""
+    cursor = _get_conn().cursor()
 
     if search:
-        query.append("AND (proposal_content LIKE ? OR COALESCE(title, '') LIKE ?)")
-        like = f"%{search}%"
-        params.extend([like, like])
+        query = ["SELECT COUNT(*) FROM review_jobs WHERE 1 = 1"]
+    else:
+        query = ["SELECT COALESCE(SUM(n), 0) FROM job_counts WHERE 1 = 1"]
+    conditions, params = _job_filter_conditions(status, decision, llm_decision, input_method, search)
+    query.extend(conditions)
 
     cursor.execute("\n".join(query), params)
     total = cursor.fetchone()[0]
-    conn.close()
     return total
 
 
@@ -312,72 +619,66 @@ def update_job_record(
     metadata: dict | None = None,
 ):
     """필드 단위 업데이트"""
-    conn = sqlite3.connect(DB_PATH)
-    cursor = conn.cursor()
+    with _write_lock, _get_conn() as conn:
+        cursor = conn.cursor()
 
-    fields = []
-    params: list = []
+        fields = []
+        params: list = []
 
-    if title is not None:
-        fields.append("title = ?")
-        params.append(title)
+        if title is not None:
+            fields.append("title = ?")
+            params.append(title)
 
-    if proposal_content is not None:
-        fields.append("proposal_content = ?")
-        params.append(proposal_content)
+        if proposal_content is not None:
+            fields.append("proposal_content = ?")
+            params.append(proposal_content)
 
-    if domain is not None:
-        fields.append("domain = ?")
-        params.append(domain)
+        if domain is not None:
+            fields.append("domain = ?")
+            params.append(domain)
 
-    if division is not None:
-        fields.append("division = ?")
-        params.append(division)
+        if division is not None:
+            fields.append("division = ?")
+            params.append(division)
 
-    if status is not None:
-        fields.append("status = ?")
-        params.append(status)
+        if status is not None:
+            fields.append("status = ?")
+            params.append(status)
 
-    if human_decision is not None:
-        fields.append("decision = ?")
-        params.append(human_decision)
+        if human_decision is not None:
+            fields.append("decision = ?")
+            params.append(human_decision)
 
-    if llm_decision is not None:
-        fields.append("llm_decision = ?")
-        params.append(llm_decision)
-
-    if metadata is not None:
-        fields.append("metadata = ?")
-        params.append(json.dumps(metadata))
+        if llm_decision is not None:
+            fields.append("llm_decision = ?")
+            params.append(llm_decision)
 
-    if not fields:
-        conn.close()
-        return False
+        if metadata is not None:
+            fields.append("metadata = ?")
+            params.append(_dump_json(metadata))
 
-    fields.append("updated_at = CURRENT_TIMESTAMP")
-    params.append(job_id)
+        if not fields:
+            return False
 
-    cursor.execute(
-        f"""
-        UPDATE review_jobs
-        SET {', '.join(fields)}
-        WHERE id = ?
-        """,
-        params,
-    )
+        fields.append("updated_at = CURRENT_TIMESTAMP")
+        params.append(job_id)
 
-    conn.commit()
-    conn.close()
+        cursor.execute(
+            f"""
+            UPDATE review_jobs
+            SET {', '.join(fields)}
+            WHERE id = ?
+            """,
+            params,
+        )
     return True
 
 
 def delete_job(job_id: int):
     """작업 삭제"""
-    conn = sqlite3.connect(DB_PATH)
-    cursor = conn.cursor()
-    cursor.execute("DELETE FROM review_jobs WHERE id = ?", (job_id,))
-    conn.commit()
-    conn.close()
+    with _write_lock, _get_conn() as conn:
+        cursor = conn.cursor()
+        cursor.execute("DELETE FROM review_jobs WHERE id = ?", (job_id,))
 
 
 def update_job_status(
@@ -389,137 +690,183 @@ def update_job_status(
     human_decision: str | None = None,
 ):
     """작업 상태 및 결정 결과 업데이트"""
-    conn = sqlite3.connect(DB_PATH)
-    cursor = conn.cursor()
-
-    fields = ["status = ?", "updated_at = CURRENT_TIMESTAMP"]
-    params = [status]
+    with _write_lock, _get_conn() as conn:
+        cursor = conn.cursor()
 
-    if metadata is not None:
-        fields.append("metadata = ?")
-        params.append(json.dumps(metadata))
-
-    human_value = human_decision if human_decision is not None else decision
-    if human_value is not None:
-        fields.append("decision = ?")
-        params.append(human_value)
-
-    if llm_decision is not None:
-        fields.append("llm_decision = ?")
-        params.append(llm_decision)
+        human_value = human_decision if human_decision is not None else decision
 
-    params.append(job_id)
+        # 항상 같은 SQL 문장을 사용해 커넥션의 statement 캐시를 재사용 (None이면 기존 값 유지)
+        cursor.execute(
+            """
+            UPDATE review_jobs
+            SET status = ?,
+                metadata = COALESCE(?, metadata),
+                decision = COALESCE(?, decision),
+                llm_decision = COALESCE(?, llm_decision),
+                updated_at = CURRENT_TIMESTAMP
+            WHERE id = ?
+            """,
+            (
+                status,
+                _dump_json(metadata) if metadata is not None else None,
+                human_value,
+                llm_decision,
+                job_id,
+            ),
+        )
 
-    cursor.execute(
-        f"""
-        UPDATE review_jobs
-        SET {', '.join(fields)}
-        WHERE id = ?
-        """,
-        params,
-    )
+async def aupdate_job_status(job_id: int, status: str, **kwargs):
+    """update_job_status의 비동기 버전 (워커 스레드에서 실행)"""
+    await asyncio.to_thread(update_job_status, job_id, status, **kwargs)
 
-    conn.commit()
-    conn.close()
 
 def update_job_feedback(job_id: int, feedback: str, skip: bool = False):
-    """작업에 피드백 저장 (메타데이터에 저장)"""
-    conn = sqlite3.connect(DB_PATH)
-    cursor = conn.cursor()
-
-    # 기존 metadata 가져오기
-    cursor.execute("SELECT metadata FROM review_jobs WHERE id = ?", (job_id,))
-    row = cursor.fetchone()
-
-    if row:
-        metadata = json.loads(row[0]) if row[0] else {}
-        metadata.setdefault("feedback_history", []).append({
-            "timestamp": datetime.utcnow().isoformat(),
-            "feedback": feedback,
-            "skip": bool(skip)
-        })
-
-        metadata["feedback"] = feedback
-        metadata["feedback_skip"] = bool(skip)
-
-        cursor.execute("""
+    """작업에 피드백 저장 (현재 피드백은 메타데이터, 이력은 hitl_feedback 테이블에 추가)"""
+    history_entry = _dump_json({
+        "timestamp": datetime.utcnow().isoformat(),
+        "feedback": feedback,
+        "skip": bool(skip)
+    })
+
+    with _write_lock, _get_conn() as conn:
+        cursor = conn.execute("""
             UPDATE review_jobs
-            SET metadata = ?, updated_at = CURRENT_TIMESTAMP
+            SET metadata = json_set(
+                    COALESCE(NULLIF(metadata, ''), '{}'),
+                    '$.feedback', ?,
+                    '$.feedback_skip', json(?)
+                ),
+                updated_at = CURRENT_TIMESTAMP
             WHERE id = ?
-        """, (json.dumps(metadata), job_id))
+        """, (feedback, "true" if skip else "false", job_id))
 
-        conn.commit()
+        if cursor.rowcount:
+            conn.execute("""
+                INSERT INTO hitl_feedback (job_id, agent_id, feedback_data)
+                VALUES (?, ?, ?)
+            """, (job_id, _HITL_FEEDBACK_AGENT, history_entry))
 
-    conn.close()
 
 def reset_feedback_state(job_id: int):
-    """HITL 피드백 상태 초기화"""
-    conn = sqlite3.connect(DB_PATH)
-    cursor = conn.cursor()
-
-    cursor.execute("SELECT metadata FROM review_jobs WHERE id = ?", (job_id,))
-    row = cursor.fetchone()
+    """HITL 피드백 상태 초기화 (피드백 키가 있을 때만 갱신)"""
+    with _write_lock, _get_conn() as conn:
+        conn.execute("""
+            UPDATE review_jobs
+            SET metadata = json_remove(metadata, '$.feedback', '$.feedback_skip'),
+                updated_at = CURRENT_TIMESTAMP
+            WHERE id = ?
+              AND NULLIF(metadata, '') IS NOT NULL
+              AND (json_type(metadata, '$.feedback') IS NOT NULL
+                   OR json_type(metadata, '$.feedback_skip') IS NOT NULL)
+        """, (job_id,))
+
+
+# HITL 피드백 비동기 기록 (큐에 쌓인 요청을 한 트랜잭션으로 일괄 INSERT)
+_FEEDBACK_BATCH_SIZE = 256
+_FEEDBACK_FLUSH_INTERVAL = 0.05  # 초
+
+_feedback_queue: queue.Queue = queue.Queue()
+_feedback_worker: threading.Thread | None = None
+_feedback_worker_lock = threading.Lock()
+
+
+def _ensure_feedback_worker():
+    global _feedback_worker
+    if _feedback_worker is None:
+        with _feedback_worker_lock:
+            if _feedback_worker is None:
+                _feedback_worker = threading.Thread(target=_feedback_writer, name="feedback-writer", daemon=True)
+                _feedback_worker.start()
+
+
+def _feedback_writer():
+    while True:
+        # 첫 항목 이후 최대 _FEEDBACK_FLUSH_INTERVAL 동안(또는 배치 크기까지) 수집
+        batch = [_feedback_queue.get()]
+        deadline = time.monotonic() + _FEEDBACK_FLUSH_INTERVAL
+        while len(batch) < _FEEDBACK_BATCH_SIZE:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                batch.append(_feedback_queue.get(timeout=remaining))
+            except queue.Empty:
+                break
+
+        try:
+            with _write_lock, _get_conn() as conn:
+                conn.executemany("""
+                    INSERT INTO hitl_feedback (job_id, agent_id, feedback_data)
+                    VALUES (?, ?, ?)
+                """, batch)
+        except Exception as e:
+            print(f"Failed to save {len(batch)} HITL feedback rows: {e}")
+        finally:
+            for _ in batch:
+                _feedback_queue.task_done()
 
-    if row:
-        metadata = json.loads(row[0]) if row[0] else {}
-        updated = False
 
-        if "feedback" in metadata:
-            metadata.pop("feedback", None)
-            updated = True
-        if "feedback_skip" in metadata:
-            metadata.pop("feedback_skip", None)
-            updated = True
+def save_feedback(job_id: int, agent_id: str, feedback_data: dict):
+    """HITL 피드백 저장 (백그라운드 스레드가 일괄 기록, 즉시 반환)"""
+    _ensure_feedback_worker()
+    _feedback_queue.put((job_id, agent_id, _dump_json(feedback_data)))
 
-        if updated:
-            cursor.execute("""
-                UPDATE review_jobs
-                SET metadata = ?, updated_at = CURRENT_TIMESTAMP
-                WHERE id = ?
-            """, (json.dumps(metadata), job_id))
-            conn.commit()
 
-    conn.close()
+def flush_feedback():
+    """대기 중인 HITL 피드백이 모두 기록될 때까지 대기 (종료 시 호출)"""
+    _feedback_queue.join()
 
-def save_feedback(job_id: int, agent_id: str, feedback_data: dict):
-    """HITL 피드백 저장"""
-    conn = sqlite3.connect(DB_PATH)
-    cursor = conn.cursor()
 
-    cursor.execute("""
-        INSERT INTO hitl_feedback (job_id, agent_id, feedback_data)
-        VALUES (?, ?, ?)
-    """, (job_id, agent_id, json.dumps(feedback_data)))
+def get_cached_llm_response(key: str, max_age_seconds: int) -> str | None:
+    """영속 LLM 캐시 조회 (max_age_seconds보다 오래된 응답은 무시)"""
+    row = _get_conn().execute(
+        "SELECT response FROM llm_cache WHERE key = ? AND created_at >= ?",
+        (key, int(time.time()) - max_age_seconds),
+    ).fetchone()
+    return row["response"] if row else None
 
-    conn.commit()
-    conn.close()
 
-def insert_sample_bp_cases():
-    """샘플 BP 사례 삽입 (개발/테스트용)"""
-    conn = sqlite3.connect(DB_PATH)
-    cursor = conn.cursor()
-
-    sample_cases = [
-        ("웨이퍼 수율 개선 AI 모델", "예측", "제조", "메모리", "FAB팀",
-         "웨이퍼 공정 중 수율이 85%로 낮음", "AI 예측 모델로 불량 패턴 조기 감지",
-         "딥러닝 기반 이미지 분석으로 수율 3% 향상", "실시간 모니터링 필수", "내부문서-2024-001"),
-        ("설계 검증 자동화 시스템", "분류", "설계", "S.LSI", "설계검증팀",
-         "설계 검증에 수작업으로 2주 소요", "자동화 도구로 검증 시간 단축",
-         "검증 시간 70% 단축 (2주→3일)", "초기 세팅 시간 확보 필요", "설계가이드-v2.3"),
-        ("IT 인프라 이상 감지", "이상 감지", "IT/DX", "메모리", "IT운영팀",
-         "서버 장애 발생 후 대응으로 다운타임 증가", "ML 기반 이상 징후 사전 감지",
-         "평균 다운타임 50% 감소", "오탐률 관리 중요", "IT운영매뉴얼-2024")
-    ]
+def put_cached_llm_response(key: str, response: str, max_age_seconds: int):
+    """영속 LLM 캐시 저장 (만료된 항목은 함께 정리)"""
+    now = int(time.time())
+    with _write_lock, _get_conn() as conn:
+        conn.execute("""
+            INSERT INTO llm_cache (key, response, created_at) VALUES (?, ?, ?)
+            ON CONFLICT (key) DO UPDATE SET response = excluded.response, created_at = excluded.created_at
+        """, (key, response, now))
+        conn.execute("DELETE FROM llm_cache WHERE created_at < ?", (now - max_age_seconds,))
 
-    cursor.executemany("""
-        INSERT INTO enterprise_bp_cases
-        (title, tech_type, business_domain, division, organization,
-         problem_as_was, solution_to_be, summary, tips, reference_docs)
-        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-    """, sample_cases)
 
-    conn.commit()
-    conn.close()
+def insert_sample_bp_cases():
+    """샘플 BP 사례 삽입 (개발/테스트용, 이미 사례가 있으면 건너뜀)"""
+    with _write_lock:
+        conn = _get_conn()
+        cursor = conn.cursor()
+
+        if cursor.execute("SELECT 1 FROM enterprise_bp_cases LIMIT 1").fetchone():
+            print("Sample BP cases already present, skipping")
+            return
+
+        sample_cases = [
+            ("웨이퍼 수율 개선 AI 모델", "예측", "제조", "메모리", "FAB팀",
+             "웨이퍼 공정 중 수율이 85%로 낮음", "AI 예측 모델로 불량 패턴 조기 감지",
+             "딥러닝 기반 이미지 분석으로 수율 3% 향상", "실시간 모니터링 필수", "내부문서-2024-001"),
+            ("설계 검증 자동화 시스템", "분류", "설계", "S.LSI", "설계검증팀",
+             "설계 검증에 수작업으로 2주 소요", "자동화 도구로 검증 시간 단축",
+             "검증 시간 70% 단축 (2주→3일)", "초기 세팅 시간 확보 필요", "설계가이드-v2.3"),
+            ("IT 인프라 이상 감지", "이상 감지", "IT/DX", "메모리", "IT운영팀",
+             "서버 장애 발생 후 대응으로 다운타임 증가", "ML 기반 이상 징후 사전 감지",
+             "평균 다운타임 50% 감소", "오탐률 관리 중요", "IT운영매뉴얼-2024")
+        ]
+
+        # 한 트랜잭션으로 일괄 삽입 (예외 시 롤백)
+        with conn:
+            cursor.executemany("""
+                INSERT INTO enterprise_bp_cases
+                (title, tech_type, business_domain, division, organization,
+                 problem_as_was, solution_to_be, summary, tips, reference_docs)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+            """, sample_cases)
     print(f"Inserted {len(sample_cases)} sample BP cases successfully")
 
 if __name__ == "__main__":
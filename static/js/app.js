@@ -296,69 +296,9 @@ function connectWebSocket(jobId) {
 
     wsConnection.onmessage = (event) => {
         const data = JSON.parse(event.data);
-        console.log('📨 메시지 수신:', data);
-
-        // 페이지별 진행 상황 업데이트
-        if (data.type === 'page_progress') {
-            console.log('📄 Page progress event received:', {
-                current_page: data.current_page,
-                total_pages: data.total_pages,
-                status: data.status,
-                page_title: data.page_title
-            });
-            updatePageProgress(data);
-            // currentPageInfo 업데이트
-            currentPageInfo.currentPage = data.current_page;
-            currentPageInfo.totalPages = data.total_pages;
-            // 전체 진행 상황도 업데이트 (단일 페이지일 때도 표시)
-            updateOverallProgress(currentPageInfo.currentPage, currentPageInfo.totalPages, currentPageInfo.agentName, currentPageInfo.agentMessage);
-        }
-
-        // 에이전트 상태 업데이트
-        if (data.agent) {
-            updateAgentStatus(data.agent, data.status);
-            // currentPageInfo에 에이전트 정보 저장
-            currentPageInfo.agentName = data.agent;
-            currentPageInfo.agentMessage = data.message || '';
-            if (data.message) {
-                updateProgressMessage(data.message);
-            }
-            // 에이전트 정보가 업데이트되면 전체 진행 상황도 업데이트
-            updateOverallProgress(currentPageInfo.currentPage, currentPageInfo.totalPages, currentPageInfo.agentName, currentPageInfo.agentMessage);
-        }
-
-        // BP 검색 결과 표시
-        if (data.bp_cases) {
-            showBPCases(data.bp_cases);
-        }
-
-        // HITL 인터럽트 처리
-        if (data.status === 'interrupt') {
-            if (data.job_id) {
-                activeFeedbackJobId = data.job_id;
-            }
-            showHITLSection(data.results);
-        }
-
-       // 페이지별 완료 (중간 결과)
-        if (data.status === 'page_completed' && data.page_report) {
-            console.log('📄 Page completed event received:', {
-                current_page: data.current_page,
-                total_pages: data.total_pages,
-                page_title: data.page_title,
-                page_id: data.page_id
-            });
-            appendPageResult(data);
-            // 전체 진행 상황 업데이트
-            currentPageInfo.currentPage = data.current_page;
-            currentPageInfo.totalPages = data.total_pages;
-            updateOverallProgress(currentPageInfo.currentPage, currentPageInfo.totalPages, currentPageInfo.agentName, currentPageInfo.agentMessage);
-        }
-
-       // 최종 완료 (report가 있을 때만)
-        if (data.status === 'completed' && data.report) {
-            showFinalResults(data.report, data.decision, data.decision_reason, data.decisions);
-        }
+        // 서버 송신 큐에 밀린 메시지는 {"batch": [...]} 하나로 묶여 오므로 순서대로 처리
+        const messages = data.batch || [data];
+        messages.forEach(handleWsMessage);
     };
 
     wsConnection.onerror = (error) => {
@@ -369,12 +309,133 @@ function connectWebSocket(jobId) {
         console.log('🔌 WebSocket 연결 종료');
     };
 
-    // Keep-alive ping (10초마다)
-    setInterval(() => {
-        if (wsConnection && wsConnection.readyState === WebSocket.OPEN) {
-            wsConnection.send('ping');
+    // 연결 유지는 서버의 프로토콜 레벨 ping(WS_PING_INTERVAL)으로 처리
+}
+
+// WebSocket 메시지 1건 처리
+function handleWsMessage(data) {
+    // LLM 스트리밍 토큰 (생성 중인 텍스트 미리보기)
+    if (data.type === 'token') {
+        appendStreamToken(data.data, data.agent);
+        return;
+    }
+
+    console.log('📨 메시지 수신:', data);
+
+    // 페이지별 진행 상황 업데이트
+    if (data.type === 'page_progress') {
+        console.log('📄 Page progress event received:', {
+            current_page: data.current_page,
+            total_pages: data.total_pages,
+            status: data.status,
+            page_title: data.page_title
+        });
+        updatePageProgress(data);
+        // currentPageInfo 업데이트
+        currentPageInfo.currentPage = data.current_page;
+        currentPageInfo.totalPages = data.total_pages;
+        // 전체 진행 상황도 업데이트 (단일 페이지일 때도 표시)
+        updateOverallProgress(currentPageInfo.currentPage, currentPageInfo.totalPages, currentPageInfo.agentName, currentPageInfo.agentMessage);
+    }
+
+    // 에이전트 상태 업데이트
+    if (data.agent) {
+        updateAgentStatus(data.agent, data.status);
+        if (data.status === 'completed') {
+            clearStreamPreview(data.agent);
+        }
+        // currentPageInfo에 에이전트 정보 저장
+        currentPageInfo.agentName = data.agent;
+        currentPageInfo.agentMessage = data.message || '';
+        if (data.message) {
+            updateProgressMessage(data.message);
+        }
+        // 에이전트 정보가 업데이트되면 전체 진행 상황도 업데이트
+        updateOverallProgress(currentPageInfo.currentPage, currentPageInfo.totalPages, currentPageInfo.agentName, currentPageInfo.agentMessage);
+    }
+
+    // BP 검색 결과 표시
+    if (data.bp_cases) {
+        showBPCases(data.bp_cases);
+    }
+
+    // HITL 인터럽트 처리
+    if (data.status === 'interrupt') {
+        if (data.job_id) {
+            activeFeedbackJobId = data.job_id;
         }
-    }, 10000);
+        showHITLSection(data.results);
+    }
+
+   // 페이지별 완료 (중간 결과)
+    if (data.status === 'page_completed' && data.page_report) {
+        console.log('📄 Page completed event received:', {
+            current_page: data.current_page,
+            total_pages: data.total_pages,
+            page_title: data.page_title,
+            page_id: data.page_id
+        });
+        appendPageResult(data);
+        // 전체 진행 상황 업데이트
+        currentPageInfo.currentPage = data.current_page;
+        currentPageInfo.totalPages = data.total_pages;
+        updateOverallProgress(currentPageInfo.currentPage, currentPageInfo.totalPages, currentPageInfo.agentName, currentPageInfo.agentMessage);
+    }
+
+   // 최종 완료 (report가 있을 때만)
+    if (data.status === 'completed' && data.report) {
+        showFinalResults(data.report, data.decision, data.decision_reason, data.decisions);
+    }
+}
+
+// 에이전트별 스트리밍 텍스트 (진행 메시지가 갱신되어 미리보기가 지워져도 복원)
+const streamBuffers = {};
+
+// 스트리밍 토큰을 진행 메시지 영역의 에이전트별 미리보기에 이어 붙임
+function appendStreamToken(token, agent) {
+    const progressMessage = document.getElementById('progress-message');
+    if (!progressMessage || !token) return;
+
+    const key = agent || 'LLM';
+    streamBuffers[key] = (streamBuffers[key] || '') + token;
+
+    let preview = progressMessage.querySelector(`.stream-preview[data-agent="${key}"]`);
+    if (!preview) {
+        preview = document.createElement('div');
+        preview.className = 'stream-preview';
+        preview.dataset.agent = key;
+        preview.style.marginTop = '15px';
+        preview.style.padding = '10px';
+        preview.style.whiteSpace = 'pre-wrap';
+        preview.style.maxHeight = '300px';
+        preview.style.overflowY = 'auto';
+        preview.style.background = '#f8f9fa';
+        preview.style.borderLeft = '4px solid #2196F3';
+        preview.style.borderRadius = '4px';
+
+        // 여러 에이전트가 동시에 스트리밍하므로 에이전트 이름 표시
+        const label = document.createElement('div');
+        label.textContent = key;
+        label.style.fontWeight = 'bold';
+        label.style.marginBottom = '5px';
+        const text = document.createElement('div');
+        text.className = 'stream-preview-text';
+        text.textContent = streamBuffers[key];
+        preview.appendChild(label);
+        preview.appendChild(text);
+        progressMessage.appendChild(preview);
+    } else {
+        preview.querySelector('.stream-preview-text').textContent += token;
+    }
+    preview.scrollTop = preview.scrollHeight;
+}
+
+// 에이전트 완료 시 해당 스트리밍 미리보기 제거
+function clearStreamPreview(agent) {
+    delete streamBuffers[agent];
+    const progressMessage = document.getElementById('progress-message');
+    const preview = progressMessage && progressMessage.querySelector(`.stream-preview[data-agent="${agent}"]`);
+    if (preview) preview.remove();
 }
 
 // 에이전트 상태 업데이트
@@ -414,6 +475,10 @@ function resetAgentStatuses() {
         if (progressStatus) {
             progressStatus.textContent = '';
         }
+        const preview = progressMessage.querySelector('.stream-preview');
+        if (preview) {
+            preview.remove();
+        }
     }
 }
 
@@ -545,7 +610,7 @@ function showHITLSection(results) {
             </div>
             <p style="color: #666; font-size: 0.9em; margin-top: 10px;">
                 ℹ️ Agent 2 (Objective Reviewer)의 분석이 완료되었습니다.
-                아래 제안된 피드백을 검토하고 수정하여 제출하거나 건너뛰어 다음 단계로 진행하세요.
+                피드백을 작성(필요하면 AI 제안 보기 활용)하여 제출하거나 건너뛰어 다음 단계로 진행하세요.
             </p>
         `;
     } else if (results.data_analysis) {
@@ -557,7 +622,7 @@ function showHITLSection(results) {
             </div>
             <p style="color: #666; font-size: 0.9em; margin-top: 10px;">
                 ℹ️ Agent 3 (Data Analyzer)의 분석이 완료되었습니다.
-                아래 제안된 피드백을 검토하고 수정하여 제출하거나 건너뛰어 다음 단계로 진행하세요.
+                피드백을 작성(필요하면 AI 제안 보기 활용)하여 제출하거나 건너뛰어 다음 단계로 진행하세요.
             </p>
         `;
     } else if (results.risk_analysis) {
@@ -569,7 +634,7 @@ function showHITLSection(results) {
             </div>
             <p style="color: #666; font-size: 0.9em; margin-top: 10px;">
                 ℹ️ Agent 4 (Risk Analyzer)의 분석이 완료되었습니다.
-                아래 제안된 피드백을 검토하고 수정하여 제출하거나 건너뛰어 다음 단계로 진행하세요.
+                피드백을 작성(필요하면 AI 제안 보기 활용)하여 제출하거나 건너뛰어 다음 단계로 진행하세요.
             </p>
         `;
     } else if (results.roi_estimation) {
@@ -581,7 +646,7 @@ function showHITLSection(results) {
             </div>
             <p style="color: #666; font-size: 0.9em; margin-top: 10px;">
                 ℹ️ Agent 5 (ROI Estimator)의 분석이 완료되었습니다.
-                아래 제안된 피드백을 검토하고 수정하여 제출하거나 건너뛰어 다음 단계로 진행하세요.
+                피드백을 작성(필요하면 AI 제안 보기 활용)하여 제출하거나 건너뛰어 다음 단계로 진행하세요.
             </p>
         `;
     } else if (results.final_recommendation) {
@@ -593,21 +658,45 @@ function showHITLSection(results) {
             </div>
             <p style="color: #666; font-size: 0.9em; margin-top: 10px;">
                 ℹ️ Agent 6 (Final Generator)의 최종 의견이 완료되었습니다.
-                아래 제안된 피드백을 검토하고 수정하여 제출하거나 건너뛰어 다음 단계로 진행하세요.
+                피드백을 작성(필요하면 AI 제안 보기 활용)하여 제출하거나 건너뛰어 다음 단계로 진행하세요.
             </p>
         `;
     }
 
     resultsDiv.innerHTML = html;
 
-    // 피드백 제안을 textarea에 미리 채우기
+    // 피드백 제안은 "AI 제안 보기"를 누른 경우에만 생성
     if (results.feedback_suggestion) {
         feedbackTextarea.value = results.feedback_suggestion;
     } else {
         feedbackTextarea.value = '';
     }
+    const suggestBtn = document.getElementById('suggest-feedback-btn');
+    suggestBtn.style.display = results.suggestion_pending ? 'inline-block' : 'none';
+    suggestBtn.disabled = false;
 }
 
+// AI 피드백 제안 요청
+document.getElementById('suggest-feedback-btn').addEventListener('click', async (event) => {
+    const suggestBtn = event.currentTarget;
+    const feedbackTextarea = document.getElementById('feedback-input');
+    const targetJobId = activeFeedbackJobId || currentJobId;
+
+    suggestBtn.disabled = true;
+    try {
+        const response = await fetch(`/api/v1/review/suggest/${targetJobId}`, { method: 'POST' });
+        const result = await response.json();
+        if (!response.ok) {
+            throw new Error(result.error || response.statusText);
+        }
+        feedbackTextarea.value = result.feedback_suggestion;
+        console.log('💡 피드백 제안 수신');
+    } catch (error) {
+        console.error('❌ Suggestion error:', error);
+        suggestBtn.disabled = false;
+    }
+});
+
 // 피드백 제출
 document.getElementById('submit-feedback-btn').addEventListener('click', async () => {
     const feedback = document.getElementById('feedback-input').value;
@@ -109,6 +109,7 @@ async function fetchJobs() {
     const params = new URLSearchParams();
     params.set('limit', String(state.limit));
     params.set('offset', String(state.offset));
+    params.set('summary', 'true');
     if (state.filters.status) params.set('status', state.filters.status);
     if (state.filters.humanDecision) params.set('decision', state.filters.humanDecision);
     if (state.filters.llmDecision) params.set('llm_decision', state.filters.llmDecision);
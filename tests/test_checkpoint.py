@@ -0,0 +1,106 @@
+# tests/test_checkpoint.py - 작업별 LLM 체크포인트 테스트
+import asyncio
+
+import pytest
+
+from core import checkpoint
+from core.checkpoint import LLMCheckpoint, checkpointed, checkpointed_stream
+from core.llm import LLMStreamFailure
+
+
+@pytest.fixture(autouse=True)
+def checkpoint_dir(tmp_path, monkeypatch):
+    """체크포인트를 켜고 임시 디렉터리에 기록"""
+    monkeypatch.setattr(checkpoint, "LLM_CHECKPOINT_ENABLED", True)
+    monkeypatch.setattr(checkpoint, "LLM_CHECKPOINT_DIR", tmp_path)
+    monkeypatch.setattr(checkpoint, "_job_checkpoints", {})
+    return tmp_path
+
+
+def _fake_llm(responses: list[str]):
+    calls = []
+
+    def call(prompt, model="m", enable_sequential_thinking=False, use_context7=False,
+             system_prompt=None, task="generate"):
+        calls.append((prompt, task))
+        return responses[len(calls) - 1]
+
+    return call, calls
+
+
+def test_put_get_survives_reload(checkpoint_dir):
+    """기록한 응답을 새 인스턴스(재시작)에서도 읽고, 잘린 마지막 줄은 무시하는지 테스트"""
+    path = checkpoint_dir / "1.jsonl"
+    store = LLMCheckpoint(path)
+    key = store.make_key(1, "", "프롬프트")
+    store.put(key, "응답", job_id=1)
+    with path.open("ab") as f:
+        f.write(b'{"key": "trunc')
+
+    reloaded = LLMCheckpoint(path)
+    assert reloaded.get(key) == "응답"
+    assert reloaded.get(store.make_key(1, "", "다른 프롬프트")) is None
+    assert len(reloaded) == 1
+
+
+def test_checkpointed_reuses_saved_response():
+    """같은 job/프롬프트/옵션이면 저장된 응답을 재사용하고 옵션이 다르면 새로 호출하는지 테스트"""
+    call, calls = _fake_llm(["첫 응답", "분류 응답"])
+    job_call = checkpointed(call, 7)
+
+    assert job_call("p") == "첫 응답"
+    assert job_call("p", model="m") == "첫 응답"
+    assert job_call("p", task="classify") == "분류 응답"
+    assert calls == [("p", "generate"), ("p", "classify")]
+
+    # 재시작 후 새로 감싼 함수도 파일에서 응답을 찾음
+    checkpoint._job_checkpoints.clear()
+    assert checkpointed(call, 7)("p") == "첫 응답"
+    assert len(calls) == 2
+
+
+def test_checkpointed_skips_failures():
+    """실패 응답은 저장하지 않아 다음 호출에서 다시 시도하는지 테스트"""
+    call, calls = _fake_llm(["AI 응답 생성 실패: timeout", "정상 응답"])
+    job_call = checkpointed(call, 8)
+
+    assert job_call("p").startswith("AI 응답 생성 실패")
+    assert job_call("p") == "정상 응답"
+    assert job_call("p") == "정상 응답"
+    assert len(calls) == 2
+
+
+def test_checkpointed_stream_skips_partial_failure():
+    """스트리밍 도중 실패하면 부분 응답을 저장하지 않고, 성공한 스트림은 한 번에 재생하는지 테스트"""
+    attempts = []
+
+    async def astream(prompt, system_prompt=None):
+        attempts.append(prompt)
+        yield "부분 "
+        if len(attempts) == 1:
+            yield LLMStreamFailure("AI 응답 생성 실패: disconnected")
+            return
+        yield "응답"
+
+    async def collect():
+        job_stream = checkpointed_stream(astream, 9)
+        return [[chunk async for chunk in job_stream("p")] for _ in range(3)]
+
+    failed, streamed, replayed = asyncio.run(collect())
+
+    assert failed == ["부분 ", "AI 응답 생성 실패: disconnected"]
+    assert streamed == ["부분 ", "응답"]
+    assert replayed == ["부분 응답"]
+    assert len(attempts) == 2
+
+
+def test_discard_checkpoint_removes_file(checkpoint_dir):
+    """작업이 끝나면 job의 체크포인트 파일이 삭제되는지 테스트"""
+    call, _ = _fake_llm(["응답"])
+    checkpointed(call, 10)("p")
+    assert (checkpoint_dir / "10.jsonl").exists()
+
+    checkpoint.discard_checkpoint(10)
+
+    assert not (checkpoint_dir / "10.jsonl").exists()
+    assert len(checkpoint.get_job_checkpoint(10)) == 0
@@ -0,0 +1,214 @@
+# tests/test_db.py - SQLite 스키마 마이그레이션 / 검색 / 집계 / 페이지 조회 테스트
+import sqlite3
+
+import orjson
+import pytest
+
+from database import db
+
+
+# 스키마 버전 도입 이전(user_version = 0) 설치본의 테이블 구조
+_BASELINE_SCHEMA = """
+    CREATE TABLE review_jobs (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        status TEXT NOT NULL,
+        user_id TEXT,
+        proposal_content TEXT,
+        domain TEXT,
+        division TEXT,
+        created_at DATETIME DEFAULT CURRENT_TIMESTAMP,
+        updated_at DATETIME DEFAULT CURRENT_TIMESTAMP,
+        metadata TEXT,
+        decision TEXT DEFAULT 'pending',
+        title TEXT
+    );
+    CREATE TABLE hitl_feedback (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        job_id INTEGER,
+        agent_id TEXT NOT NULL,
+        feedback_data TEXT,
+        timestamp DATETIME DEFAULT CURRENT_TIMESTAMP,
+        FOREIGN KEY (job_id) REFERENCES review_jobs(id)
+    );
+"""
+
+
+@pytest.fixture
+def db_path(tmp_path, monkeypatch):
+    """테스트마다 임시 파일 DB로 공유 커넥션을 새로 생성"""
+    db.flush_feedback()
+    path = tmp_path / "review.db"
+    monkeypatch.setattr(db, "DB_PATH", path)
+    monkeypatch.setattr(db, "_conn", None)
+    monkeypatch.setattr(db, "_fts_enabled", None)
+    yield path
+    db.flush_feedback()
+    if db._conn is not None:
+        db._conn.close()
+
+
+@pytest.fixture
+def fresh_db(db_path):
+    db.init_database()
+    return db_path
+
+
+def _create_baseline_db(path):
+    conn = sqlite3.connect(path)
+    conn.executescript(_BASELINE_SCHEMA)
+    history = [{"timestamp": "2024-01-01T00:00:00", "feedback": "첫 피드백", "skip": False},
+               {"timestamp": "2024-01-02T00:00:00", "feedback": "두 번째", "skip": True}]
+    conn.executemany(
+        "INSERT INTO review_jobs (status, proposal_content, domain, division, metadata, decision, title) "
+        "VALUES (?, ?, ?, ?, ?, ?, ?)",
+        [
+            ("completed", "웨이퍼 공정 수율 개선 제안", "제조", "메모리",
+             orjson.dumps({"feedback_history": history, "report": "r"}).decode(), "approved", "웨이퍼 수율 개선"),
+            ("pending", "설계 검증 자동화 제안", "설계", "S.LSI", "", "pending", None),
+            ("error", "IT 인프라 이상 감지", "IT/DX", "메모리", "not json", "rejected", "이상 감지"),
+        ],
+    )
+    conn.commit()
+    conn.close()
+
+
+def _ids(jobs) -> list[int]:
+    return [job["id"] for job in jobs]
+
+
+def test_migrates_baseline_schema_db(db_path):
+    """스키마 버전이 없는 기존 DB를 최신 스키마로 옮기고 기존 데이터를 보존하는지 테스트"""
+    _create_baseline_db(db_path)
+
+    db.init_database()
+
+    conn = db._get_conn()
+    assert conn.execute("PRAGMA user_version").fetchone()[0] == db.SCHEMA_VERSION
+    columns = {row[1] for row in conn.execute("PRAGMA table_info(review_jobs)")}
+    assert set(db._REVIEW_JOB_COLUMNS) <= columns
+
+    # 새로 추가된 llm_decision은 기존 결정값으로 채움 (3번은 metadata가 JSON이 아니어도 마이그레이션 진행)
+    rows = conn.execute("SELECT llm_decision FROM review_jobs ORDER BY id").fetchall()
+    assert [row[0] for row in rows] == ["approved", "pending", "rejected"]
+    jobs = db.get_jobs([1, 2])
+    assert jobs[2]["input_method"] == "text"
+
+    # metadata.feedback_history는 hitl_feedback 테이블로 이전
+    assert [entry["feedback"] for entry in jobs[1]["feedback_history"]] == ["첫 피드백", "두 번째"]
+    assert "feedback_history" not in jobs[1]["metadata"]
+    assert jobs[1]["metadata"]["report"] == "r"
+
+    # 기존 행도 집계/검색 대상
+    assert db.count_jobs() == 3
+    assert db.count_jobs(status="completed") == 1
+    assert db.count_jobs(llm_decision="rejected") == 1
+    assert _ids(db.list_jobs(search="수율 개선")) == [1]
+    assert _ids(db.list_jobs(search="설계 검증")) == [2]
+
+
+def test_init_database_is_idempotent(db_path):
+    """이미 최신 스키마인 DB에서 다시 초기화해도 데이터/집계가 바뀌지 않는지 테스트"""
+    _create_baseline_db(db_path)
+    db.init_database()
+    db.init_database()
+
+    assert db.count_jobs() == 3
+    assert len(db.get_job(1)["feedback_history"]) == 2
+
+
+def test_search_follows_title_and_content_changes(fresh_db):
+    """검색 인덱스가 삽입/수정/삭제를 따라가고 짧은 검색어도 처리하는지 테스트"""
+    first = db.create_job("딥러닝 기반 불량 검출", "제조", "메모리", title="불량 검출 AI")
+    second = db.create_job("챗봇 도입 제안", "IT/DX", "메모리", title="사내 챗봇")
+
+    assert _ids(db.list_jobs(search="불량 검출")) == [first]
+    assert _ids(db.list_jobs(search="AI")) == [first]  # 3글자 미만은 LIKE 검색
+    assert db.count_jobs(search="챗봇") == 1
+
+    db.update_job_record(first, title="수율 예측 모델")
+    assert _ids(db.list_jobs(search="수율 예측")) == [first]
+    assert _ids(db.list_jobs(search="불량 검출 AI")) == []
+
+    db.delete_job(second)
+    assert db.list_jobs(search="챗봇 도입") == []
+
+
+def test_job_counts_match_table(fresh_db):
+    """트리거로 유지되는 job_counts 집계가 실제 행 수와 일치하는지 테스트"""
+    ids = [db.create_job(f"제안 {i}", "제조", "메모리", input_method="text" if i % 2 else "file") for i in range(6)]
+    db.update_job_status(ids[0], "completed", decision="approved", llm_decision="approved")
+    db.update_job_status(ids[1], "completed", llm_decision="rejected")
+    db.update_job_record(ids[2], status="error", human_decision="rejected")
+    db.delete_job(ids[3])
+
+    conn = db._get_conn()
+    filters = [
+        {},
+        {"status": "completed"},
+        {"status": "pending"},
+        {"decision": "approved"},
+        {"llm_decision": "rejected"},
+        {"input_method": "file"},
+        {"status": "completed", "llm_decision": "approved"},
+    ]
+    for job_filter in filters:
+        where = " AND ".join(f"{column} = ?" for column in job_filter) or "1 = 1"
+        expected = conn.execute(f"SELECT COUNT(*) FROM review_jobs WHERE {where}", list(job_filter.values())).fetchone()[0]
+        assert db.count_jobs(**job_filter) == expected, job_filter
+
+
+def test_cursor_pages_match_offset_order(fresh_db):
+    """키셋 페이지 조회가 같은 시각의 작업까지 빠짐/중복 없이 순서대로 반환하는지 테스트"""
+    for i in range(8):
+        db.create_job(f"제안 {i}", "제조", "메모리")
+    conn = db._get_conn()
+    with conn:
+        conn.execute("UPDATE review_jobs SET created_at = '2026-01-01 00:00:00' WHERE id <= 5")
+
+    for order in ("desc", "asc"):
+        expected = _ids(db.list_jobs(limit=100, order=order, summary=True))
+        paged = []
+        page = db.list_jobs(limit=3, order=order, summary=True)
+        while page:
+            paged.extend(_ids(page))
+            last = page[-1]
+            page = db.list_jobs(limit=3, order=order, summary=True,
+                                cursor_created_at=last["created_at"], cursor_id=last["id"])
+        assert paged == expected
+
+
+def test_feedback_writer_batches_in_order(fresh_db):
+    """큐에 쌓인 HITL 피드백이 flush 후 빠짐없이 요청 순서대로 기록되는지 테스트"""
+    job_id = db.create_job("제안", "제조", "메모리")
+    for i in range(300):
+        db.save_feedback(job_id, "agent_2", {"n": i})
+    db.flush_feedback()
+
+    rows = db._get_conn().execute(
+        "SELECT feedback_data FROM hitl_feedback WHERE job_id = ? AND agent_id = 'agent_2' ORDER BY id", (job_id,)
+    ).fetchall()
+    assert [orjson.loads(row[0])["n"] for row in rows] == list(range(300))
+
+
+def test_update_job_feedback_appends_history(fresh_db):
+    """update_job_feedback이 현재 피드백과 이력을 함께 기록하는지 테스트"""
+    job_id = db.create_job("제안", "제조", "메모리")
+    db.update_job_feedback(job_id, "보완 필요")
+    db.update_job_feedback(job_id, "", skip=True)
+
+    job = db.get_job(job_id)
+    assert job["feedback"] == ""
+    assert job["feedback_skip"] is True
+    assert [entry["feedback"] for entry in job["feedback_history"]] == ["보완 필요", ""]
+
+    db.reset_feedback_state(job_id)
+    assert "feedback" not in db.get_job(job_id)["metadata"]
+
+
+def test_persistent_llm_cache_expiry(fresh_db):
+    """영속 LLM 캐시가 저장값을 반환하고 만료된 항목은 무시하는지 테스트"""
+    db.put_cached_llm_response("k", "응답", 3600)
+
+    assert db.get_cached_llm_response("k", 3600) == "응답"
+    assert db.get_cached_llm_response("k", -1) is None
+    assert db.get_cached_llm_response("missing", 3600) is None
@@ -0,0 +1,57 @@
+# tests/test_llm_cache.py - LLM 응답 캐시 (LRU + TTL) 테스트
+import pytest
+
+from core import llm
+
+
+@pytest.fixture(autouse=True)
+def memory_cache(monkeypatch):
+    """영속 캐시 없이 빈 메모리 캐시로 시작"""
+    monkeypatch.setattr(llm, "LLM_CACHE_ENABLED", True)
+    monkeypatch.setattr(llm, "LLM_CACHE_PERSIST", False)
+    monkeypatch.setattr(llm, "LLM_CACHE_TTL", 3600)
+    monkeypatch.setattr(llm, "LLM_CACHE_MAXSIZE", 2)
+    llm._response_cache.clear()
+    yield
+    llm._response_cache.clear()
+
+
+def test_cache_key_ignores_whitespace_but_not_options(monkeypatch):
+    """공백 차이는 같은 키, 시스템 프롬프트/tool 옵션/작업별 모델이 다르면 다른 키인지 테스트"""
+    monkeypatch.setattr(llm, "LLM_PROVIDER", "ollama")
+    monkeypatch.setattr(llm, "OLLAMA_LIGHT_MODEL", "light-model")
+    key = llm._cache_key("검토  해줘\n", False, False, "제안서")
+
+    assert llm._cache_key(" 검토 해줘", False, False, "제안서 ") == key
+    assert llm._cache_key("검토 해줘", False, False, "다른 제안서") != key
+    assert llm._cache_key("검토 해줘", True, False, "제안서") != key
+    assert llm._cache_key("검토 해줘", False, False, "제안서", task="classify") != key
+
+
+def test_lru_evicts_least_recently_used():
+    """최대 크기를 넘으면 가장 오래 사용하지 않은 항목부터 제거하는지 테스트"""
+    llm._cache_put("a", "A")
+    llm._cache_put("b", "B")
+    assert llm._cache_get("a") == "A"  # a를 최근 사용으로 갱신
+
+    llm._cache_put("c", "C")
+
+    assert llm._cache_get("b") is None
+    assert llm._cache_get("a") == "A"
+    assert llm._cache_get("c") == "C"
+
+
+def test_expired_entries_are_dropped(monkeypatch):
+    """TTL이 지난 항목은 반환하지 않고 캐시에서 제거하는지 테스트"""
+    monkeypatch.setattr(llm, "LLM_CACHE_TTL", -1)
+    llm._cache_put("a", "A")
+
+    assert llm._cache_get("a") is None
+    assert "a" not in llm._response_cache
+
+
+def test_empty_responses_not_cached():
+    """빈 응답은 캐시하지 않는지 테스트"""
+    llm._cache_put("a", "")
+
+    assert llm._cache_get("a") is None
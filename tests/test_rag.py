@@ -0,0 +1,57 @@
+# tests/test_rag.py - BP 사례 RAG 응답 디코딩 테스트
+import asyncio
+from types import SimpleNamespace
+
+import orjson
+
+from core import rag
+
+
+def _fake_response(body: dict, status_code: int = 200):
+    return SimpleNamespace(status_code=status_code, content=orjson.dumps(body), text="")
+
+
+def _run_bp_search(monkeypatch, body: dict) -> list:
+    async def fake_post(query_text, num_result_doc, retrieval_method):
+        return _fake_response(body)
+
+    monkeypatch.setattr(rag, "_apost_rag", fake_post)
+    return asyncio.run(rag.rag_retrieve_bp_cases("제조", "메모리")).get("cases", [])
+
+
+def test_bp_cases_mapped_from_hits(monkeypatch):
+    """hit의 _source 필드가 BP 사례로 변환되고 없는 필드는 기본값/도메인으로 채워지는지 테스트"""
+    body = {"hits": {"hits": [
+        {"_id": "1", "_source": {"title": "사례 A", "content": "본문" * 100, "link": "https://wiki/a"}},
+    ]}}
+
+    cases = _run_bp_search(monkeypatch, body)
+
+    assert len(cases) == 1
+    case = cases[0]
+    assert case["title"] == "사례 A"
+    assert case["tech_type"] == "AI/ML"
+    assert case["business_domain"] == "제조"
+    assert case["division"] == "메모리"
+    assert case["problem_as_was"] == ("본문" * 100)[:100]
+    assert case["link"] == "https://wiki/a"
+
+
+def test_malformed_hit_skipped_without_dropping_others(monkeypatch):
+    """한 hit의 필드 타입이 스키마와 달라도 나머지 실제 hit는 그대로 반환되는지 테스트"""
+    body = {"hits": {"hits": [
+        {"_id": "1", "_source": {"title": "정상 사례 1"}},
+        {"_id": "2", "_source": {"title": "잘못된 사례", "tips": ["x"]}},
+        {"_id": "3", "_source": {"title": "정상 사례 2", "unknown_field": {"nested": 1}}},
+    ]}}
+
+    cases = _run_bp_search(monkeypatch, body)
+
+    assert [case["title"] for case in cases] == ["정상 사례 1", "정상 사례 2"]
+
+
+def test_dummy_cases_when_no_hits(monkeypatch):
+    """검색 결과가 없을 때만 더미 사례로 대체되는지 테스트"""
+    cases = _run_bp_search(monkeypatch, {"hits": {"hits": []}})
+
+    assert cases == rag.get_dummy_bp_cases("제조", "메모리")
@@ -0,0 +1,73 @@
+# tests/test_websocket.py - WebSocket 송신 큐 테스트
+import asyncio
+
+import orjson
+from starlette.websockets import WebSocketState
+
+from core.websocket import SendQueue
+
+
+class _FakeWebSocket:
+    """send_text가 release될 때까지 멈추는 가짜 연결 (전송 중 메시지가 쌓이는 상황 재현)"""
+
+    def __init__(self):
+        self.client_state = WebSocketState.CONNECTED
+        self.application_state = WebSocketState.CONNECTED
+        self.frames: list = []
+        self.release = asyncio.Event()
+
+    async def send_text(self, text: str):
+        self.frames.append(orjson.loads(text))
+        await self.release.wait()
+        self.release.clear()
+
+
+async def _drain(websocket: _FakeWebSocket, frames: int):
+    while len(websocket.frames) < frames:
+        await asyncio.sleep(0)
+    websocket.release.set()
+
+
+def test_send_queue_batches_and_merges_tokens():
+    """전송 중 쌓인 메시지는 순서대로 한 프레임에 묶고, 같은 에이전트의 연속 토큰만 합치는지 테스트"""
+    async def scenario():
+        websocket = _FakeWebSocket()
+        send_queue = SendQueue(websocket)
+
+        send_queue.send({"status": "processing", "agent": "A"})
+        await _drain(websocket, 1)  # 첫 메시지는 바로 전송 시작
+
+        for message in (
+            {"type": "token", "agent": "A", "data": "안"},
+            {"type": "token", "agent": "A", "data": "녕"},
+            {"type": "token", "agent": "B", "data": "x"},
+            {"status": "completed", "agent": "A"},
+            {"type": "token", "agent": "A", "data": "!"},
+        ):
+            assert send_queue.send(message)
+        await _drain(websocket, 2)
+        send_queue.close()
+        return websocket.frames
+
+    frames = asyncio.run(scenario())
+
+    assert frames[0] == {"status": "processing", "agent": "A"}
+    assert frames[1] == {"batch": [
+        {"type": "token", "agent": "A", "data": "안녕"},
+        {"type": "token", "agent": "B", "data": "x"},
+        {"status": "completed", "agent": "A"},
+        {"type": "token", "agent": "A", "data": "!"},
+    ]}
+
+
+def test_send_queue_rejects_closed_connection():
+    """닫힌 연결에는 메시지를 큐에 넣지 않고 False를 반환하는지 테스트"""
+    async def scenario():
+        websocket = _FakeWebSocket()
+        send_queue = SendQueue(websocket)
+        websocket.client_state = WebSocketState.DISCONNECTED
+        accepted = send_queue.send({"status": "processing"})
+        send_queue.close()
+        return accepted, websocket.frames
+
+    assert asyncio.run(scenario()) == (False, [])
@@ -1,9 +1,11 @@
 """Utility functions"""
 from .text import _extract_json_dict, _truncate_for_prompt, _generate_title_sync, generate_job_title
+from .tasks import spawn_background
 
 __all__ = [
     "_extract_json_dict",
     "_truncate_for_prompt",
     "_generate_title_sync",
     "generate_job_title",
+    "spawn_background",
 ]
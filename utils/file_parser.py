@@ -1,15 +1,51 @@
 # utils/file_parser.py - 파일 파싱 유틸리티
+import codecs
 import io
-from typing import Optional, List, Tuple
+from typing import Optional, List, Tuple, BinaryIO, Union
 from utils.internal_vlm import internal_vlm_client
 
 
-def extract_text_and_images_from_file(file_content: bytes, filename: str) -> Tuple[str, List[bytes]]:
+# 파일 객체에서 텍스트를 디코딩할 때 한 번에 읽는 크기
+_DECODE_CHUNK_SIZE = 64 * 1024
+
+FileContent = Union[bytes, BinaryIO]
+
+
+def _as_stream(file_content: FileContent) -> BinaryIO:
+    """bytes 또는 파일 객체를 처음 위치의 파일 객체로 반환 (업로드 파일은 복사하지 않음)"""
+    if isinstance(file_content, (bytes, bytearray)):
+        return io.BytesIO(file_content)
+    file_content.seek(0)
+    return file_content
+
+
+def _read_bytes(file_content: FileContent) -> bytes:
+    """전체 바이트가 필요한 라이브러리용 (PyMuPDF stream 등)"""
+    if isinstance(file_content, (bytes, bytearray)):
+        return file_content
+    return _as_stream(file_content).read()
+
+
+def _decode_text(file_content: FileContent) -> str:
+    """UTF-8 텍스트 디코딩 (파일 객체는 청크 단위로 읽어 bytes 전체를 메모리에 올리지 않음)"""
+    if isinstance(file_content, (bytes, bytearray)):
+        return file_content.decode('utf-8', errors='ignore')
+
+    stream = _as_stream(file_content)
+    decoder = codecs.getincrementaldecoder('utf-8')(errors='ignore')
+    parts = []
+    while chunk := stream.read(_DECODE_CHUNK_SIZE):
+        parts.append(decoder.decode(chunk))
+    parts.append(decoder.decode(b'', final=True))
+    return ''.join(parts)
+
+
+def extract_text_and_images_from_file(file_content: FileContent, filename: str) -> Tuple[str, List[bytes]]:
     """
     파일에서 텍스트와 이미지 추출
 
     Args:
-        file_content: 파일 바이너리 내용
+        file_content: 파일 바이너리 내용 또는 파일 객체 (업로드 임시 파일 등)
         filename: 파일명 (확장자 확인용)
 
     Returns:
@@ -25,7 +61,7 @@ def extract_text_and_images_from_file(file_content: bytes, filename: str) -> Tup
             import fitz  # PyMuPDF
 
             # 텍스트 추출 (PyPDF2)
-            pdf_file = io.BytesIO(file_content)
+            pdf_file = _as_stream(file_content)
             pdf_reader = PyPDF2.PdfReader(pdf_file)
             text_parts = []
             for page in pdf_reader.pages:
@@ -34,7 +70,7 @@ def extract_text_and_images_from_file(file_content: bytes, filename: str) -> Tup
 
             # 이미지 추출 (PyMuPDF)
             if internal_vlm_client.is_enabled():
-                pdf_doc = fitz.open(stream=file_content, filetype="pdf")
+                pdf_doc = fitz.open(stream=_read_bytes(file_content), filetype="pdf")
                 for page_num in range(pdf_doc.page_count):
                     page = pdf_doc[page_num]
                     image_list = page.get_images(full=True)
@@ -64,7 +100,7 @@ def extract_text_and_images_from_file(file_content: bytes, filename: str) -> Tup
             from docx import Document
             from docx.oxml.ns import qn
 
-            docx_file = io.BytesIO(file_content)
+            docx_file = _as_stream(file_content)
             doc = Document(docx_file)
 
             # 텍스트 추출
@@ -91,7 +127,7 @@ def extract_text_and_images_from_file(file_content: bytes, filename: str) -> Tup
 
     # 텍스트 파일
     elif filename_lower.endswith(('.txt', '.md')):
-        return file_content.decode('utf-8', errors='ignore'), []
+        return _decode_text(file_content), []
 
     # DOC 파일
     elif filename_lower.endswith('.doc'):
@@ -100,17 +136,17 @@ def extract_text_and_images_from_file(file_content: bytes, filename: str) -> Tup
     # 기타 파일
     else:
         try:
-            return file_content.decode('utf-8', errors='ignore'), []
+            return _decode_text(file_content), []
         except Exception as e:
             return f"[파일 읽기 실패: {str(e)}]", []
 
 
-def extract_text_from_file(file_content: bytes, filename: str) -> str:
+def extract_text_from_file(file_content: FileContent, filename: str) -> str:
     """
     파일에서 텍스트 추출
 
     Args:
-        file_content: 파일 바이너리 내용
+        file_content: 파일 바이너리 내용 또는 파일 객체 (업로드 임시 파일 등)
         filename: 파일명 (확장자 확인용)
 
     Returns:
@@ -120,13 +156,13 @@ def extract_text_from_file(file_content: bytes, filename: str) -> str:
 
     # 텍스트 파일
     if filename_lower.endswith(('.txt', '.md')):
-        return file_content.decode('utf-8', errors='ignore')
+        return _decode_text(file_content)
 
     # PDF 파일
     elif filename_lower.endswith('.pdf'):
         try:
             import PyPDF2
-            pdf_file = io.BytesIO(file_content)
+            pdf_file = _as_stream(file_content)
             pdf_reader = PyPDF2.PdfReader(pdf_file)
             text_parts = []
             for page in pdf_reader.pages:
@@ -141,7 +177,7 @@ def extract_text_from_file(file_content: bytes, filename: str) -> str:
     elif filename_lower.endswith('.docx'):
         try:
             from docx import Document
-            docx_file = io.BytesIO(file_content)
+            docx_file = _as_stream(file_content)
             doc = Document(docx_file)
             text_parts = [paragraph.text for paragraph in doc.paragraphs]
             return '\n\n'.join(text_parts)
@@ -157,6 +193,6 @@ def extract_text_from_file(file_content: bytes, filename: str) -> str:
     # 기타 파일 - UTF-8로 시도
     else:
         try:
-            return file_content.decode('utf-8', errors='ignore')
+            return _decode_text(file_content)
         except Exception as e:
             return f"[파일 읽기 실패: {str(e)}]"
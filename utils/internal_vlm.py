@@ -42,11 +42,17 @@ class InternalVLMClient:
                 "Send-System-Name": self.system_name,
                 "User-ID": self.user_id,
                 "User-Type": "AD",
-                "Prompt-Msg-Id": str(uuid.uuid4()),
-                "Completion-Msg-Id": str(uuid.uuid4()),
             },
         )
 
+    @staticmethod
+    def _request_headers() -> Dict[str, str]:
+        """요청마다 새로운 메시지 ID 헤더 생성"""
+        return {
+            "Prompt-Msg-Id": str(uuid.uuid4()),
+            "Completion-Msg-Id": str(uuid.uuid4()),
+        }
+
     def is_enabled(self) -> bool:
         """VLM이 활성화되어 있는지 확인"""
         return self.enabled
@@ -100,11 +106,8 @@ class InternalVLMClient:
                 ]
             )
 
-            # UUID 갱신
-            self.llm.default_headers["Prompt-Msg-Id"] = str(uuid.uuid4())
-            self.llm.default_headers["Completion-Msg-Id"] = str(uuid.uuid4())
-
-            response = self.llm.invoke([message])
+            # 요청별 UUID 헤더 (공유 클라이언트의 default_headers는 변경하지 않음)
+            response = self.llm.invoke([message], extra_headers=self._request_headers())
             return response.content
 
         except Exception as e:
@@ -150,11 +153,8 @@ class InternalVLMClient:
 
             message = HumanMessage(content=content)
 
-            # UUID 갱신
-            self.llm.default_headers["Prompt-Msg-Id"] = str(uuid.uuid4())
-            self.llm.default_headers["Completion-Msg-Id"] = str(uuid.uuid4())
-
-            response = self.llm.invoke([message])
+            # 요청별 UUID 헤더 (공유 클라이언트의 default_headers는 변경하지 않음)
+            response = self.llm.invoke([message], extra_headers=self._request_headers())
             return response.content
 
         except Exception as e:
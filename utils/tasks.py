@@ -0,0 +1,14 @@
+# utils/tasks.py - 백그라운드 작업 실행
+import asyncio
+from typing import Coroutine
+
+# 이벤트 루프는 task를 약한 참조로만 들고 있으므로 끝날 때까지 여기서 참조 유지
+_background_tasks: set[asyncio.Task] = set()
+
+
+def spawn_background(coro: Coroutine) -> asyncio.Task:
+    """응답을 기다리지 않는 백그라운드 작업 시작 (완료 전 GC되지 않도록 참조 보관)"""
+    task = asyncio.create_task(coro)
+    _background_tasks.add(task)
+    task.add_done_callback(_background_tasks.discard)
+    return task
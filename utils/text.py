@@ -1,28 +1,28 @@
 """Text processing utilities"""
-import json
 import re
-import asyncio
 from typing import Optional
 
+import orjson
+
 
 def _extract_json_dict(text: str) -> Optional[dict]:
     """Extract JSON dictionary from text"""
     if not text:
         return None
     try:
-        parsed = json.loads(text)
+        parsed = orjson.loads(text)
         if isinstance(parsed, dict):
             return parsed
-    except json.JSONDecodeError:
+    except orjson.JSONDecodeError:
         pass
 
     match = re.search(r'\{.*\}', text, re.DOTALL)
     if match:
         try:
-            parsed = json.loads(match.group())
+            parsed = orjson.loads(match.group())
             if isinstance(parsed, dict):
                 return parsed
-        except json.JSONDecodeError:
+        except orjson.JSONDecodeError:
             return None
     return None
 
@@ -69,4 +69,5 @@ def _generate_title_sync(content: str, fallback: str) -> str:
 
 async def generate_job_title(content: str, fallback: str) -> str:
     """Generate title from proposal content (asynchronous wrapper)"""
-    return await asyncio.to_thread(_generate_title_sync, content, fallback)
+    from core.llm import run_llm_in_thread
+    return await run_llm_in_thread(_generate_title_sync, content, fallback)